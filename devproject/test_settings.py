@@ -17,6 +17,9 @@ DATABASES = {
 # Use in-memory cache
 CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 
+# Run search providers in test thread, other threads don't see test transaction
+MISAGO_SEARCH_PROVIDERS_WORKERS = 1
+
 # Disable Debug Toolbar
 DEBUG_TOOLBAR_CONFIG = {}
 INTERNAL_IPS = []
@@ -12,4 +12,11 @@ def build_acl(roles):
             message = "%s has to define build_acl function" % extension
             raise AttributeError(message)
 
+    finalize_acl(acl)
     return acl
+
+
+def finalize_acl(acl):
+    """run finalizers that precompute data from complete ACL"""
+    for finalizer in providers.get_user_acl_finalizers():
+        finalizer(acl)
@@ -1,17 +1,61 @@
+from collections import OrderedDict
+from threading import Lock
+
 from django.core.cache import cache
 
 from . import ACL_CACHE
 from ..cache.versions import invalidate_cache
+from ..conf import settings
+from .compactacl import compact_acl, expand_acl
+
+_local_cache = OrderedDict()
+_local_cache_lock = Lock()
 
 
 def get_acl_cache(user, cache_versions):
     key = get_cache_key(user, cache_versions)
-    return cache.get(key)
+    user_acl = get_local_acl_cache(key)
+    if user_acl is None:
+        compacted_acl = cache.get(key)
+        if compacted_acl is None:
+            return None
+        user_acl = expand_acl(compacted_acl)
+        set_local_acl_cache(key, user_acl)
+    return user_acl.copy()
 
 
 def set_acl_cache(user, cache_versions, user_acl):
     key = get_cache_key(user, cache_versions)
-    cache.set(key, user_acl)
+    cache.set(key, compact_acl(user_acl))
+    set_local_acl_cache(key, user_acl.copy())
+
+
+def get_local_acl_cache(key):
+    if not settings.MISAGO_ACL_LOCAL_CACHE_SIZE:
+        return None
+
+    with _local_cache_lock:
+        user_acl = _local_cache.get(key)
+        if user_acl is not None:
+            _local_cache.move_to_end(key)
+        return user_acl
+
+
+def set_local_acl_cache(key, user_acl):
+    max_size = settings.MISAGO_ACL_LOCAL_CACHE_SIZE
+    if not max_size:
+        return
+
+    with _local_cache_lock:
+        _local_cache[key] = user_acl
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > max_size:
+            _local_cache.popitem(last=False)
+
+
+def clear_local_acl_cache():
+    with _local_cache_lock:
+        _local_cache.clear()
 
 
 def get_cache_key(user, cache_versions):
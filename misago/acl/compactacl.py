@@ -0,0 +1,56 @@
+from array import array
+
+COMPACT_CATEGORIES_KEY = "compact_categories"
+
+
+def compact_acl(user_acl):
+    """Returns copy of ACL with per-category permissions stored in compact form
+
+    Most categories share same permissions, so instead of dict for every category
+    this form stores list of unique permission sets and arrays of category ids and
+    indexes of their permission sets.
+    """
+    categories = user_acl.get("categories")
+    if not categories:
+        return user_acl
+
+    acls = []
+    acls_indexes = {}
+    categories_ids = array("L")
+    categories_acls = array("L")
+
+    try:
+        for category_id, category_acl in categories.items():
+            acl_key = tuple(sorted(category_acl.items()))
+            if acl_key not in acls_indexes:
+                acls_indexes[acl_key] = len(acls)
+                acls.append(category_acl)
+
+            categories_ids.append(category_id)
+            categories_acls.append(acls_indexes[acl_key])
+    except (TypeError, OverflowError):
+        # ACL extension stored value that can't be compacted, use ACL as it is
+        return user_acl
+
+    compacted_acl = user_acl.copy()
+    del compacted_acl["categories"]
+    compacted_acl[COMPACT_CATEGORIES_KEY] = (acls, categories_ids, categories_acls)
+    return compacted_acl
+
+
+def expand_acl(compacted_acl):
+    """Reverses compact_acl, returning ACL with per-category permissions dict
+
+    Categories with same permissions share the same dict, so ACL should be
+    treated as read only.
+    """
+    if COMPACT_CATEGORIES_KEY not in compacted_acl:
+        return compacted_acl
+
+    user_acl = compacted_acl.copy()
+    acls, categories_ids, categories_acls = user_acl.pop(COMPACT_CATEGORIES_KEY)
+    user_acl["categories"] = {
+        category_id: acls[acl_index]
+        for category_id, acl_index in zip(categories_ids, categories_acls)
+    }
+    return user_acl
@@ -5,12 +5,13 @@ from ..conf import settings
 _NOT_INITIALIZED_ERROR = (
     "PermissionProviders instance has to load providers with load() "
     "before get_obj_type_annotators(), get_user_acl_serializers(), "
-    "list() or dict() methods will be available."
+    "get_user_acl_finalizers(), list() or dict() methods will be available."
 )
 
 _ALREADY_INITIALIZED_ERROR = (
     "PermissionProviders instance has already loaded providers and "
-    "acl_annotator or user_acl_serializer are no longer available."
+    "acl_annotator, user_acl_serializer or user_acl_finalizer are no longer "
+    "available."
 )
 
 
@@ -24,6 +25,7 @@ class PermissionProviders:
 
         self._annotators = {}
         self._user_acl_serializers = []
+        self._user_acl_finalizers = []
 
     def load(self):
         if self._initialized:
@@ -32,6 +34,7 @@ class PermissionProviders:
         self._register_providers()
         self._coerce_dict_values_to_tuples(self._annotators)
         self._user_acl_serializers = tuple(self._user_acl_serializers)
+        self._user_acl_finalizers = tuple(self._user_acl_finalizers)
         self._initialized = True
 
     def _register_providers(self):
@@ -56,6 +59,11 @@ class PermissionProviders:
         assert not self._initialized, _ALREADY_INITIALIZED_ERROR
         self._user_acl_serializers.append(func)
 
+    def user_acl_finalizer(self, func):
+        """registers function called with user ACL after all providers built it"""
+        assert not self._initialized, _ALREADY_INITIALIZED_ERROR
+        self._user_acl_finalizers.append(func)
+
     def get_obj_type_annotators(self, obj):
         assert self._initialized, _NOT_INITIALIZED_ERROR
         return self._annotators.get(obj.__class__, [])
@@ -64,6 +72,10 @@ class PermissionProviders:
         assert self._initialized, _NOT_INITIALIZED_ERROR
         return self._user_acl_serializers
 
+    def get_user_acl_finalizers(self):
+        assert self._initialized, _NOT_INITIALIZED_ERROR
+        return self._user_acl_finalizers
+
     def list(self):
         assert self._initialized, _NOT_INITIALIZED_ERROR
         return self._providers
@@ -1,6 +1,8 @@
 from contextlib import ContextDecorator, ExitStack, contextmanager
+from copy import deepcopy
 from unittest.mock import patch
 
+from .buildacl import finalize_acl
 from .useracl import get_user_acl
 
 __all__ = ["patch_user_acl"]
@@ -21,8 +23,10 @@ class patch_user_acl(ContextDecorator, ExitStack):
         self.acl_patch = acl_patch
 
     def patched_get_user_acl(self, user, cache_versions):
-        user_acl = get_user_acl(user, cache_versions)
+        # Copy ACL so patches don't leak to the ACL cached in process memory
+        user_acl = deepcopy(get_user_acl(user, cache_versions))
         self.apply_acl_patches(user, user_acl)
+        finalize_acl(user_acl)
         return user_acl
 
     def apply_acl_patches(self, user, user_acl):
@@ -0,0 +1,124 @@
+from django.test import override_settings
+
+from ...cache.versions import get_cache_versions
+from ..cache import (
+    clear_acl_cache,
+    clear_local_acl_cache,
+    get_acl_cache,
+    set_acl_cache,
+)
+from ..useracl import get_user_acl
+
+
+@override_settings(MISAGO_ACL_LOCAL_CACHE_SIZE=10)
+def test_acl_is_read_from_process_memory_before_shared_cache(
+    mocker, cache_versions, user
+):
+    mocker.patch("django.core.cache.cache.set")
+    cache_get = mocker.patch("django.core.cache.cache.get")
+
+    set_acl_cache(user, cache_versions, {"can_use_private_threads": True})
+    assert get_acl_cache(user, cache_versions) == {"can_use_private_threads": True}
+    cache_get.assert_not_called()
+
+
+@override_settings(MISAGO_ACL_LOCAL_CACHE_SIZE=10)
+def test_acl_read_from_shared_cache_is_stored_in_process_memory(
+    mocker, cache_versions, user
+):
+    cache_get = mocker.patch(
+        "django.core.cache.cache.get", return_value={"can_use_private_threads": True}
+    )
+
+    get_acl_cache(user, cache_versions)
+    get_acl_cache(user, cache_versions)
+    cache_get.assert_called_once()
+
+
+@override_settings(MISAGO_ACL_LOCAL_CACHE_SIZE=10)
+def test_acl_from_process_memory_is_not_changed_by_user_acl_getter(
+    cache_versions, user, other_user
+):
+    assert get_user_acl(user, cache_versions)["user_id"] == user.id
+    assert get_user_acl(other_user, cache_versions)["user_id"] == other_user.id
+    assert "user_id" not in get_acl_cache(user, cache_versions)
+
+
+@override_settings(MISAGO_ACL_LOCAL_CACHE_SIZE=10)
+def test_acl_stored_in_process_memory_is_versioned(mocker, cache_versions, user):
+    mocker.patch("django.core.cache.cache.set")
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+
+    set_acl_cache(user, cache_versions, {"can_use_private_threads": True})
+    new_cache_versions = dict(cache_versions, acl="new-version")
+    assert get_acl_cache(user, new_cache_versions) is None
+
+
+@override_settings(MISAGO_ACL_LOCAL_CACHE_SIZE=1)
+def test_least_recently_used_acl_is_removed_from_process_memory(
+    mocker, cache_versions, user, superuser
+):
+    mocker.patch("django.core.cache.cache.set")
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+
+    set_acl_cache(user, cache_versions, {"can_use_private_threads": True})
+    set_acl_cache(superuser, cache_versions, {"can_use_private_threads": False})
+    assert get_acl_cache(user, cache_versions) is None
+    assert get_acl_cache(superuser, cache_versions)
+
+
+@override_settings(MISAGO_ACL_LOCAL_CACHE_SIZE=2)
+def test_reading_acl_from_process_memory_keeps_it_from_removal(mocker, cache_versions):
+    mocker.patch("django.core.cache.cache.set")
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+    users = [mocker.Mock(acl_key="acl-%s" % i) for i in range(3)]
+
+    set_acl_cache(users[0], cache_versions, {"can_use_private_threads": True})
+    set_acl_cache(users[1], cache_versions, {"can_use_private_threads": True})
+    assert get_acl_cache(users[0], cache_versions)
+
+    set_acl_cache(users[2], cache_versions, {"can_use_private_threads": False})
+    assert get_acl_cache(users[0], cache_versions)
+    assert get_acl_cache(users[1], cache_versions) is None
+    assert get_acl_cache(users[2], cache_versions)
+
+
+def test_clearing_acl_cache_invalidates_acl_in_process_memory(
+    mocker, cache_versions, user
+):
+    mocker.patch("django.core.cache.cache.set")
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+
+    set_acl_cache(user, cache_versions, {"can_use_private_threads": True})
+    clear_acl_cache()
+    assert get_acl_cache(user, get_cache_versions()) is None
+
+
+def test_clearing_process_memory_acl_cache_removes_acls_from_it(
+    mocker, cache_versions, user
+):
+    mocker.patch("django.core.cache.cache.set")
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=None)
+
+    set_acl_cache(user, cache_versions, {"can_use_private_threads": True})
+    clear_local_acl_cache()
+    assert get_acl_cache(user, cache_versions) is None
+    cache_get.assert_called_once()
+
+
+@override_settings(MISAGO_ACL_LOCAL_CACHE_SIZE=0)
+def test_process_memory_cache_is_not_used_if_its_disabled(mocker, cache_versions, user):
+    mocker.patch("django.core.cache.cache.set")
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=None)
+
+    set_acl_cache(user, cache_versions, {"can_use_private_threads": True})
+    assert get_acl_cache(user, cache_versions) is None
+    cache_get.assert_called_once()
+
+
+def test_acl_is_stored_in_shared_cache_in_compact_form(mocker, cache_versions, user):
+    cache_set = mocker.patch("django.core.cache.cache.set")
+    set_acl_cache(
+        user, cache_versions, {"categories": {1: {"can_see": 1, "can_browse": 1}}}
+    )
+    assert "categories" not in cache_set.call_args[0][1]
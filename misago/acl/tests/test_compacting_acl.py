@@ -0,0 +1,56 @@
+from ..compactacl import COMPACT_CATEGORIES_KEY, compact_acl, expand_acl
+
+user_acl = {
+    "can_use_private_threads": True,
+    "visible_categories": [1, 2, 3],
+    "categories": {
+        1: {"can_see": 1, "can_browse": 1, "can_start_threads": 1},
+        2: {"can_see": 1, "can_browse": 1, "can_start_threads": 1},
+        3: {"can_see": 1, "can_browse": 0},
+    },
+}
+
+
+def test_compacting_acl_removes_categories_dict():
+    compacted_acl = compact_acl(user_acl)
+    assert "categories" not in compacted_acl
+    assert COMPACT_CATEGORIES_KEY in compacted_acl
+
+
+def test_compacting_acl_stores_categories_with_same_permissions_once():
+    compacted_acl = compact_acl(user_acl)
+    acls, categories_ids, categories_acls = compacted_acl[COMPACT_CATEGORIES_KEY]
+    assert len(acls) == 2
+    assert list(categories_ids) == [1, 2, 3]
+    assert list(categories_acls) == [0, 0, 1]
+
+
+def test_compacting_acl_keeps_other_acl_values():
+    compacted_acl = compact_acl(user_acl)
+    assert compacted_acl["can_use_private_threads"] is True
+    assert compacted_acl["visible_categories"] == [1, 2, 3]
+
+
+def test_compacting_acl_doesnt_change_original_acl():
+    compact_acl(user_acl)
+    assert "categories" in user_acl
+    assert COMPACT_CATEGORIES_KEY not in user_acl
+
+
+def test_compacting_acl_without_categories_returns_acl_unchanged():
+    acl = {"can_use_private_threads": True}
+    assert compact_acl(acl) == acl
+
+
+def test_compacting_acl_with_unhashable_category_values_returns_acl_unchanged():
+    acl = {"categories": {1: {"can_see": 1, "extension": [1, 2]}}}
+    assert compact_acl(acl) == acl
+
+
+def test_expanding_compacted_acl_returns_original_acl():
+    assert expand_acl(compact_acl(user_acl)) == user_acl
+
+
+def test_expanding_acl_that_was_not_compacted_returns_it_unchanged():
+    acl = {"can_use_private_threads": True}
+    assert expand_acl(acl) == acl
@@ -88,3 +88,21 @@ def test_getter_returns_registered_user_acl_serializer():
     providers.load()
 
     assert test_user_acl_serializer in providers.get_user_acl_serializers()
+
+
+def test_container_returns_list_of_user_acl_finalizers():
+    providers = PermissionProviders()
+    providers.load()
+
+    assert providers.get_user_acl_finalizers()
+
+
+def test_getter_returns_registered_user_acl_finalizer():
+    def test_user_acl_finalizer():
+        pass
+
+    providers = PermissionProviders()
+    providers.user_acl_finalizer(test_user_acl_finalizer)
+    providers.load()
+
+    assert test_user_acl_finalizer in providers.get_user_acl_finalizers()
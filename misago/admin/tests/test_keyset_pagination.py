@@ -0,0 +1,112 @@
+from urllib.parse import urlencode
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.paginator import InvalidPage
+from django.test import override_settings
+from django.urls import reverse
+
+from ...test import assert_contains, assert_not_contains
+from ...users.admin.views.users import UsersList
+from ...users.test import create_test_user
+from ..views.generic.keysetpagination import get_keyset_page
+
+User = get_user_model()
+
+
+@pytest.fixture
+def users(db):
+    # users with repeating posts counts to test ordering by non-unique field
+    return [
+        create_test_user("User%s" % i, "user%s@example.com" % i, posts=i % 2)
+        for i in range(5)
+    ]
+
+
+def get_pages(queryset, order_by, per_page):
+    pages = [get_keyset_page(queryset, order_by, per_page)]
+    while pages[-1].has_next():
+        pages.append(
+            get_keyset_page(queryset, order_by, per_page, after=pages[-1].next_cursor)
+        )
+    return pages
+
+
+@pytest.mark.parametrize("order_by", ["pk", "-pk", "slug", "-slug", "posts", "-posts"])
+def test_keyset_pages_contain_all_items_in_order(users, order_by):
+    queryset = User.objects.filter(id__in=[u.id for u in users])
+    pages = get_pages(queryset, order_by, 2)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+    if order_by.lstrip("-") in ("pk", "slug"):
+        ordering = [order_by]
+    else:
+        ordering = [order_by, "-pk" if order_by.startswith("-") else "pk"]
+    expected_items = list(queryset.order_by(*ordering))
+    assert [item for page in pages for item in page.object_list] == expected_items
+
+
+def test_keyset_page_before_cursor_returns_previous_page(users):
+    queryset = User.objects.filter(id__in=[u.id for u in users])
+    pages = get_pages(queryset, "-posts", 2)
+
+    assert not pages[0].has_previous()
+    assert pages[1].has_previous()
+
+    previous_page = get_keyset_page(
+        queryset, "-posts", 2, before=pages[2].previous_cursor
+    )
+    assert previous_page.object_list == pages[1].object_list
+    assert previous_page.has_next()
+    assert previous_page.has_previous()
+
+    first_page = get_keyset_page(
+        queryset, "-posts", 2, before=previous_page.previous_cursor
+    )
+    assert first_page.object_list == pages[0].object_list
+    assert not first_page.has_previous()
+
+
+def test_invalid_cursor_raises_invalid_page_error(db):
+    with pytest.raises(InvalidPage):
+        get_keyset_page(User.objects.all(), "-pk", 2, after="invalid")
+
+
+@pytest.fixture
+def users_admin_link(admin_client):
+    response = admin_client.get(reverse("misago:admin:users:index"))
+    return response["location"]
+
+
+def test_admin_list_displays_next_page_link(
+    mocker, admin_client, users_admin_link, users
+):
+    mocker.patch.object(UsersList, "items_per_page", 2)
+
+    response = admin_client.get(users_admin_link)
+    assert_contains(response, "6 items")
+    assert_not_contains(response, "About")
+
+    page = response.context["page"]
+    assert page.has_next()
+    assert urlencode({"after": page.next_cursor}) in response.context["next_page_url"]
+    assert_contains(response, "after=")
+
+    response = admin_client.get(response.context["next_page_url"])
+    assert response.status_code == 200
+    assert response.context["page"].has_previous()
+
+
+@override_settings(MISAGO_ADMIN_EXACT_COUNT_LIMIT=0)
+def test_admin_list_displays_estimated_items_count(admin_client, users_admin_link):
+    response = admin_client.get(users_admin_link)
+    assert_contains(response, "About")
+
+
+def test_admin_list_redirects_to_first_page_for_invalid_cursor(
+    admin_client, users_admin_link
+):
+    response = admin_client.get(users_admin_link + "&after=invalid")
+    assert response.status_code == 302
+    assert response["location"] == users_admin_link
@@ -0,0 +1,97 @@
+"""Keyset pagination for admin lists
+
+Instead of page numbers, pages are addressed with cursors encoding ordering
+value and primary key of first or last item on current page, so selecting deep
+pages costs the same as selecting first one and items don't have to be counted.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return bool(self.next_cursor)
+
+    def has_previous(self):
+        return bool(self.previous_cursor)
+
+
+def get_keyset_page(queryset, order_by, per_page, after=None, before=None):
+    """Returns page of items following "after" cursor or preceding "before" one"""
+    field_name = order_by.lstrip("-")
+    descending = order_by.startswith("-")
+
+    ordering = [order_by]
+    if field_name not in ("pk", "id"):
+        # primary key makes ordering unique for fields with repeating values
+        ordering.append("-pk" if descending else "pk")
+
+    if before:
+        queryset = queryset.filter(
+            get_cursor_filter(field_name, decode_cursor(before), not descending)
+        )
+        queryset = queryset.order_by(*[reverse_order(o) for o in ordering])
+        object_list = list(queryset[: per_page + 1])
+        has_more = len(object_list) > per_page
+        object_list = object_list[:per_page][::-1]
+        has_previous, has_next = has_more, True
+    else:
+        if after:
+            queryset = queryset.filter(
+                get_cursor_filter(field_name, decode_cursor(after), descending)
+            )
+        object_list = list(queryset.order_by(*ordering)[: per_page + 1])
+        has_next = len(object_list) > per_page
+        object_list = object_list[:per_page]
+        has_previous = bool(after)
+
+    if not object_list:
+        return KeysetPage([])
+
+    return KeysetPage(
+        object_list,
+        next_cursor=make_cursor(object_list[-1], field_name) if has_next else None,
+        previous_cursor=make_cursor(object_list[0], field_name)
+        if has_previous
+        else None,
+    )
+
+
+def get_cursor_filter(field_name, cursor, descending):
+    value, pk = cursor
+    lookup = "lt" if descending else "gt"
+    if field_name in ("pk", "id"):
+        return Q(**{"pk__%s" % lookup: pk})
+    return Q(**{"%s__%s" % (field_name, lookup): value}) | Q(
+        **{field_name: value, "pk__%s" % lookup: pk}
+    )
+
+
+def reverse_order(order_by):
+    if order_by.startswith("-"):
+        return order_by[1:]
+    return "-%s" % order_by
+
+
+def make_cursor(item, field_name):
+    value = item.pk if field_name in ("pk", "id") else getattr(item, field_name)
+    return urlsafe_b64encode(json.dumps([value, item.pk]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, pk = json.loads(urlsafe_b64decode(cursor.encode()))
+        return value, int(pk)
+    except (TypeError, ValueError):
+        raise InvalidPage()
@@ -1,14 +1,18 @@
 from urllib.parse import urlencode
 
 from django.contrib import messages
-from django.core.paginator import EmptyPage, Paginator
+from django.core.paginator import EmptyPage, InvalidPage, Paginator
 from django.db import transaction
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from ....cache.versions import coalesce_cache_invalidations
+from ....conf import settings
 from ....core.exceptions import ExplicitFirstPage
+from ....core.pgutils import get_estimated_count, get_table_estimated_count
 from .base import AdminView
+from .keysetpagination import get_keyset_page
 
 
 class MassActionError(Exception):
@@ -24,6 +28,9 @@ class ListView(AdminView):
     template = template name used to render items list
     items_per_page = number of items displayed on single page
                      (enter 0 or don't define for no pagination)
+    keyset_pagination = if True, list is paginated with next and previous
+                        links instead of page numbers and big results
+                        count is estimated
     ordering = tuple of tuples defining allowed orderings
                typles should follow this format: (name, order_by)
     """
@@ -31,6 +38,7 @@ class ListView(AdminView):
     template_name = "list.html"
 
     items_per_page = 0
+    keyset_pagination = False
     ordering = None
 
     extra_actions = None
@@ -69,6 +77,7 @@ class ListView(AdminView):
         context = {
             "items": self.get_queryset(),
             "paginator": None,
+            "keyset_paginator": False,
             "page": None,
             "order_by": [],
             "order": None,
@@ -142,7 +151,14 @@ class ListView(AdminView):
 
         self.make_querystring(context)
 
-        if self.items_per_page:
+        if self.items_per_page and self.keyset_pagination:
+            try:
+                self.paginate_items_by_keyset(request, context)
+            except InvalidPage:
+                return redirect(
+                    "%s%s" % (reverse(self.root_link), context["querystring"])
+                )
+        elif self.items_per_page:
             try:
                 self.paginate_items(context, kwargs.get("page", 0))
             except EmptyPage:
@@ -171,6 +187,56 @@ class ListView(AdminView):
         context["page"] = context["paginator"].page(page)
         context["items"] = context["page"].object_list
 
+    def paginate_items_by_keyset(self, request, context):
+        after = request.GET.get("after")
+        before = request.GET.get("before")
+
+        if context["order"]:
+            order_by = context["order"]["order_by"]
+        else:
+            order_by = "-pk"
+
+        page = get_keyset_page(
+            context["items"], order_by, self.items_per_page, after, before
+        )
+        if (after or before) and not page.object_list:
+            raise InvalidPage()
+
+        context["items_count"], context["count_is_estimated"] = self.count_items(
+            context["items"]
+        )
+        context["keyset_paginator"] = True
+        context["page"] = page
+        context["items"] = page.object_list
+
+        if page.has_next():
+            context["next_page_url"] = self.get_keyset_page_url(
+                context, "after", page.next_cursor
+            )
+        if page.has_previous():
+            context["previous_page_url"] = self.get_keyset_page_url(
+                context, "before", page.previous_cursor
+            )
+
+    def count_items(self, queryset):
+        """Returns items count and flag telling if it was estimated"""
+        if queryset.query.where:
+            estimated_count = get_estimated_count(queryset)
+        else:
+            estimated_count = get_table_estimated_count(queryset.model)
+
+        if estimated_count < settings.MISAGO_ADMIN_EXACT_COUNT_LIMIT:
+            return queryset.count(), False
+        return estimated_count, True
+
+    def get_keyset_page_url(self, context, name, cursor):
+        querystring = context["querystring"] or "?redirected=1"
+        return "%s%s&%s" % (
+            reverse(self.root_link),
+            querystring,
+            urlencode({name: cursor}),
+        )
+
     # Filter list items
     filter_form = None
 
@@ -294,11 +360,47 @@ class ListView(AdminView):
 
         action_callable = getattr(self, "action_%s" % action["action"])
 
-        if action.get("is_atomic", True):
-            with transaction.atomic():
+        with coalesce_cache_invalidations():
+            if self.get_mass_action_chunk_size(action):
+                return self.run_chunked_mass_action(
+                    request, action, action_callable, action_queryset
+                )
+            if action.get("is_atomic", True):
+                with transaction.atomic():
+                    return action_callable(request, action_queryset)
+            else:
                 return action_callable(request, action_queryset)
-        else:
-            return action_callable(request, action_queryset)
+
+    def run_chunked_mass_action(self, request, action, action_callable, queryset):
+        """Runs action for chunks of items, each chunk in separate transaction
+
+        Action should validate all items in validate_ method before any chunk
+        is processed, because chunks that were processed are not rolled back,
+        and leave displaying message about its result to the view.
+        """
+        validate_callable = getattr(self, "validate_%s" % action["action"], None)
+        if validate_callable:
+            validate_callable(request, queryset)
+
+        items_pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+        chunk_size = self.get_mass_action_chunk_size(action)
+
+        response = None
+        for i in range(0, len(items_pks), chunk_size):
+            chunk_queryset = queryset.filter(pk__in=items_pks[i : i + chunk_size])
+            if action.get("is_atomic", True):
+                with transaction.atomic():
+                    response = action_callable(request, chunk_queryset)
+            else:
+                response = action_callable(request, chunk_queryset)
+
+        if action.get("success_message"):
+            messages.success(request, action["success_message"])
+        return response
+
+    def get_mass_action_chunk_size(self, action):
+        """Returns number of items processed by action in single chunk, or None"""
+        return action.get("chunk_size")
 
     def select_mass_action(self, action):
         for definition in self.mass_actions:  # pylint: disable=not-an-iterable
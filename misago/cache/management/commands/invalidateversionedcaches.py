@@ -1,11 +1,22 @@
 from django.core.management.base import BaseCommand
 
-from ...versions import invalidate_all_caches
+from ...versions import invalidate_all_caches, invalidate_caches
 
 
 class Command(BaseCommand):
     help = "Invalidates versioned caches"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "caches", nargs="*", help="Names of caches to invalidate (default: all)"
+        )
+
     def handle(self, *args, **options):
-        invalidate_all_caches()
-        self.stdout.write("Invalidated all versioned caches.")
+        if options["caches"]:
+            invalidate_caches(*options["caches"])
+            self.stdout.write(
+                "Invalidated versioned caches: %s." % ", ".join(options["caches"])
+            )
+        else:
+            invalidate_all_caches()
+            self.stdout.write("Invalidated all versioned caches.")
@@ -1,5 +1,84 @@
-from ..versions import get_cache_versions
+import pytest
+from django.test import override_settings
+
+from ..versions import (
+    CACHE_VERSIONS_CACHE_KEY,
+    clear_cached_cache_versions,
+    get_cache_versions,
+    get_cache_versions_stats,
+    get_cached_cache_versions,
+    invalidate_cache,
+    reset_cache_versions_stats,
+)
 
 
 def test_getter_returns_cache_versions(db):
     assert get_cache_versions()
+
+
+@pytest.fixture(autouse=True)
+def clear_cached_versions():
+    clear_cached_cache_versions()
+    reset_cache_versions_stats()
+    yield
+    clear_cached_cache_versions()
+
+
+def test_cached_getter_returns_cache_versions(db):
+    assert get_cached_cache_versions() == get_cache_versions()
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_cached_getter_reads_database_once_within_ttl(db, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        get_cached_cache_versions()
+        get_cached_cache_versions()
+        get_cached_cache_versions()
+
+    stats = get_cache_versions_stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] == 2
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=0)
+def test_cached_getter_reads_database_every_time_if_ttl_is_disabled(
+    db, django_assert_num_queries
+):
+    with django_assert_num_queries(2):
+        get_cached_cache_versions()
+        get_cached_cache_versions()
+
+    assert get_cache_versions_stats()["misses"] == 2
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_cached_getter_uses_shared_cache_before_database(
+    db, mocker, django_assert_num_queries
+):
+    versions = {"test_cache": "abcdefgh"}
+    mocker.patch("misago.cache.versions.cache.get", return_value=versions)
+
+    with django_assert_num_queries(0):
+        assert get_cached_cache_versions() == versions
+
+    assert get_cache_versions_stats()["shared_hits"] == 1
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_cached_getter_returns_new_versions_after_cache_invalidation(cache_version):
+    old_versions = get_cached_cache_versions()
+    invalidate_cache(cache_version.cache)
+    new_versions = get_cached_cache_versions()
+    assert old_versions[cache_version.cache] != new_versions[cache_version.cache]
+
+
+def test_cache_invalidation_clears_shared_cache(cache_version, mocker):
+    cache_delete = mocker.patch("misago.cache.versions.cache.delete")
+    invalidate_cache(cache_version.cache)
+    cache_delete.assert_called_with(CACHE_VERSIONS_CACHE_KEY)
+
+
+def test_cache_versions_stats_include_hit_rate(db):
+    assert get_cache_versions_stats()["hit_rate"] == 0
+    get_cached_cache_versions()
+    assert get_cache_versions_stats()["total"] == 1
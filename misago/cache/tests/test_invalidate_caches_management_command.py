@@ -7,3 +7,11 @@ def test_management_command_invalidates_all_caches(mocker):
     invalidate_all_caches = mocker.patch("misago.cache.versions.invalidate_all_caches")
     call_command("invalidateversionedcaches", stdout=Mock())
     invalidate_all_caches.assert_called_once()
+
+
+def test_management_command_invalidates_specified_caches(mocker):
+    invalidate_caches = mocker.patch(
+        "misago.cache.management.commands.invalidateversionedcaches.invalidate_caches"
+    )
+    call_command("invalidateversionedcaches", "acl", "bans", stdout=Mock())
+    invalidate_caches.assert_called_once_with("acl", "bans")
@@ -1,5 +1,10 @@
 from ..models import CacheVersion
-from ..versions import invalidate_all_caches, invalidate_cache
+from ..versions import (
+    coalesce_cache_invalidations,
+    invalidate_all_caches,
+    invalidate_cache,
+    invalidate_caches,
+)
 
 
 def test_invalidating_cache_updates_cache_version_in_database(cache_version):
@@ -12,3 +17,78 @@ def test_invalidating_all_caches_updates_cache_version_in_database(cache_version
     invalidate_all_caches()
     updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
     assert cache_version.version != updated_cache_version.version
+
+
+def test_invalidating_multiple_caches_updates_all_of_them(
+    cache_version, django_assert_num_queries
+):
+    other_cache_version = CacheVersion.objects.create(cache="other_cache")
+
+    with django_assert_num_queries(1):
+        invalidate_caches(cache_version.cache, other_cache_version.cache)
+
+    updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
+    assert cache_version.version != updated_cache_version.version
+    updated_other_cache_version = CacheVersion.objects.get(cache="other_cache")
+    assert other_cache_version.version != updated_other_cache_version.version
+
+
+def test_invalidating_caches_generates_different_version_for_every_cache(cache_version):
+    CacheVersion.objects.create(cache="other_cache")
+    invalidate_caches(cache_version.cache, "other_cache")
+    versions = CacheVersion.objects.filter(
+        cache__in=[cache_version.cache, "other_cache"]
+    )
+    assert len({i.version for i in versions}) == 2
+
+
+def test_invalidating_all_caches_runs_single_query(
+    cache_version, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        invalidate_all_caches()
+
+
+def test_invalidations_are_coalesced_into_single_query(
+    cache_version, django_assert_num_queries
+):
+    other_cache_version = CacheVersion.objects.create(cache="other_cache")
+
+    with django_assert_num_queries(1):
+        with coalesce_cache_invalidations():
+            invalidate_cache(cache_version.cache)
+            invalidate_cache(other_cache_version.cache)
+            invalidate_cache(cache_version.cache)
+
+    updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
+    assert cache_version.version != updated_cache_version.version
+    updated_other_cache_version = CacheVersion.objects.get(cache="other_cache")
+    assert other_cache_version.version != updated_other_cache_version.version
+
+
+def test_coalesced_invalidations_are_deferred_until_block_ends(cache_version):
+    with coalesce_cache_invalidations():
+        invalidate_cache(cache_version.cache)
+        not_updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
+        assert cache_version.version == not_updated_cache_version.version
+
+    updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
+    assert cache_version.version != updated_cache_version.version
+
+
+def test_nested_coalesced_invalidations_are_run_by_outermost_block(
+    cache_version, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        with coalesce_cache_invalidations():
+            with coalesce_cache_invalidations():
+                invalidate_cache(cache_version.cache)
+            invalidate_cache(cache_version.cache)
+
+
+def test_coalesced_block_without_invalidations_runs_no_queries(
+    db, django_assert_num_queries
+):
+    with django_assert_num_queries(0):
+        with coalesce_cache_invalidations():
+            pass
@@ -1,5 +1,21 @@
+import time
+from contextlib import contextmanager
+from threading import Lock, local
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import CharField, Func
+from django.db.models.functions import Cast, Substr
+
+from ..conf import settings
 from .models import CacheVersion
-from .utils import generate_version_string
+
+CACHE_VERSIONS_CACHE_KEY = "misago_cache_versions"
+
+_local_lock = Lock()
+_local_cache = {"versions": None, "expires_at": 0}
+_local_stats = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+_coalesced = local()
 
 
 def get_cache_versions():
@@ -7,14 +23,119 @@ def get_cache_versions():
     return {i.cache: i.version for i in queryset}
 
 
+def get_cached_cache_versions():
+    """Returns cache versions, reading database only when both process memory
+    and shared cache don't have them.
+    """
+    ttl = settings.MISAGO_CACHE_VERSIONS_TTL
+    if ttl:
+        with _local_lock:
+            if _local_cache["expires_at"] > time.monotonic():
+                _local_stats["local_hits"] += 1
+                return _local_cache["versions"].copy()
+
+    versions = cache.get(CACHE_VERSIONS_CACHE_KEY)
+    if versions is None:
+        versions = get_cache_versions()
+        cache.set(CACHE_VERSIONS_CACHE_KEY, versions)
+        stat = "misses"
+    else:
+        stat = "shared_hits"
+
+    with _local_lock:
+        _local_stats[stat] += 1
+        if ttl:
+            _local_cache["versions"] = versions
+            _local_cache["expires_at"] = time.monotonic() + ttl
+
+    return versions.copy()
+
+
+def get_cache_versions_stats():
+    with _local_lock:
+        stats = _local_stats.copy()
+
+    total = sum(stats.values())
+    stats["total"] = total
+    if total:
+        stats["hit_rate"] = (stats["local_hits"] + stats["shared_hits"]) / total
+    else:
+        stats["hit_rate"] = 0
+    return stats
+
+
+def reset_cache_versions_stats():
+    with _local_lock:
+        for stat in _local_stats:
+            _local_stats[stat] = 0
+
+
+def clear_cached_cache_versions():
+    with _local_lock:
+        _local_cache["versions"] = None
+        _local_cache["expires_at"] = 0
+    cache.delete(CACHE_VERSIONS_CACHE_KEY)
+
+
 def invalidate_cache(cache_name):
-    CacheVersion.objects.filter(cache=cache_name).update(
-        version=generate_version_string()
+    invalidate_caches(cache_name)
+
+
+def invalidate_caches(*cache_names):
+    """Invalidates specified caches with single UPDATE query.
+
+    If called inside of coalesce_cache_invalidations block, invalidation is
+    deferred until that block ends.
+    """
+    if not cache_names:
+        return
+
+    pending = getattr(_coalesced, "caches", None)
+    if pending is not None:
+        pending.update(cache_names)
+        return
+
+    CacheVersion.objects.filter(cache__in=set(cache_names)).update(
+        version=get_random_version_expression()
     )
+    clear_cached_cache_versions_on_commit()
 
 
 def invalidate_all_caches():
-    for cache_name in get_cache_versions().keys():
-        CacheVersion.objects.filter(cache=cache_name).update(
-            version=generate_version_string()
-        )
+    CacheVersion.objects.update(version=get_random_version_expression())
+    clear_cached_cache_versions_on_commit()
+
+
+def get_random_version_expression():
+    # Generated by the database so every cache updated by single UPDATE query
+    # gets its own version string
+    return Substr(
+        Func(Cast(Func(function="RANDOM"), CharField()), function="MD5"),
+        1,
+        CacheVersion._meta.get_field("version").max_length,
+    )
+
+
+@contextmanager
+def coalesce_cache_invalidations():
+    """Collects caches invalidated inside the block and invalidates them with
+    single UPDATE query when the block ends.
+    """
+    if getattr(_coalesced, "caches", None) is not None:
+        yield  # Nested block, outermost one will run the invalidation
+        return
+
+    _coalesced.caches = set()
+    try:
+        yield
+    finally:
+        cache_names = _coalesced.caches
+        _coalesced.caches = None
+        invalidate_caches(*cache_names)
+
+
+def clear_cached_cache_versions_on_commit():
+    # Clear now so this process sees new versions immediately, and again after
+    # commit so other processes can't re-cache versions from before the update.
+    clear_cached_cache_versions()
+    transaction.on_commit(clear_cached_cache_versions)
@@ -2,3 +2,5 @@ default_app_config = "misago.categories.apps.MisagoCategoriesConfig"
 
 PRIVATE_THREADS_ROOT_NAME = "private_threads"
 THREADS_ROOT_NAME = "root_category"
+
+CATEGORIES_CACHE = "categories"
@@ -63,13 +63,11 @@ class CategoryFormMixin:
                     form.cleaned_data["new_parent"], position="last-child"
                 )
             form.instance.save()
-            if form.instance.parent_id != form.cleaned_data["new_parent"].pk:
-                Category.objects.clear_cache()
         else:
             form.instance.insert_at(
                 form.cleaned_data["new_parent"], position="last-child", save=True
             )
-            Category.objects.clear_cache()
+        Category.objects.clear_cache()
 
         if form.cleaned_data.get("copy_permissions"):
             form.instance.category_role_set.all().delete()
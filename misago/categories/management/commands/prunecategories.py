@@ -1,9 +1,10 @@
-from datetime import timedelta
+import time
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from ...models import Category
+from ...pruning import prune_category
 
 
 class Command(BaseCommand):
@@ -14,46 +15,50 @@ class Command(BaseCommand):
 
     help = "Prunes categories"
 
-    def handle(self, *args, **options):  # pylint: disable=too-many-branches
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="number of threads pruned together",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="count threads and posts that would be pruned, without pruning",
+        )
+
+    def handle(self, *args, **options):
         now = timezone.now()
-        synchronize_categories = []
-
-        for category in Category.objects.iterator():
-            archive = category.archive_pruned_in
-            pruned_threads = 0
-
-            threads_qs = category.thread_set.filter(weight=0)
-
-            if category.prune_started_after:
-                cutoff = now - timedelta(days=category.prune_started_after)
-                prune_qs = threads_qs.filter(started_on__lte=cutoff)
-                for thread in prune_qs.iterator():
-                    if archive:
-                        thread.move(archive)
-                        thread.save()
-                    else:
-                        thread.delete()
-                    pruned_threads += 1
-
-            if category.prune_replied_after:
-                cutoff = now - timedelta(days=category.prune_replied_after)
-                prune_qs = threads_qs.filter(last_post_on__lte=cutoff)
-                for thread in prune_qs.iterator():
-                    if archive:
-                        thread.move(archive)
-                        thread.save()
-                    else:
-                        thread.delete()
-                    pruned_threads += 1
-
-            if pruned_threads:
-                if category not in synchronize_categories:
-                    synchronize_categories.append(category)
-                if archive and archive not in synchronize_categories:
-                    synchronize_categories.append(archive)
-
-        for category in synchronize_categories:
-            category.synchronize()
-            category.save()
-
-        self.stdout.write("\n\nCategories were pruned")
+        batch_size = max(options["batch_size"], 1)
+        dry_run = options["dry_run"]
+
+        categories = Category.objects.select_related("archive_pruned_in")
+        for category in categories.iterator():
+            if not (category.prune_started_after or category.prune_replied_after):
+                continue
+
+            start_time = time.time()
+            result = prune_category(category, batch_size, now, dry_run)
+            total_time = time.time() - start_time
+
+            if dry_run or options["verbosity"] > 1:
+                self.write_result(category, result, total_time, dry_run)
+
+        if dry_run:
+            self.stdout.write("\n\nCategories were not pruned (dry run)")
+        else:
+            self.stdout.write("\n\nCategories were pruned")
+
+    def write_result(self, category, result, total_time, dry_run):
+        if category.archive_pruned_in:
+            action = "moved to %s" % category.archive_pruned_in
+        else:
+            action = "deleted"
+        if dry_run:
+            action = "would be %s" % action
+
+        message = "%s: %s threads with %s posts %s in %.2fs"
+        self.stdout.write(
+            message % (category, result.threads, result.posts, action, total_time)
+        )
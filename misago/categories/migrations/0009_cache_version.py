@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from .. import CATEGORIES_CACHE
+from ...cache.operations import StartCacheVersioning
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("misago_categories", "0008_auto_20190518_1659"),
+        ("misago_cache", "0001_initial"),
+    ]
+
+    operations = [StartCacheVersioning(CATEGORIES_CACHE)]
@@ -3,9 +3,10 @@ from django.db import models
 from mptt.managers import TreeManager
 from mptt.models import MPTTModel, TreeForeignKey
 
-from . import PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
+from . import CATEGORIES_CACHE, PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
 from ..acl.cache import clear_acl_cache
 from ..acl.models import BaseRole
+from ..cache.versions import invalidate_cache
 from ..conf import settings
 from ..core.utils import slugify
 from ..threads.threadtypes import trees_map
@@ -51,6 +52,7 @@ class CategoryManager(TreeManager):
 
     def clear_cache(self):
         cache.delete(CACHE_NAME)
+        invalidate_cache(CATEGORIES_CACHE)
 
 
 class Category(MPTTModel):
@@ -121,11 +123,30 @@ class Category(MPTTModel):
         else:
             self.posts = 0
 
-        if self.threads:
-            last_thread_qs = threads_queryset.filter(
-                is_hidden=False, is_unapproved=False
+        self.update_last_thread()
+
+    def update_counters(self, threads=0, posts=0):
+        """Changes threads and posts counters by deltas, updating them in database
+
+        Counters are changed with single UPDATE, so concurrent changes made by
+        other requests are not overwritten. Current counters are read back even
+        if they didn't change, so saving category doesn't overwrite them.
+        """
+        queryset = Category.objects.filter(pk=self.pk)
+        if threads or posts:
+            queryset.update(
+                threads=models.F("threads") + threads, posts=models.F("posts") + posts
             )
-            last_thread = last_thread_qs.order_by("-last_post_on")[:1][0]
+        self.threads, self.posts = queryset.values_list("threads", "posts").get()
+
+    def update_last_thread(self):
+        """Sets last thread to most recently active visible thread in category"""
+        last_thread = (
+            self.thread_set.filter(is_hidden=False, is_unapproved=False)
+            .order_by("-last_post_on")
+            .first()
+        )
+        if last_thread:
             self.set_last_thread(last_thread)
         else:
             self.empty_last_thread()
@@ -0,0 +1,101 @@
+"""Bulk pruning of categories content
+
+Threads matching category's pruning policy are selected in batches of ids, and
+every batch is moved to archive or deleted with single statement per table,
+instead of moving or deleting threads one by one. Categories counters are
+updated by numbers of pruned threads and posts, without recounting them.
+Cached posts indexes of deleted threads are cleared after every batch.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from ..threads.postsindex import clear_posts_indexes
+from .signals import archive_pruned_threads, delete_pruned_threads
+
+
+class PruningResult:
+    def __init__(self):
+        self.threads = 0
+        self.posts = 0
+        self.counted_threads = 0
+        self.counted_posts = 0
+
+    def add_batch(self, threads_queryset):
+        """Counts threads in batch, together with those counted in category"""
+        counts = threads_queryset.aggregate(
+            threads=Count("id"),
+            replies=Sum("replies"),
+            counted_threads=Count("id", filter=Q(is_hidden=False, is_unapproved=False)),
+            counted_replies=Sum(
+                "replies", filter=Q(is_hidden=False, is_unapproved=False)
+            ),
+        )
+
+        self.threads += counts["threads"]
+        self.posts += counts["threads"] + (counts["replies"] or 0)
+        self.counted_threads += counts["counted_threads"]
+        self.counted_posts += counts["counted_threads"] + (
+            counts["counted_replies"] or 0
+        )
+
+
+def get_prunable_threads(category, now=None):
+    """Returns queryset of threads that category's pruning policy applies to"""
+    now = now or timezone.now()
+
+    prune_filter = Q()
+    if category.prune_started_after:
+        cutoff = now - timedelta(days=category.prune_started_after)
+        prune_filter |= Q(started_on__lte=cutoff)
+    if category.prune_replied_after:
+        cutoff = now - timedelta(days=category.prune_replied_after)
+        prune_filter |= Q(last_post_on__lte=cutoff)
+
+    if not prune_filter:
+        return category.thread_set.none()
+    return category.thread_set.filter(prune_filter, weight=0)
+
+
+def prune_category(category, batch_size, now=None, dry_run=False):
+    """Prunes category's threads, returning PruningResult
+
+    In dry run threads are only counted, and nothing is changed.
+    """
+    result = PruningResult()
+    archive = category.archive_pruned_in
+
+    queryset = get_prunable_threads(category, now).order_by("id")
+    batch = list(queryset.values_list("id", flat=True)[:batch_size])
+    while batch:
+        if dry_run:
+            result.add_batch(category.thread_set.filter(id__in=batch))
+        else:
+            with transaction.atomic():
+                result.add_batch(category.thread_set.filter(id__in=batch))
+                if archive:
+                    archive_pruned_threads.send(
+                        sender=category, threads_ids=batch, new_category=archive
+                    )
+                else:
+                    delete_pruned_threads.send(sender=category, threads_ids=batch)
+            if not archive:
+                clear_posts_indexes(batch)
+
+        batch = list(
+            queryset.filter(id__gt=batch[-1]).values_list("id", flat=True)[:batch_size]
+        )
+
+    if result.threads and not dry_run:
+        category.update_counters(-result.counted_threads, -result.counted_posts)
+        category.update_last_thread()
+        category.save()
+
+        if archive:
+            archive.update_counters(result.counted_threads, result.counted_posts)
+            archive.update_last_thread()
+            archive.save()
+
+    return result
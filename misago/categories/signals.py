@@ -5,6 +5,8 @@ from .models import Category
 
 delete_category_content = Signal()
 move_category_content = Signal(providing_args=["new_category"])
+delete_pruned_threads = Signal(providing_args=["threads_ids"])
+archive_pruned_threads = Signal(providing_args=["threads_ids", "new_category"])
 
 
 @receiver([anonymize_user_data, username_changed])
@@ -0,0 +1,121 @@
+"""In-process snapshot of categories tree
+
+Snapshot keeps all categories with their ancestors, children and descendants
+precomputed, and is rebuilt when categories cache version changes. Categories
+returned from it are copies, so views may annotate them freely, but counters and
+last thread data on them may be out of date.
+"""
+import copy
+from threading import Lock
+
+from . import CATEGORIES_CACHE
+from ..conf import settings
+from .models import Category
+
+_snapshot = None
+_snapshot_lock = Lock()
+
+
+class CategoriesSnapshot:
+    def __init__(self, categories):
+        self._categories = {}
+        self._order = {}
+        self._ancestors = {}
+        self._children = {}
+        self._descendants = {}
+        self._special = {}
+
+        for category in categories:
+            self._categories[category.pk] = category
+            self._order[category.pk] = len(self._order)
+            if category.special_role:
+                self._special[category.special_role] = category.pk
+            self._children[category.pk] = []
+            self._descendants[category.pk] = []
+
+            if category.parent_id in self._categories:
+                ancestors = self._ancestors[category.parent_id]
+                self._children[category.parent_id].append(category.pk)
+            else:
+                ancestors = []
+
+            self._ancestors[category.pk] = ancestors + [category.pk]
+            for ancestor_id in ancestors:
+                self._descendants[ancestor_id].append(category.pk)
+
+    def __contains__(self, category_id):
+        return category_id in self._categories
+
+    def get_special_id(self, special_role):
+        return self._special[special_role]
+
+    def get_descendants_ids(self, category_id):
+        return list(self._descendants[category_id])
+
+    def get_category(self, category_id):
+        return copy_category(self._categories[category_id])
+
+    def get_categories(self, categories_ids):
+        """Returns copies of categories in tree order, with parent set"""
+        categories_ids = sorted(
+            (i for i in set(categories_ids) if i in self._categories),
+            key=self._order.get,
+        )
+        categories = {i: copy_category(self._categories[i]) for i in categories_ids}
+
+        for category in categories.values():
+            if category.parent_id in categories:
+                category.parent = categories[category.parent_id]
+        return list(categories.values())
+
+    def get_ancestors(self, category_id, include_self=True):
+        ancestors = self._ancestors[category_id]
+        if not include_self:
+            ancestors = ancestors[:-1]
+        return self.get_categories(ancestors)
+
+    def get_children(self, category_id):
+        return self.get_categories(self._children[category_id])
+
+    def get_descendants(self, category_id, include_self=False):
+        descendants = self._descendants[category_id]
+        if include_self:
+            descendants = [category_id] + descendants
+        return self.get_categories(descendants)
+
+
+def copy_category(category):
+    category_copy = copy.copy(category)
+    # copy has to have own state, or related objects set on it would be shared
+    category_copy._state = copy.copy(category._state)
+    category_copy._state.fields_cache = {}
+    return category_copy
+
+
+def get_categories_snapshot(cache_versions):
+    global _snapshot
+
+    if not settings.MISAGO_CATEGORIES_LOCAL_CACHE:
+        return build_categories_snapshot()
+
+    version = cache_versions[CATEGORIES_CACHE]
+    snapshot = _snapshot
+    if snapshot and snapshot[0] == version:
+        return snapshot[1]
+
+    with _snapshot_lock:
+        if _snapshot and _snapshot[0] == version:
+            return _snapshot[1]
+
+        categories_snapshot = build_categories_snapshot()
+        _snapshot = (version, categories_snapshot)
+        return categories_snapshot
+
+
+def build_categories_snapshot():
+    return CategoriesSnapshot(Category.objects.order_by("tree_id", "lft"))
+
+
+def clear_categories_snapshot():
+    global _snapshot
+    _snapshot = None
@@ -0,0 +1,171 @@
+import pytest
+from django.test import override_settings
+
+from .. import CATEGORIES_CACHE, PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
+from ..models import Category
+from ..snapshot import (
+    build_categories_snapshot,
+    clear_categories_snapshot,
+    get_categories_snapshot,
+)
+
+
+@pytest.fixture
+def child_category(default_category):
+    category = Category(name="Child", slug="child")
+    category.insert_at(default_category, position="last-child", save=True)
+    return category
+
+
+@pytest.fixture
+def other_child_category(default_category, child_category):
+    category = Category(name="Other Child", slug="other-child")
+    category.insert_at(default_category, position="last-child", save=True)
+    return category
+
+
+@pytest.fixture
+def grandchild_category(child_category):
+    category = Category(name="Grandchild", slug="grandchild")
+    category.insert_at(child_category, position="last-child", save=True)
+    return category
+
+
+@pytest.fixture
+def snapshot(root_category, child_category, other_child_category, grandchild_category):
+    return build_categories_snapshot()
+
+
+def test_snapshot_returns_special_categories_ids(snapshot, root_category):
+    assert snapshot.get_special_id(THREADS_ROOT_NAME) == root_category.pk
+    assert snapshot.get_special_id(PRIVATE_THREADS_ROOT_NAME) == (
+        Category.objects.private_threads().pk
+    )
+
+
+def test_snapshot_returns_copy_of_category(snapshot, default_category):
+    category = snapshot.get_category(default_category.pk)
+    assert category == default_category
+    assert category is not snapshot.get_category(default_category.pk)
+
+
+def test_snapshot_returns_categories_in_tree_order_with_parents(
+    snapshot, default_category, child_category, grandchild_category
+):
+    categories = snapshot.get_categories(
+        [grandchild_category.pk, default_category.pk, child_category.pk]
+    )
+    assert categories == [default_category, child_category, grandchild_category]
+    assert categories[1].parent is categories[0]
+    assert categories[2].parent is categories[1]
+
+
+def test_snapshot_returns_category_ancestors(
+    snapshot, root_category, default_category, child_category, grandchild_category
+):
+    assert snapshot.get_ancestors(grandchild_category.pk) == [
+        root_category,
+        default_category,
+        child_category,
+        grandchild_category,
+    ]
+    assert snapshot.get_ancestors(grandchild_category.pk, include_self=False) == [
+        root_category,
+        default_category,
+        child_category,
+    ]
+
+
+def test_snapshot_returns_category_children(
+    snapshot, default_category, child_category, other_child_category
+):
+    assert snapshot.get_children(default_category.pk) == [
+        child_category,
+        other_child_category,
+    ]
+
+
+def test_snapshot_returns_category_descendants(
+    snapshot,
+    default_category,
+    child_category,
+    other_child_category,
+    grandchild_category,
+):
+    assert snapshot.get_descendants(default_category.pk) == [
+        child_category,
+        grandchild_category,
+        other_child_category,
+    ]
+
+
+def test_setting_parent_on_copy_doesnt_change_snapshot(
+    snapshot, default_category, child_category
+):
+    categories = snapshot.get_categories([default_category.pk, child_category.pk])
+    categories[0].name = "Changed"
+    assert snapshot.get_category(default_category.pk).name == default_category.name
+    assert snapshot.get_children(default_category.pk)[0].parent.name != "Changed"
+
+
+def test_changing_copy_relations_doesnt_change_snapshot(
+    snapshot, default_category, child_category
+):
+    category = snapshot.get_category(child_category.pk)
+    category.parent.name = "Changed"
+    category.special_role = "changed"
+    assert snapshot.get_category(default_category.pk).name == default_category.name
+    assert snapshot.get_category(child_category.pk).special_role is None
+
+
+def test_changing_copies_in_list_doesnt_change_snapshot(snapshot, default_category):
+    categories = snapshot.get_descendants(default_category.pk, include_self=True)
+    for category in categories:
+        category.name = "Changed"
+    assert "Changed" not in [
+        category.name
+        for category in snapshot.get_descendants(default_category.pk, include_self=True)
+    ]
+
+
+def test_snapshot_is_cached_for_cache_version(
+    django_assert_num_queries, default_category
+):
+    snapshot = get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"})
+    with django_assert_num_queries(0):
+        assert get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"}) is snapshot
+
+
+def test_cached_snapshot_is_not_updated_for_same_cache_version(default_category):
+    get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"})
+    Category.objects.filter(pk=default_category.pk).update(name="Changed")
+
+    snapshot = get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"})
+    assert snapshot.get_category(default_category.pk).name == default_category.name
+
+
+def test_snapshot_is_rebuilt_for_new_cache_version(default_category):
+    snapshot = get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"})
+    Category.objects.filter(pk=default_category.pk).update(name="Changed")
+
+    new_snapshot = get_categories_snapshot({CATEGORIES_CACHE: "changed"})
+    assert new_snapshot is not snapshot
+    assert new_snapshot.get_category(default_category.pk).name == "Changed"
+
+
+def test_snapshot_is_rebuilt_after_its_cleared(default_category):
+    snapshot = get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"})
+    clear_categories_snapshot()
+    assert get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"}) is not snapshot
+
+
+@override_settings(MISAGO_CATEGORIES_LOCAL_CACHE=False)
+def test_snapshot_is_not_cached_if_local_cache_is_disabled(default_category):
+    snapshot = get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"})
+    assert get_categories_snapshot({CATEGORIES_CACHE: "abcdefgh"}) is not snapshot
+
+
+def test_clearing_categories_cache_invalidates_cache_version(mocker):
+    invalidate_cache = mocker.patch("misago.categories.models.invalidate_cache")
+    Category.objects.clear_cache()
+    invalidate_cache.assert_called_once_with(CATEGORIES_CACHE)
@@ -1,5 +1,6 @@
 from datetime import timedelta
 from io import StringIO
+from unittest.mock import patch
 
 from django.core.management import call_command
 from django.test import TestCase
@@ -172,3 +173,68 @@ class PruneCategoriesTests(TestCase):
 
         command_output = out.getvalue().strip()
         self.assertEqual(command_output, "Categories were pruned")
+
+    def test_category_prune_in_batches(self):
+        """command prunes category content in batches and updates its counters"""
+        category = Category.objects.all_categories()[:1][0]
+
+        category.prune_started_after = 20
+        category.save()
+
+        # post old threads with replies
+        started_on = timezone.now() - timedelta(days=30)
+        for _ in range(5):
+            thread = test.post_thread(category, started_on=started_on)
+            test.reply_thread(thread, posted_on=started_on)
+
+        # post hidden old thread that is not counted in category
+        test.post_thread(category, started_on=started_on, is_hidden=True)
+
+        # post recent thread that will be preserved
+        thread = test.post_thread(category)
+
+        category.synchronize()
+        category.save()
+
+        pruned_threads = list(category.thread_set.exclude(id=thread.id).order_by("id"))
+        with patch("misago.categories.pruning.clear_posts_indexes") as clear_indexes:
+            call_command(prunecategories.Command(), batch_size=2, stdout=StringIO())
+
+        self.assertEqual(
+            [c[0][0] for c in clear_indexes.call_args_list],
+            [[t.id for t in pruned_threads[i : i + 2]] for i in range(0, 6, 2)],
+        )
+
+        category = Category.objects.get(pk=category.pk)
+        self.assertEqual(category.threads, 1)
+        self.assertEqual(category.posts, 1)
+        self.assertEqual(category.last_thread_id, thread.id)
+        self.assertEqual(category.thread_set.count(), 1)
+
+    def test_category_prune_dry_run(self):
+        """command in dry run mode counts prunable content without pruning it"""
+        category = Category.objects.all_categories()[:1][0]
+
+        category.prune_started_after = 20
+        category.save()
+
+        started_on = timezone.now() - timedelta(days=30)
+        for _ in range(5):
+            thread = test.post_thread(category, started_on=started_on)
+            test.reply_thread(thread, posted_on=started_on)
+        test.post_thread(category)
+
+        out = StringIO()
+        with patch("misago.categories.pruning.transaction.atomic") as atomic:
+            call_command(prunecategories.Command(), dry_run=True, stdout=out)
+        atomic.assert_not_called()
+
+        self.assertEqual(category.thread_set.count(), 6)
+
+        command_output = out.getvalue().strip().splitlines()
+        self.assertTrue(
+            command_output[0].startswith(
+                "%s: 5 threads with 10 posts would be deleted in " % category
+            )
+        )
+        self.assertEqual(command_output[-1], "Categories were not pruned (dry run)")
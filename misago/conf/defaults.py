@@ -7,6 +7,24 @@ If you rely on any of those in your code, make sure you use `misago.conf.setting
 instead of Django's `django.conf.settings`.
 """
 
+# How long (in seconds) cache versions may be kept in process memory before being
+# read again from the shared cache or database. Set to 0 to disable process cache.
+
+MISAGO_CACHE_VERSIONS_TTL = 5
+
+
+# Number of user ACLs kept in process memory in front of the shared cache.
+# Set to 0 to disable process cache.
+
+MISAGO_ACL_LOCAL_CACHE_SIZE = 256
+
+
+# Keep snapshot of categories tree in process memory, rebuilding it when
+# categories cache version changes.
+
+MISAGO_CATEGORIES_LOCAL_CACHE = True
+
+
 # Permissions system extensions
 # https://misago.readthedocs.io/en/latest/developers/acls.html#extending-permissions-system
 
@@ -51,6 +69,27 @@ MISAGO_POST_VALIDATORS = []
 MISAGO_POST_SEARCH_FILTERS = []
 
 
+# Engine used to find users by their names in search and mentions.
+# "database" queries users table, using trigram index on users slugs for substring
+# lookups if pg_trgm extension was available when migrations were ran. "memory"
+# keeps index of users slugs in process memory and is suitable for smaller sites.
+
+MISAGO_USERS_SEARCH_ENGINE = "database"
+
+
+# Number of seconds for which ranked ids of posts found by threads search are
+# cached for query and permissions set, so next pages of results don't repeat
+# the search.
+
+MISAGO_THREADS_SEARCH_CACHE_TIMEOUT = 300
+
+# Maximum number of newest posts matching threads search query that are ranked.
+# Ranking reads search vector of every ranked post, so popular terms would rank
+# most of the posts on the site. Older matches are not included in results.
+
+MISAGO_THREADS_SEARCH_RANKED_MATCHES = 1000
+
+
 # Posting middlewares
 # https://misago.readthedocs.io/en/latest/developers/posting_process.html
 
@@ -95,6 +134,22 @@ MISAGO_SEARCH_EXTENSIONS = [
 ]
 
 
+# Number of threads running search providers concurrently for search landing page.
+# Set to 1 to run providers one after another.
+
+MISAGO_SEARCH_PROVIDERS_WORKERS = 4
+
+# Number of seconds landing search waits for providers results. Providers that
+# don't finish in this time return empty results.
+
+MISAGO_SEARCH_PROVIDER_TIME_BUDGET = 3
+
+# Number of seconds for which search providers results are cached for query and
+# user. Set to 0 to disable caching.
+
+MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT = 15
+
+
 # Additional registration validators
 # https://misago.readthedocs.io/en/latest/developers/validating_registrations.html
 
@@ -129,6 +184,71 @@ MISAGO_ADMIN_NAMESPACES = ["admin", "misago:admin"]
 
 MISAGO_ADMIN_SESSION_EXPIRATION = 60
 
+# Number of user accounts deleted together by "Delete accounts" mass action in
+# admin. Accounts are still deleted in request, but every chunk of them is
+# deleted in its own transaction, so database rows aren't locked for long.
+
+MISAGO_ADMIN_DELETE_USERS_CHUNK_SIZE = 4
+
+# Admin lists paginated with keyset pagination count items exactly only when
+# PostgreSQL estimates that there are fewer of them than this number. Bigger
+# counts are displayed from estimate, because counting them is slow.
+
+MISAGO_ADMIN_EXACT_COUNT_LIMIT = 10000
+
+
+# Number of seconds that have to pass since user's last click for online tracker
+# to record next one.
+
+MISAGO_ONLINE_TRACKER_GRANULARITY = 30
+
+# Number of seconds between writes of buffered users last clicks to database.
+# Set to 0 to save every recorded click right away.
+
+MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL = 60
+
+
+# Read tracker storage
+# "posts" stores read state for every post read by user. "threads" stores single
+# read marker with id of last read post for every thread read by user, which is
+# much cheaper to query and store on big forums. Existing read state can be moved
+# to read markers with migratereadtracker command.
+
+MISAGO_READTRACKER_STORAGE = "posts"
+
+# Number of seconds for which summary of unread threads in categories is cached
+# for user. Categories in summary are updated as new posts are made or read, but
+# summary is rebuilt from scratch after this time passes.
+
+MISAGO_UNREAD_SUMMARY_TIMEOUT = 3600
+
+
+# Who sends e-mail notifications about new replies to threads subscribers.
+# "celery" sends them from Celery task, outside of the posting request. "inline"
+# sends them at the end of the posting request, and is meant for setups without
+# Celery worker. "command" leaves them in queue for sendreplynotifications
+# command, which should then be run often (eg. every minute) by cron or other
+# scheduler.
+
+MISAGO_REPLY_NOTIFICATIONS_SENDER = "celery"
+
+# Number of queued reply notifications taken from queue at once when sending them
+
+MISAGO_REPLY_NOTIFICATIONS_BATCH_SIZE = 50
+
+
+# Posts pagination on thread pages
+# "offset" counts and slices thread's posts in database. "keyset" keeps cached
+# index of posts ids for every thread and selects page's posts by their ids, so
+# deep pages and going to posts in very long threads don't become slower.
+
+MISAGO_POSTS_PAGINATION = "keyset"
+
+# Number of seconds for which index of posts ids in thread is cached. Index is
+# updated as posts are saved, and is rebuilt from database after this time passes.
+
+MISAGO_POSTS_INDEX_CACHE_TIMEOUT = 3600
+
 
 # Display threads on forum index
 # Change this to false to display categories list instead
@@ -1,8 +1,11 @@
 import pytest
 
 from .acl import ACL_CACHE, useracl
+from .acl.cache import clear_local_acl_cache
 from .admin.auth import authorize_admin
+from .categories import CATEGORIES_CACHE
 from .categories.models import Category
+from .categories.snapshot import clear_categories_snapshot
 from .conf import SETTINGS_CACHE
 from .conf.dynamicsettings import DynamicSettings
 from .conf.staticsettings import StaticSettings
@@ -11,8 +14,9 @@ from .socialauth import SOCIALAUTH_CACHE
 from .test import MisagoClient
 from .themes import THEME_CACHE
 from .threads.test import post_thread
-from .users import BANS_CACHE
+from .users import BANS_CACHE, USERS_SEARCH_CACHE
 from .users.models import AnonymousUser
+from .users.online import tracker as online_tracker
 from .users.test import create_test_superuser, create_test_user
 
 
@@ -20,13 +24,28 @@ def get_cache_versions():
     return {
         ACL_CACHE: "abcdefgh",
         BANS_CACHE: "abcdefgh",
+        CATEGORIES_CACHE: "abcdefgh",
         SETTINGS_CACHE: "abcdefgh",
         SOCIALAUTH_CACHE: "abcdefgh",
         THEME_CACHE: "abcdefgh",
         MENU_ITEMS_CACHE: "abcdefgh",
+        USERS_SEARCH_CACHE: "abcdefgh",
     }
 
 
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    # tests reuse cache versions and roll back their database changes,
+    # don't let them share process caches and buffers
+    clear_categories_snapshot()
+    clear_local_acl_cache()
+    online_tracker._buffer.clear()
+    yield
+    clear_categories_snapshot()
+    clear_local_acl_cache()
+    online_tracker._buffer.clear()
+
+
 @pytest.fixture
 def cache_versions():
     return get_cache_versions()
@@ -1,3 +1,8 @@
+import json
+
+from django.db import connections, router
+
+
 def chunk_queryset(queryset, chunk_size=20):
     ordered_queryset = queryset.order_by("-pk")  # bias to newest items first
     chunk = ordered_queryset[:chunk_size]
@@ -7,3 +12,26 @@ def chunk_queryset(queryset, chunk_size=20):
             last_pk = item.pk
             yield item
         chunk = ordered_queryset.filter(pk__lt=last_pk)[:chunk_size]
+
+
+def get_estimated_count(queryset):
+    """Returns number of rows in queryset estimated by PostgreSQL query planner"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) %s" % sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_table_estimated_count(model):
+    """Returns number of rows in model's table from PostgreSQL statistics"""
+    with connections[router.db_for_read(model)].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # table that was never analyzed has no statistics, reported as -1 or 0
+    return max(int(row[0]), 0) if row else 0
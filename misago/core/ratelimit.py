@@ -0,0 +1,80 @@
+"""Sliding window rate limits for throttled actions (eg. posting or liking)
+
+Hits are counted in small, fixed time buckets stored in single cache entry for
+every action and key (usually user id), so checking limit costs single cache get
+no matter how many hits are in the window. When entry is missing from cache
+(eg. it was evicted), buckets are rebuilt from timestamps of most recent hits,
+loaded with function passed by caller.
+"""
+import time
+from datetime import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+class RateLimit:
+    def __init__(self, action, window, buckets=12):
+        self.action = action
+        self.window = window
+        self.bucket_size = max(window // buckets, 1)
+
+    def get_hits(self, key, limit, load_hits, now=None):
+        """Returns number of hits in window, counting no more than limit of them
+
+        load_hits is called with datetime of window's start and limit when hits
+        have to be rebuilt, and should return datetimes of limit newest hits.
+        """
+        now = now or time.time()
+        buckets = cache.get(self.get_cache_key(key))
+        if buckets is None:
+            buckets = self.build_buckets(load_hits, limit, now)
+            self.set_buckets(key, buckets, now)
+
+        hits = 0
+        for bucket, bucket_hits in buckets.items():
+            bucket_start = bucket * self.bucket_size
+            if bucket_start + self.bucket_size <= now - self.window:
+                continue  # bucket left the window
+            if bucket_start < now - self.window:
+                # bucket is partially in the window, count hits in this part
+                in_window = bucket_start + self.bucket_size - now + self.window
+                bucket_hits *= in_window / self.bucket_size
+            hits += bucket_hits
+
+        return round(hits)
+
+    def is_limit_exceeded(self, key, limit, load_hits, now=None):
+        return self.get_hits(key, limit, load_hits, now) >= limit
+
+    def add_hit(self, key, now=None):
+        """Counts hit in buckets, if they are in cache
+
+        Missing buckets are not created, because hits that they will be rebuilt
+        from should already include this one.
+        """
+        now = now or time.time()
+        buckets = cache.get(self.get_cache_key(key))
+        if buckets is not None:
+            bucket = self.get_bucket(now)
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+            self.set_buckets(key, buckets, now)
+
+    def build_buckets(self, load_hits, limit, now):
+        buckets = {}
+        cutoff = datetime.fromtimestamp(now - self.window, tz=timezone.utc)
+        for hit in load_hits(cutoff, limit):
+            bucket = self.get_bucket(hit.timestamp())
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        return buckets
+
+    def set_buckets(self, key, buckets, now):
+        oldest_bucket = self.get_bucket(now - self.window)
+        buckets = {b: h for b, h in buckets.items() if b >= oldest_bucket}
+        cache.set(self.get_cache_key(key), buckets, self.window + self.bucket_size)
+
+    def get_bucket(self, timestamp):
+        return int(timestamp // self.bucket_size)
+
+    def get_cache_key(self, key):
+        return "ratelimit_%s_%s" % (self.action, key)
@@ -0,0 +1,10 @@
+from ...users.models import Rank
+from ..pgutils import get_estimated_count, get_table_estimated_count
+
+
+def test_estimated_count_is_returned_for_queryset(db):
+    assert get_estimated_count(Rank.objects.filter(name="Test")) >= 0
+
+
+def test_estimated_count_is_returned_for_table(db):
+    assert get_table_estimated_count(Rank) >= 0
@@ -0,0 +1,70 @@
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from .. import ratelimit
+from ..ratelimit import RateLimit
+
+cache = LocMemCache("ratelimit-tests", {})
+
+NOW = 3600 * 1000
+
+
+def get_datetime(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+@patch.object(ratelimit, "cache", cache)
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.ratelimit = RateLimit("test", 3600)
+
+    def test_hits_are_loaded_when_cache_is_empty(self):
+        """hits are loaded using function when they are not cached"""
+        load_hits = Mock(return_value=[get_datetime(NOW - 10)] * 2)
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW), 2)
+        load_hits.assert_called_once_with(get_datetime(NOW - 3600), 5)
+
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW), 2)
+        load_hits.assert_called_once()
+
+    def test_added_hit_is_counted(self):
+        """hit added to cached buckets is counted"""
+        load_hits = Mock(return_value=[])
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW), 0)
+
+        self.ratelimit.add_hit(1, now=NOW)
+        self.ratelimit.add_hit(1, now=NOW + 1)
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW + 1), 2)
+        self.assertTrue(self.ratelimit.is_limit_exceeded(1, 2, load_hits, now=NOW + 1))
+        self.assertFalse(self.ratelimit.is_limit_exceeded(2, 2, load_hits, now=NOW))
+
+    def test_hit_is_not_added_to_missing_buckets(self):
+        """hit is not counted if buckets are not cached"""
+        self.ratelimit.add_hit(1, now=NOW)
+
+        load_hits = Mock(return_value=[])
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW), 0)
+
+    def test_hits_leave_window(self):
+        """hits older than window stop being counted"""
+        load_hits = Mock(return_value=[])
+        self.ratelimit.get_hits(1, 5, load_hits, now=NOW)
+        self.ratelimit.add_hit(1, now=NOW)
+        self.ratelimit.add_hit(1, now=NOW + 1800)
+
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW + 3000), 2)
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW + 3900), 1)
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW + 5700), 0)
+
+    def test_hits_in_partially_expired_bucket_are_weighted(self):
+        """hits in bucket partially out of window are counted proportionally"""
+        load_hits = Mock(return_value=[get_datetime(NOW)] * 4)
+        self.ratelimit.get_hits(1, 5, load_hits, now=NOW)
+
+        # bucket is 5 minutes long, half of it is out of the window
+        self.assertEqual(self.ratelimit.get_hits(1, 5, load_hits, now=NOW + 3750), 2)
@@ -68,6 +68,7 @@ class Command(BaseCommand):
             created_count += 1
             show_progress(self, created_count, items_to_create, start_time)
 
+        Category.objects.clear_cache()
         clear_acl_cache()
 
         total_time = time.time() - start_time
@@ -7,6 +7,7 @@ from django.utils import timezone
 
 from ...threads.models import Attachment, Post, Thread
 from ...users.models import DataDownload, DeletedUser
+from .rollups import get_daily_counts
 
 CACHE_KEY = "misago_admin_analytics"
 CACHE_LENGTH = 3600 * 4  # 4 hours
@@ -39,44 +40,38 @@ def get_data_from_db(span):
     analytics = Analytics(span)
 
     return {
-        "users": analytics.get_data_for_model(User, "joined_on"),
-        "userDeletions": analytics.get_data_for_model(DeletedUser, "deleted_on"),
-        "threads": analytics.get_data_for_model(Thread, "started_on"),
-        "posts": analytics.get_data_for_model(Post, "posted_on"),
-        "attachments": analytics.get_data_for_model(Attachment, "uploaded_on"),
-        "dataDownloads": analytics.get_data_for_model(DataDownload, "requested_on"),
+        metric: analytics.get_data_for_model(metric, model, date_attr)
+        for metric, (model, date_attr) in get_metrics().items()
+    }
+
+
+def get_metrics():
+    return {
+        "users": (User, "joined_on"),
+        "userDeletions": (DeletedUser, "deleted_on"),
+        "threads": (Thread, "started_on"),
+        "posts": (Post, "posted_on"),
+        "attachments": (Attachment, "uploaded_on"),
+        "dataDownloads": (DataDownload, "requested_on"),
     }
 
 
 class Analytics:
     def __init__(self, span):
-        self.today = timezone.now()
+        self.today = timezone.now().date()
         self.span = span
 
-        self.cutoff = self.today - timedelta(days=span * 2)
-        self.legend = self.get_legend()
-
-    def get_legend(self):
-        legend = []
-        for day in range(self.span * 2):
-            date = self.today - timedelta(days=day)
-            legend.append(date.strftime("%x"))
-        return legend
-
-    def get_empty_data(self):
-        return {k: 0 for k in self.legend}
-
-    def get_data_for_model(self, model, date_attr):
-        filter_kwarg = {"%s__gte" % date_attr: self.cutoff}
-        queryset = model.objects.filter(**filter_kwarg).order_by("-pk")
+        self.start = self.today - timedelta(days=span * 2 - 1)
 
-        data = self.get_empty_data()
-        for item in queryset.values(date_attr).iterator():
-            date = item[date_attr].strftime("%x")
-            if date in data:
-                data[date] += 1
+    def get_data_for_model(self, metric, model, date_attr):
+        counts = get_daily_counts(
+            metric, model.objects, date_attr, self.start, self.today
+        )
 
-        values = list(data.values())
+        values = [
+            counts.get(self.today - timedelta(days=day), 0)
+            for day in range(self.span * 2)
+        ]
         current = list(reversed(values[: self.span]))
         previous = list(reversed(values[self.span :]))
 
@@ -0,0 +1,94 @@
+"""Daily rollups of admin analytics
+
+Number of items created every day is counted once, with aggregate query
+truncating their dates to days in database, and stored in rollup table. After
+that, reading analytics for days that have ended costs one small row per day.
+Days missing from rollup table (eg. today) are aggregated in database whenever
+analytics are read, and ended days are added to rollup table then.
+
+Rollups are not updated when items are deleted, so counts of days that were
+rolled up don't go down after deletions. backfillanalytics command rebuilds
+rollups for recent days from database, and should be ran daily by cron.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, DateTimeField
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from ..models import AnalyticsRollup
+
+
+def get_daily_counts(metric, queryset, date_attr, start, end):
+    """Returns dict of days from start to end and items created on them"""
+    rollups = AnalyticsRollup.objects.filter(
+        metric=metric, date__gte=start, date__lte=end
+    )
+    counts = dict(rollups.values_list("date", "count"))
+
+    missing_days = [day for day in get_days(start, end) if day not in counts]
+    if missing_days:
+        aggregated = aggregate_daily_counts(queryset, date_attr, missing_days[0], end)
+        for day in missing_days:
+            counts[day] = aggregated.get(day, 0)
+        save_rollups(metric, {day: counts[day] for day in missing_days})
+
+    return counts
+
+
+def rebuild_rollups(metric, queryset, date_attr, start, end):
+    """Replaces rollups for days from start to end with counts from database"""
+    aggregated = aggregate_daily_counts(queryset, date_attr, start, end)
+    counts = {day: aggregated.get(day, 0) for day in get_days(start, end)}
+
+    with transaction.atomic():
+        AnalyticsRollup.objects.filter(
+            metric=metric, date__gte=start, date__lte=end
+        ).delete()
+        save_rollups(metric, counts)
+
+    return counts
+
+
+def aggregate_daily_counts(queryset, date_attr, start, end):
+    """Returns dict of days and items created on them, counted by database"""
+    queryset = (
+        queryset.filter(
+            **{
+                "%s__gte" % date_attr: get_day_start(start),
+                "%s__lt" % date_attr: get_day_start(end + timedelta(days=1)),
+            }
+        )
+        .annotate(
+            day=Trunc(
+                date_attr, "day", output_field=DateTimeField(), tzinfo=timezone.utc
+            )
+        )
+        .values("day")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+
+    return {row["day"].date(): row["count"] for row in queryset}
+
+
+def save_rollups(metric, counts):
+    """Saves rollups for days that have already ended"""
+    today = timezone.now().date()
+    AnalyticsRollup.objects.bulk_create(
+        [
+            AnalyticsRollup(metric=metric, date=day, count=count)
+            for day, count in counts.items()
+            if day < today
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def get_days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def get_day_start(day):
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from ....users.test import create_test_user
+from ...management.commands import backfillanalytics
+from ...models import AnalyticsRollup
+from ..analytics import User, get_data_from_db
+from ..rollups import aggregate_daily_counts, get_daily_counts
+
+today = timezone.now().date()
+yesterday = today - timedelta(days=1)
+previous_datetime = timezone.now() - timedelta(days=30)
+
+
+def test_ended_days_are_rolled_up_when_analytics_are_read(db):
+    create_test_user("User", "user@example.com", joined_on=previous_datetime)
+    get_data_from_db(30)
+
+    rollups = AnalyticsRollup.objects.filter(metric="users")
+    assert rollups.count() == 59
+    assert not rollups.filter(date=today).exists()
+    assert rollups.get(date=previous_datetime.date()).count == 1
+
+
+def test_rolled_up_days_are_read_from_rollups(db):
+    AnalyticsRollup.objects.create(metric="users", date=yesterday, count=5)
+    counts = get_daily_counts("users", User.objects, "joined_on", yesterday, today)
+    assert counts == {yesterday: 5, today: 0}
+
+
+def test_days_missing_from_rollups_are_aggregated_in_database(db):
+    create_test_user("User", "user@example.com")
+    create_test_user("Other", "other@example.com", joined_on=previous_datetime)
+
+    counts = aggregate_daily_counts(
+        User.objects, "joined_on", previous_datetime.date(), today
+    )
+    assert counts == {previous_datetime.date(): 1, today: 1}
+
+
+def test_backfill_command_rebuilds_rollups(db):
+    AnalyticsRollup.objects.create(metric="users", date=yesterday, count=5)
+    create_test_user("User", "user@example.com", joined_on=previous_datetime)
+
+    out = StringIO()
+    call_command(backfillanalytics.Command(), days=60, stdout=out)
+
+    rollups = AnalyticsRollup.objects.filter(metric="users")
+    assert rollups.count() == 60
+    assert rollups.get(date=yesterday).count == 0
+    assert rollups.get(date=previous_datetime.date()).count == 1
+    assert out.getvalue().strip().endswith("Rebuilt analytics rollups")
+
+
+def test_rolled_up_counts_are_not_changed_by_deletions(db):
+    user = create_test_user("User", "user@example.com", joined_on=previous_datetime)
+    get_data_from_db(30)
+    user.delete(anonymous_username="Deleted")
+
+    counts = get_daily_counts(
+        "users", User.objects, "joined_on", previous_datetime.date(), yesterday
+    )
+    assert counts[previous_datetime.date()] == 1
+
+
+def test_backfill_command_removes_deleted_items_from_recent_rollups(db):
+    user = create_test_user("User", "user@example.com", joined_on=previous_datetime)
+    get_data_from_db(30)
+    user.delete(anonymous_username="Deleted")
+
+    call_command(backfillanalytics.Command(), stdout=StringIO())
+
+    rollups = AnalyticsRollup.objects.filter(metric="users")
+    assert rollups.get(date=previous_datetime.date()).count == 0
+    assert rollups.filter(date__gte=today - timedelta(days=30)).count() == 30
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...admin.analytics import get_metrics
+from ...admin.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    This command is intended to work as CRON job fired daily to rebuild
+    analytics rollups for recent days, so deleted items stop being counted.
+    Run it with bigger --days once to rebuild whole analytics history.
+    """
+
+    help = "Rebuilds daily rollups of admin analytics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="number of past days to rebuild rollups for",
+        )
+
+    def handle(self, *args, **options):
+        days = max(options["days"], 1)
+
+        end = timezone.now().date() - timedelta(days=1)
+        start = end - timedelta(days=days - 1)
+
+        self.stdout.write("Rebuilding analytics for %s days...\n" % days)
+
+        for metric, (model, date_attr) in get_metrics().items():
+            counts = rebuild_rollups(metric, model.objects, date_attr, start, end)
+            self.stdout.write("%s: %s" % (metric, sum(counts.values())))
+
+        self.stdout.write("\n\nRebuilt analytics rollups")
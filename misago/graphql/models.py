@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class AnalyticsRollup(models.Model):
+    metric = models.CharField(max_length=32)
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [["metric", "date"]]
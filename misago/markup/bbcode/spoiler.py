@@ -14,11 +14,16 @@ class SpoilerExtension(markdown.Extension):
     def extendMarkdown(self, md):
         md.registerExtension(self)
 
+        self.block_processor = SpoilerBlockProcessor(md.parser)
+
         md.preprocessors.add("misago_bbcode_spoiler", SpoilerPreprocessor(md), "_end")
         md.parser.blockprocessors.add(
-            "misago_bbcode_spoiler", SpoilerBlockProcessor(md.parser), ">code"
+            "misago_bbcode_spoiler", self.block_processor, ">code"
         )
 
+    def reset(self):
+        self.block_processor.reset()
+
 
 class SpoilerPreprocessor(Preprocessor):
     SPOILER_BLOCK_RE = re.compile(
@@ -42,6 +47,9 @@ class SpoilerPreprocessor(Preprocessor):
 class SpoilerBlockProcessor(BlockProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.reset()
+
+    def reset(self):
         self._spoiler = 0
         self._children = []
 
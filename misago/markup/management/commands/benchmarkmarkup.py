@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ....threads.models import Post
+from ....threads.reprocessing import ReparsingRequest, get_forum_host
+from ...parser import clear_markdown_pool, parse
+
+
+class Command(BaseCommand):
+    help = (
+        "Parses corpus of latest posts and reports number of posts parsed per "
+        "second with markdown object created for every post and reused from pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts", help="number of posts to parse", type=int, default=1000
+        )
+        parser.add_argument(
+            "--repeat", help="number of times corpus is parsed", type=int, default=3
+        )
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.filter(is_event=False).order_by("-id")
+        corpus = list(queryset.values_list("original", flat=True)[: options["posts"]])
+
+        if not corpus:
+            self.stdout.write("\n\nNo posts were found")
+            return
+
+        host = get_forum_host()
+        if not host:
+            raise CommandError("Forum address has to be set to parse posts.")
+
+        # parser resolves links against forum address, like when reparsing posts
+        request = ReparsingRequest(host)
+        repeat = max(options["repeat"], 1)
+
+        self.stdout.write("%-10s %10s %12s" % ("markdown", "posts", "posts/s"))
+        for name, reuse_markdown in (("created", False), ("pooled", True)):
+            clear_markdown_pool()
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                for text in corpus:
+                    if not reuse_markdown:
+                        clear_markdown_pool()
+                    parse(text, request, None, allow_mentions=False)
+            duration = time.perf_counter() - start_time
+
+            parsed_posts = len(corpus) * repeat
+            self.stdout.write(
+                "%-10s %10s %12.1f" % (name, parsed_posts, parsed_posts / duration)
+            )
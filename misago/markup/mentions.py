@@ -1,4 +1,5 @@
 import re
+from html import escape
 
 from bs4 import BeautifulSoup
 from django.contrib.auth import get_user_model
@@ -8,58 +9,85 @@ USERNAME_RE = re.compile(r"@[0-9a-z]+", re.IGNORECASE)
 MENTIONS_LIMIT = 24
 
 
-def add_mentions(request, result):
+def add_mentions(request, result, soup=None):
     if "@" not in result["parsed_text"]:
         return
 
-    mentions_dict = {}
-
-    soup = BeautifulSoup(result["parsed_text"], "html5lib")
+    update_parsed_text = soup is None
+    if update_parsed_text:
+        soup = BeautifulSoup(result["parsed_text"], "html5lib")
 
     elements = []
     for tagname in SUPPORTED_TAGS:
         if tagname in result["parsed_text"]:
             elements += soup.find_all(tagname)
+
+    strings = []
     for element in elements:
-        add_mentions_to_element(request, element, mentions_dict)
+        find_strings_with_mentions(element, strings)
+
+    mentions_dict = resolve_mentions(request, get_mentioned_slugs(strings))
+    for string in strings:
+        parse_string(string, mentions_dict)
 
-    result["parsed_text"] = str(soup.body)[6:-7].strip()
+    if update_parsed_text:
+        result["parsed_text"] = str(soup.body)[6:-7].strip()
     result["mentions"] = list(filter(bool, mentions_dict.values()))
 
 
-def add_mentions_to_element(request, element, mentions_dict):
+def find_strings_with_mentions(element, strings):
     for item in element.contents:
         if item.name:
             if item.name != "a":
-                add_mentions_to_element(request, item, mentions_dict)
+                find_strings_with_mentions(item, strings)
         elif "@" in item.string:
-            parse_string(request, item, mentions_dict)
+            strings.append(item)
 
 
-def parse_string(request, element, mentions_dict):
-    User = get_user_model()
+def get_mentioned_slugs(strings):
+    slugs = []
+    for string in strings:
+        for matchobj in USERNAME_RE.finditer(string):
+            slug = matchobj.group(0)[1:].strip().lower()
+            if slug not in slugs:
+                if len(slugs) >= MENTIONS_LIMIT:
+                    return slugs
+                slugs.append(slug)
+    return slugs
 
-    def replace_mentions(matchobj):
-        if len(mentions_dict) >= MENTIONS_LIMIT:
-            return matchobj.group(0)
 
-        username = matchobj.group(0)[1:].strip().lower()
+def resolve_mentions(request, slugs):
+    """Returns dict of users for slugs, resolved using single query"""
+    mentions_dict = {slug: None for slug in slugs}
+    if request.user.is_authenticated and request.user.slug in mentions_dict:
+        mentions_dict[request.user.slug] = request.user
+
+    unresolved_slugs = [slug for slug, user in mentions_dict.items() if not user]
+    if unresolved_slugs:
+        User = get_user_model()
+        for user in User.objects.filter(slug__in=unresolved_slugs):
+            mentions_dict[user.slug] = user
 
-        if username not in mentions_dict:
-            if username == request.user.slug:
-                mentions_dict[username] = request.user
-            else:
-                try:
-                    mentions_dict[username] = User.objects.get(slug=username)
-                except User.DoesNotExist:
-                    mentions_dict[username] = None
+    return mentions_dict
 
-        if mentions_dict[username]:
+
+def parse_string(element, mentions_dict):
+    def replace_mentions(matchobj):
+        username = matchobj.group(0)[1:].strip().lower()
+
+        if mentions_dict.get(username):
             user = mentions_dict[username]
             return '<a href="%s">@%s</a>' % (user.get_absolute_url(), user.username)
 
         # we've failed to resolve user for username
         return matchobj.group(0)
 
-    replaced_string = USERNAME_RE.sub(replace_mentions, element.string)
-    element.replace_with(BeautifulSoup(replaced_string, "html.parser"))
+    escaped_string = escape(element.string, quote=False)
+    replaced_string = USERNAME_RE.sub(replace_mentions, escaped_string)
+    if replaced_string == escaped_string:
+        return
+
+    # insert parsed nodes directly so tree is same as if it was parsed again
+    for node in list(BeautifulSoup(replaced_string, "html.parser").contents):
+        element.insert_before(node)
+    element.extract()
@@ -1,11 +1,14 @@
+from threading import local
+
 import bleach
 import markdown
 from bs4 import BeautifulSoup
 from django.http import Http404
 from django.urls import resolve
-from htmlmin.minify import html_minify
+from htmlmin.minify import space_minify
 from markdown.extensions.fenced_code import FencedCodeExtension
 
+from .. import hooks
 from ..conf import settings
 from .bbcode.code import CodeBlockExtension
 from .bbcode.hr import BBCodeHRProcessor
@@ -19,6 +22,8 @@ from .pipeline import pipeline
 
 MISAGO_ATTACHMENT_VIEWS = ("misago:attachment", "misago:attachment-thumbnail")
 
+_markdown_pool = local()
+
 
 def parse(
     text,
@@ -41,7 +46,7 @@ def parse(
 
     Returns dict object
     """
-    md = md_factory(
+    md = get_markdown(
         allow_links=allow_links, allow_images=allow_images, allow_blocks=allow_blocks
     )
 
@@ -64,19 +69,59 @@ def parse(
     if allow_links:
         linkify_paragraphs(parsing_result)
 
-    parsing_result = pipeline.process_result(parsing_result)
+    # Build document tree once and run all processing steps on it
+    soup = BeautifulSoup(parsing_result["parsed_text"], "html5lib")
+
+    parsing_result = pipeline.process_result(parsing_result, soup)
 
     if allow_mentions:
-        add_mentions(request, parsing_result)
+        add_mentions(request, parsing_result, soup)
 
     if allow_links or allow_images:
-        clean_links(request, parsing_result, force_shva)
+        clean_links(request, parsing_result, force_shva, soup)
 
     if minify:
-        minify_result(parsing_result)
+        space_minify(soup)
+        parsing_result["parsed_text"] = str(soup.body)[6:-7]
+    else:
+        parsing_result["parsed_text"] = str(soup.body)[6:-7].strip()
     return parsing_result
 
 
+def get_markdown(allow_links=True, allow_images=True, allow_blocks=True):
+    """
+    returns reset markdown object from current thread's pool
+
+    Markdown objects are expensive to configure, so one is created for every
+    combination of parser options and markdown extensions and reused between
+    parse() calls made by same thread
+    """
+    instances = getattr(_markdown_pool, "instances", None)
+    if instances is None:
+        instances = _markdown_pool.instances = {}
+
+    key = (
+        allow_links,
+        allow_images,
+        allow_blocks,
+        tuple(settings.MISAGO_MARKUP_EXTENSIONS),
+        tuple(hooks.markdown_extensions),
+    )
+
+    md = instances.get(key)
+    if md is None:
+        md = instances[key] = md_factory(
+            allow_links=allow_links,
+            allow_images=allow_images,
+            allow_blocks=allow_blocks,
+        )
+    return md.reset()
+
+
+def clear_markdown_pool():
+    _markdown_pool.instances = {}
+
+
 def md_factory(allow_links=True, allow_images=True, allow_blocks=True):
     """creates and configures markdown object"""
     md = markdown.Markdown(extensions=["markdown.extensions.nl2br"])
@@ -155,10 +200,12 @@ def linkify_paragraphs(result):
     )
 
 
-def clean_links(request, result, force_shva=False):
+def clean_links(request, result, force_shva=False, soup=None):
     host = request.get_host()
 
-    soup = BeautifulSoup(result["parsed_text"], "html5lib")
+    update_parsed_text = soup is None
+    if update_parsed_text:
+        soup = BeautifulSoup(result["parsed_text"], "html5lib")
     for link in soup.find_all("a"):
         if is_internal_link(link["href"], host):
             link["href"] = clean_internal_link(link["href"], host)
@@ -182,8 +229,9 @@ def clean_links(request, result, force_shva=False):
             result["images"].append(clean_link_prefix(img["src"]))
             img["src"] = assert_link_prefix(img["src"])
 
-    # [6:-7] trims <body></body> wrap
-    result["parsed_text"] = str(soup.body)[6:-7]
+    if update_parsed_text:
+        # [6:-7] trims <body></body> wrap
+        result["parsed_text"] = str(soup.body)[6:-7]
 
 
 def is_internal_link(link, host):
@@ -244,13 +292,3 @@ def clean_attachment_link(link, force_shva=False):
         elif link.endswith("?shva=1"):
             link = link[:-7]
     return link
-
-
-def minify_result(result):
-    result["parsed_text"] = html_minify(result["parsed_text"])
-    result["parsed_text"] = strip_html_head_body(result["parsed_text"])
-
-
-def strip_html_head_body(parsed_text):
-    # [25:-14] trims <html><head></head><body> and </body></html>
-    return parsed_text[25:-14]
@@ -21,8 +21,18 @@ class MarkupPipeline:
 
         return md
 
-    def process_result(self, result):
-        soup = BeautifulSoup(result["parsed_text"], "html5lib")
+    def process_result(self, result, soup=None):
+        """
+        run parsing result processors on document tree
+
+        If no tree is passed, it's built from parsed text and parsed text is
+        updated with its processed version. Otherwise caller is responsible for
+        serializing tree after processing is complete.
+        """
+        update_parsed_text = soup is None
+        if update_parsed_text:
+            soup = BeautifulSoup(result["parsed_text"], "html5lib")
+
         for extension in settings.MISAGO_MARKUP_EXTENSIONS:
             module = import_module(extension)
             if hasattr(module, "clean_parsed"):
@@ -32,8 +42,9 @@ class MarkupPipeline:
         for extension in hooks.parsing_result_processors:
             extension(result, soup)
 
-        souped_text = str(soup.body).strip()[6:-7]
-        result["parsed_text"] = souped_text.strip()
+        if update_parsed_text:
+            souped_text = str(soup.body).strip()[6:-7]
+            result["parsed_text"] = souped_text.strip()
         return result
 
 
@@ -0,0 +1,34 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from ...conf.test import override_dynamic_settings
+from ..management.commands import benchmarkmarkup
+
+
+@override_dynamic_settings(forum_address="http://example.com")
+def test_command_reports_parsed_posts(post):
+    post.original = "Hello, see [forum](http://example.com/) and http://google.com"
+    post.save()
+
+    out = StringIO()
+    call_command(benchmarkmarkup.Command(), posts=1, repeat=2, stdout=out)
+
+    lines = out.getvalue().strip().splitlines()
+    assert lines[0].split() == ["markdown", "posts", "posts/s"]
+    assert lines[1].split()[:2] == ["created", "2"]
+    assert lines[2].split()[:2] == ["pooled", "2"]
+
+
+def test_command_handles_no_posts(db):
+    out = StringIO()
+    call_command(benchmarkmarkup.Command(), stdout=out)
+    assert out.getvalue().strip() == "No posts were found"
+
+
+@override_dynamic_settings(forum_address=None)
+def test_command_requires_forum_address(post):
+    with pytest.raises(CommandError):
+        call_command(benchmarkmarkup.Command(), stdout=StringIO())
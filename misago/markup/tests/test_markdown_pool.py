@@ -0,0 +1,54 @@
+from threading import Thread
+
+from ..parser import clear_markdown_pool, get_markdown, parse
+
+
+def test_markdown_is_reused_for_same_options():
+    clear_markdown_pool()
+    assert get_markdown() is get_markdown()
+
+
+def test_markdown_is_created_for_every_options_combination():
+    clear_markdown_pool()
+    assert get_markdown(allow_links=False) is not get_markdown()
+    assert get_markdown(allow_images=False) is not get_markdown()
+    assert get_markdown(allow_blocks=False) is not get_markdown()
+
+
+def test_markdown_is_created_when_markdown_extensions_hook_changes(mocker):
+    clear_markdown_pool()
+    md = get_markdown()
+
+    plugin = mocker.Mock()
+    mocker.patch("misago.markup.parser.hooks.markdown_extensions", [plugin])
+    assert get_markdown() is not md
+    plugin.assert_called_once()
+
+
+def test_markdown_is_not_shared_between_threads():
+    clear_markdown_pool()
+    md = get_markdown()
+
+    other_thread_md = []
+    thread = Thread(target=lambda: other_thread_md.append(get_markdown()))
+    thread.start()
+    thread.join()
+
+    assert other_thread_md[0] is not md
+
+
+def test_reused_markdown_parses_same_text_same_way(request_mock, user):
+    clear_markdown_pool()
+    text = "[quote]Lorem ipsum[/quote]\n\n[spoiler]Dolor met[/spoiler]"
+    result = parse(text, request_mock, user)
+    assert parse(text, request_mock, user)["parsed_text"] == result["parsed_text"]
+
+
+def test_unclosed_quote_state_is_not_leaked_to_next_parse(request_mock, user):
+    clear_markdown_pool()
+    quote_processor = get_markdown().parser.blockprocessors["misago_bbcode_quote"]
+    quote_processor._quote = 1
+    quote_processor._children = ["Lorem"]
+
+    result = parse("Ipsum", request_mock, user)
+    assert result["parsed_text"] == "<p>Ipsum</p>"
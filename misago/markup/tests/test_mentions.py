@@ -1,4 +1,4 @@
-from ..mentions import add_mentions
+from ..mentions import MENTIONS_LIMIT, add_mentions
 
 
 def test_util_replaces_mention_with_link_to_user_profile_in_parsed_text(
@@ -76,3 +76,41 @@ def test_util_handles_text_without_mentions(request_mock):
     add_mentions(request_mock, parsing_result)
     assert parsing_result["parsed_text"] == ("<p>Hello, world!</p>")
     assert parsing_result["mentions"] == []
+
+
+def test_html_in_text_with_mention_is_kept_escaped(request_mock, user):
+    parsing_result = {
+        "parsed_text": f"<p>&lt;b&gt;Hello&lt;/b&gt;, @{user.username}!</p>",
+        "mentions": [],
+    }
+    add_mentions(request_mock, parsing_result)
+    assert parsing_result["parsed_text"] == (
+        f"<p>&lt;b&gt;Hello&lt;/b&gt;, "
+        f'<a href="{user.get_absolute_url()}">@{user.username}</a>!</p>'
+    )
+
+
+def test_mentions_are_resolved_using_single_query(
+    django_assert_num_queries, request_mock, user, other_user
+):
+    parsing_result = {
+        "parsed_text": (
+            f"<p>Hello, @{other_user.username}, @Nobody and @Ghost!</p>"
+            f"<p>Bye, @{other_user.username}!</p>"
+        ),
+        "mentions": [],
+    }
+    with django_assert_num_queries(1):
+        add_mentions(request_mock, parsing_result)
+    assert parsing_result["mentions"] == [other_user]
+
+
+def test_mentions_limit_is_enforced(request_mock, user, other_user):
+    other_mentions = " ".join(f"@User{i}" for i in range(MENTIONS_LIMIT))
+    parsing_result = {
+        "parsed_text": f"<p>{other_mentions} @{other_user.username}</p>",
+        "mentions": [],
+    }
+    add_mentions(request_mock, parsing_result)
+    assert parsing_result["mentions"] == []
+    assert other_user.get_absolute_url() not in parsing_result["parsed_text"]
@@ -1,3 +1,4 @@
+from .. import parser
 from ..parser import parse
 
 
@@ -15,3 +16,10 @@ Sit amet elit.
 """
     result = parse(text, request_mock, user, minify=True)
     snapshot.assert_match(result["parsed_text"])
+
+
+def test_document_tree_is_built_once(request_mock, user, mocker):
+    beautiful_soup = mocker.spy(parser, "BeautifulSoup")
+    text = "Hello @%s, see http://example.com/ and ![img](http://other.com/img.png)"
+    parse(text % user.username, request_mock, user, minify=True)
+    beautiful_soup.assert_called_once()
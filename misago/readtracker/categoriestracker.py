@@ -1,6 +1,4 @@
-from ..threads.models import Post, Thread
-from ..threads.permissions import exclude_invisible_posts, exclude_invisible_threads
-from .cutoffdate import get_cutoff_date
+from .unreadsummary import get_unread_summary
 
 
 def make_read_aware(request, categories):
@@ -15,26 +13,9 @@ def make_read_aware(request, categories):
     if request.user.is_anonymous:
         return
 
-    threads = Thread.objects.filter(category__in=categories)
-    threads = exclude_invisible_threads(request.user_acl, categories, threads)
-
-    queryset = (
-        Post.objects.filter(
-            category__in=categories,
-            thread__in=threads,
-            posted_on__gt=get_cutoff_date(request.settings, request.user),
-        )
-        .values_list("category", flat=True)
-        .distinct()
-    )
-
-    queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
-    queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
-
-    unread_categories = list(queryset)
-
+    unread_summary = get_unread_summary(request, categories)
     for category in categories:
-        if category.pk in unread_categories:
+        if unread_summary[category.pk]:
             category.is_read = False
             category.is_new = True
 
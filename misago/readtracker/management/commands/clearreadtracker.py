@@ -2,7 +2,7 @@ from django.core.management.base import BaseCommand
 
 from ....conf.shortcuts import get_dynamic_settings
 from ...cutoffdate import get_cutoff_date
-from ...models import PostRead
+from ...models import PostRead, ThreadRead
 
 
 class Command(BaseCommand):
@@ -10,11 +10,17 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         settings = get_dynamic_settings()
-        queryset = PostRead.objects.filter(last_read_on__lt=get_cutoff_date(settings))
-        deleted_count = queryset.count()
+        cutoff_date = get_cutoff_date(settings)
+
+        deleted_count = 0
+        for model in (PostRead, ThreadRead):
+            queryset = model.objects.filter(last_read_on__lt=cutoff_date)
+            model_deleted_count = queryset.count()
+            if model_deleted_count:
+                queryset.delete()
+                deleted_count += model_deleted_count
 
         if deleted_count:
-            queryset.delete()
             message = "\n\nDeleted %s expired entries" % deleted_count
         else:
             message = "\n\nNo expired entries were found"
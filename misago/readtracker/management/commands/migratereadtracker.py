@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from ...models import PostRead, ThreadRead
+
+CHUNK_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates threads read markers from posts read by users. "
+        "Run this command before setting MISAGO_READTRACKER_STORAGE to 'threads'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            help="number of read markers to create in single query",
+            type=int,
+            default=CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(options["chunk_size"], 1)
+
+        queryset = (
+            PostRead.objects.values("user_id", "thread_id", "thread__category_id")
+            .annotate(
+                last_read_post_id=Max("post_id"), last_read_on=Max("last_read_on")
+            )
+            .order_by("user_id", "thread_id")
+        )
+
+        existing_count = ThreadRead.objects.count()
+        processed_count = 0
+        chunk = []
+        for read in queryset.iterator():
+            chunk.append(
+                ThreadRead(
+                    user_id=read["user_id"],
+                    category_id=read["thread__category_id"],
+                    thread_id=read["thread_id"],
+                    last_read_post_id=read["last_read_post_id"],
+                    last_read_on=read["last_read_on"],
+                )
+            )
+            if len(chunk) == chunk_size:
+                processed_count += self.create_read_markers(chunk)
+                chunk = []
+        if chunk:
+            processed_count += self.create_read_markers(chunk)
+
+        if not processed_count:
+            self.stdout.write("\n\nNo posts reads were found")
+            return
+
+        # conflicting read markers are skipped by database without counting
+        created_count = ThreadRead.objects.count() - existing_count
+        if created_count < processed_count:
+            self.stdout.write(
+                "\n\nSkipped %s existing threads read markers"
+                % (processed_count - created_count)
+            )
+        self.stdout.write("\n\nMigrated %s threads read markers" % created_count)
+
+    def create_read_markers(self, read_markers):
+        """Creates read markers that don't exist, returning number of processed"""
+        ThreadRead.objects.bulk_create(read_markers, ignore_conflicts=True)
+        return len(read_markers)
@@ -9,3 +9,14 @@ class PostRead(models.Model):
     thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
     post = models.ForeignKey("misago_threads.Post", on_delete=models.CASCADE)
     last_read_on = models.DateTimeField(default=timezone.now)
+
+
+class ThreadRead(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
+    thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
+    last_read_post_id = models.PositiveIntegerField()
+    last_read_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [("user", "thread")]
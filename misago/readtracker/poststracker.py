@@ -1,4 +1,6 @@
+from . import readmarkers
 from .cutoffdate import get_cutoff_date
+from .unreadsummary import mark_category_changed
 
 
 def make_read_aware(request, posts):
@@ -22,11 +24,17 @@ def make_read_aware(request, posts):
             post.is_new = True
             unresolved_posts[post.pk] = post
 
-    if unresolved_posts:
-        queryset = request.user.postread_set.filter(post__in=unresolved_posts)
-        for post_id in queryset.values_list("post_id", flat=True):
-            unresolved_posts[post_id].is_read = True
-            unresolved_posts[post_id].is_new = False
+    if not unresolved_posts:
+        return
+
+    if readmarkers.is_tracking_threads():
+        readmarkers.make_posts_read_aware(request.user, unresolved_posts.values())
+        return
+
+    queryset = request.user.postread_set.filter(post__in=unresolved_posts)
+    for post_id in queryset.values_list("post_id", flat=True):
+        unresolved_posts[post_id].is_read = True
+        unresolved_posts[post_id].is_new = False
 
 
 def make_read(posts):
@@ -36,4 +44,8 @@ def make_read(posts):
 
 
 def save_read(user, post):
-    user.postread_set.create(category=post.category, thread=post.thread, post=post)
+    if readmarkers.is_tracking_threads():
+        readmarkers.save_read(user, post)
+    else:
+        user.postread_set.create(category=post.category, thread=post.thread, post=post)
+    mark_category_changed(user, post.category_id)
@@ -0,0 +1,95 @@
+"""Read tracker storage keeping single read marker for every thread read by user
+
+Post is read if its id is lower or equal to id of last post read by user in its
+thread. Thread is read if its last post was read. Category is read if all its
+threads are read.
+"""
+from django.db.models import Exists, F, OuterRef
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ..conf import settings
+from .models import ThreadRead
+
+
+def is_tracking_threads():
+    return settings.MISAGO_READTRACKER_STORAGE == "threads"
+
+
+def get_read_markers(user, threads):
+    queryset = user.threadread_set.filter(thread__in=threads)
+    return dict(queryset.values_list("thread_id", "last_read_post_id"))
+
+
+def get_read_threads_filter(user, read_post_field="last_post_id"):
+    """Returns Exists() expression that is True for threads read by user"""
+    return Exists(
+        ThreadRead.objects.filter(
+            user=user,
+            thread=OuterRef("pk"),
+            last_read_post_id__gte=OuterRef(read_post_field),
+        )
+    )
+
+
+def get_tracked_threads_filter(user):
+    """Returns Exists() expression that is True for threads user has read marker for"""
+    return Exists(ThreadRead.objects.filter(user=user, thread=OuterRef("pk")))
+
+
+def make_posts_read_aware(user, posts):
+    read_markers = get_read_markers(user, {post.thread_id for post in posts})
+    for post in posts:
+        if post.pk <= read_markers.get(post.thread_id, 0):
+            post.is_read = True
+            post.is_new = False
+
+
+def make_threads_read_aware(user, threads):
+    read_markers = get_read_markers(user, threads)
+    for thread in threads:
+        if thread.last_post_id <= read_markers.get(thread.pk, 0):
+            thread.is_read = True
+            thread.is_new = False
+
+
+def filter_new_threads(user, queryset):
+    return queryset.annotate(is_tracked=get_tracked_threads_filter(user)).filter(
+        is_tracked=False
+    )
+
+
+def filter_unread_threads(user, queryset):
+    queryset = queryset.annotate(
+        is_tracked=get_tracked_threads_filter(user),
+        is_read=get_read_threads_filter(user),
+    )
+    return queryset.filter(is_tracked=True, is_read=False)
+
+
+def exclude_read_posts(user, thread, posts_queryset):
+    read_markers = get_read_markers(user, [thread])
+    if thread.pk in read_markers:
+        return posts_queryset.filter(id__gt=read_markers[thread.pk])
+    return posts_queryset
+
+
+def save_read(user, post):
+    updated = user.threadread_set.filter(thread_id=post.thread_id).update(
+        category_id=post.category_id,
+        last_read_post_id=Greatest(F("last_read_post_id"), post.pk),
+        last_read_on=timezone.now(),
+    )
+
+    if not updated:
+        ThreadRead.objects.bulk_create(
+            [
+                ThreadRead(
+                    user=user,
+                    category_id=post.category_id,
+                    thread_id=post.thread_id,
+                    last_read_post_id=post.pk,
+                )
+            ],
+            ignore_conflicts=True,
+        )
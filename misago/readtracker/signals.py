@@ -1,8 +1,15 @@
 from django.dispatch import Signal, receiver
 
 from ..categories import PRIVATE_THREADS_ROOT_NAME
-from ..categories.signals import delete_category_content, move_category_content
+from ..categories.signals import (
+    archive_pruned_threads,
+    delete_category_content,
+    delete_pruned_threads,
+    move_category_content,
+)
 from ..threads.signals import merge_post, merge_thread, move_post, move_thread
+from ..threads.unreadprivatethreads import decrease_unread_private_threads
+from .models import PostRead, ThreadRead
 
 thread_read = Signal(providing_args=["thread"])
 
@@ -10,22 +17,44 @@ thread_read = Signal(providing_args=["thread"])
 @receiver(delete_category_content)
 def delete_category_threads(sender, **kwargs):
     sender.postread_set.all().delete()
+    sender.threadread_set.all().delete()
 
 
 @receiver(move_category_content)
 def move_category_tracker(sender, **kwargs):
     sender.postread_set.update(category=kwargs["new_category"])
+    sender.threadread_set.update(category=kwargs["new_category"])
+
+
+@receiver(delete_pruned_threads)
+def delete_pruned_threads_tracker(sender, **kwargs):
+    PostRead.objects.filter(thread_id__in=kwargs["threads_ids"]).delete()
+    ThreadRead.objects.filter(thread_id__in=kwargs["threads_ids"]).delete()
+
+
+@receiver(archive_pruned_threads)
+def archive_pruned_threads_tracker(sender, **kwargs):
+    new_category = kwargs["new_category"]
+    PostRead.objects.filter(thread_id__in=kwargs["threads_ids"]).update(
+        category=new_category
+    )
+    ThreadRead.objects.filter(thread_id__in=kwargs["threads_ids"]).update(
+        category=new_category
+    )
 
 
 @receiver(merge_thread)
 def merge_thread_tracker(sender, **kwargs):
     other_thread = kwargs["other_thread"]
     other_thread.postread_set.update(category=sender.category, thread=sender)
+    # Read markers of merged thread point to its posts only, drop them
+    other_thread.threadread_set.all().delete()
 
 
 @receiver(move_thread)
 def move_thread_tracker(sender, **kwargs):
     sender.postread_set.update(category=sender.category, thread=sender)
+    sender.threadread_set.update(category=sender.category)
 
 
 @receiver(merge_post)
@@ -46,6 +75,4 @@ def decrease_unread_private_count(sender, **kwargs):
     if thread.category.thread_type.root_name != PRIVATE_THREADS_ROOT_NAME:
         return
 
-    if user.unread_private_threads:
-        user.unread_private_threads -= 1
-        user.save(update_fields=["unread_private_threads"])
+    decrease_unread_private_threads(user, thread)
@@ -6,7 +6,7 @@ from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
 from ..management.commands import clearreadtracker
-from ..models import PostRead
+from ..models import PostRead, ThreadRead
 
 
 def call_command():
@@ -50,3 +50,18 @@ def test_old_read_tracker_entry_is_cleared(user, post):
     command_output = call_command()
     assert command_output == "Deleted 1 expired entries"
     assert not PostRead.objects.exists()
+
+
+@override_dynamic_settings(readtracker_cutoff=5)
+def test_old_thread_read_marker_is_cleared(user, post):
+    ThreadRead.objects.create(
+        user=user,
+        category=post.category,
+        thread=post.thread,
+        last_read_post_id=post.id,
+        last_read_on=timezone.now() - timedelta(days=10),
+    )
+
+    command_output = call_command()
+    assert command_output == "Deleted 1 expired entries"
+    assert not ThreadRead.objects.exists()
@@ -0,0 +1,66 @@
+from io import StringIO
+
+from django.core import management
+
+from ...threads.test import reply_thread
+from ..management.commands import migratereadtracker
+from ..models import ThreadRead
+from ..poststracker import save_read
+
+
+def call_command(**options):
+    command = migratereadtracker.Command()
+
+    out = StringIO()
+    management.call_command(command, stdout=out, **options)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def test_command_works_if_there_are_no_read_tracker_entries(db):
+    command_output = call_command()
+    assert command_output == "No posts reads were found"
+
+
+def test_command_creates_read_marker_for_last_read_post(user, thread):
+    post = reply_thread(thread)
+    save_read(user, thread.first_post)
+    save_read(user, post)
+
+    command_output = call_command()
+    assert command_output == "Migrated 1 threads read markers"
+
+    read_marker = ThreadRead.objects.get(user=user, thread=thread)
+    assert read_marker.category_id == thread.category_id
+    assert read_marker.last_read_post_id == post.id
+
+
+def test_command_creates_read_markers_in_chunks(user, other_user, thread):
+    save_read(user, thread.first_post)
+    save_read(other_user, thread.first_post)
+
+    command_output = call_command(chunk_size=1)
+    assert command_output == "Migrated 2 threads read markers"
+    assert ThreadRead.objects.count() == 2
+
+
+def test_command_skips_existing_read_markers(user, thread):
+    save_read(user, thread.first_post)
+
+    call_command()
+    command_output = call_command()
+    assert command_output == "Migrated 0 threads read markers"
+    assert ThreadRead.objects.count() == 1
+
+
+def test_command_counts_only_created_read_markers(user, other_user, thread):
+    save_read(user, thread.first_post)
+    call_command()
+
+    save_read(other_user, thread.first_post)
+    command = migratereadtracker.Command()
+    out = StringIO()
+    management.call_command(command, stdout=out)
+
+    output = out.getvalue().strip()
+    assert "Skipped 1 existing threads read markers" in output
+    assert output.endswith("Migrated 1 threads read markers")
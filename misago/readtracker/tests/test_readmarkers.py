@@ -0,0 +1,83 @@
+from django.test import override_settings
+
+from ...threads.test import reply_thread
+from .. import categoriestracker, poststracker, threadstracker
+from ..models import PostRead, ThreadRead
+
+track_threads = override_settings(MISAGO_READTRACKER_STORAGE="threads")
+
+
+@track_threads
+def test_saving_read_creates_thread_read_marker(user, thread):
+    poststracker.save_read(user, thread.first_post)
+    read_marker = ThreadRead.objects.get(user=user, thread=thread)
+    assert read_marker.category_id == thread.category_id
+    assert read_marker.last_read_post_id == thread.first_post_id
+    assert not PostRead.objects.exists()
+
+
+@track_threads
+def test_saving_read_moves_thread_read_marker_forward(user, thread):
+    post = reply_thread(thread)
+    poststracker.save_read(user, thread.first_post)
+    poststracker.save_read(user, post)
+    read_marker = ThreadRead.objects.get(user=user, thread=thread)
+    assert read_marker.last_read_post_id == post.id
+
+
+@track_threads
+def test_saving_read_of_older_post_keeps_thread_read_marker(user, thread):
+    post = reply_thread(thread)
+    poststracker.save_read(user, post)
+    poststracker.save_read(user, thread.first_post)
+    read_marker = ThreadRead.objects.get(user=user, thread=thread)
+    assert read_marker.last_read_post_id == post.id
+
+
+@track_threads
+def test_posts_before_thread_read_marker_are_read(request_mock, user, thread):
+    poststracker.save_read(user, thread.first_post)
+    post = reply_thread(thread)
+
+    posts = [thread.first_post, post]
+    poststracker.make_read_aware(request_mock, posts)
+    assert thread.first_post.is_read
+    assert not post.is_read
+    assert post.is_new
+
+
+@track_threads
+def test_thread_with_read_last_post_is_read(request_mock, user, thread):
+    poststracker.save_read(user, thread.first_post)
+    threadstracker.make_read_aware(request_mock, thread)
+    assert thread.is_read
+    assert not thread.is_new
+
+
+@track_threads
+def test_thread_with_unread_reply_is_unread(request_mock, user, thread):
+    poststracker.save_read(user, thread.first_post)
+    reply_thread(thread)
+    thread.refresh_from_db()
+    threadstracker.make_read_aware(request_mock, thread)
+    assert not thread.is_read
+    assert thread.is_new
+
+
+@track_threads
+def test_category_with_read_thread_is_read(
+    request_mock, user, default_category, thread
+):
+    poststracker.save_read(user, thread.first_post)
+    categoriestracker.make_read_aware(request_mock, default_category)
+    assert default_category.is_read
+    assert not default_category.is_new
+
+
+@track_threads
+def test_category_with_unread_thread_is_unread(
+    request_mock, user, default_category, thread
+):
+    categoriestracker.make_read_aware(request_mock, default_category)
+    assert not default_category.is_read
+    assert default_category.is_new
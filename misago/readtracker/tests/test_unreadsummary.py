@@ -0,0 +1,137 @@
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+
+from ...categories.models import Category
+from ...threads.test import post_thread, reply_thread
+from .. import unreadsummary
+from ..poststracker import save_read
+
+
+@pytest.fixture(autouse=True)
+def summary_cache(mocker):
+    cache = LocMemCache("unread-summary", {})
+    cache.clear()
+    mocker.patch("misago.readtracker.unreadsummary.cache", cache)
+    return cache
+
+
+def test_summary_counts_unread_threads_in_category(request_mock, default_category):
+    post_thread(default_category)
+    post_thread(default_category)
+    default_category.synchronize()
+
+    summary = unreadsummary.get_unread_summary(request_mock, [default_category])
+    assert summary == {default_category.pk: 2}
+
+
+def test_summary_excludes_read_threads(request_mock, user, default_category, thread):
+    save_read(user, thread.first_post)
+    default_category.synchronize()
+
+    summary = unreadsummary.get_unread_summary(request_mock, [default_category])
+    assert summary == {default_category.pk: 0}
+
+
+def test_summary_is_cached(
+    django_assert_num_queries, request_mock, default_category, thread
+):
+    default_category.synchronize()
+    unreadsummary.get_unread_summary(request_mock, [default_category])
+
+    with django_assert_num_queries(0):
+        summary = unreadsummary.get_unread_summary(request_mock, [default_category])
+    assert summary == {default_category.pk: 1}
+
+
+def test_category_is_recomputed_when_its_state_changes(
+    request_mock, user, default_category, thread
+):
+    save_read(user, thread.first_post)
+    default_category.synchronize()
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 0
+    }
+
+    reply_thread(thread)
+    default_category.synchronize()
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 1
+    }
+
+
+def test_category_is_recomputed_when_its_version_changes(
+    mocker, request_mock, default_category, thread
+):
+    mocker.patch("django.db.transaction.on_commit", side_effect=lambda f: f())
+    default_category.synchronize()
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 1
+    }
+
+    # thread appearing in category without change in its counters, eg. approved
+    post_thread(Category.objects.get(pk=default_category.pk))
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 1
+    }
+
+    unreadsummary.mark_categories_changed(default_category.pk)
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 2
+    }
+
+
+def test_category_version_is_changed_after_transaction_commit(mocker, default_category):
+    on_commit = mocker.patch("django.db.transaction.on_commit")
+    unreadsummary.mark_categories_changed(default_category.pk)
+    assert not unreadsummary.get_categories_versions([default_category])
+
+    on_commit.call_args[0][0]()
+    assert unreadsummary.get_categories_versions([default_category])
+
+
+def test_category_is_recomputed_after_user_reads_post_in_it(
+    request_mock, user, default_category, thread
+):
+    default_category.synchronize()
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 1
+    }
+
+    save_read(user, thread.first_post)
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 0
+    }
+
+
+def test_summary_is_invalidated_by_user_acl_change(
+    request_mock, user, default_category, thread
+):
+    default_category.synchronize()
+    unreadsummary.get_unread_summary(request_mock, [default_category])
+
+    save_read(user, thread.first_post)  # updates database and summary
+    summary_cache_key = unreadsummary.get_cache_key(user)
+    summary = unreadsummary.cache.get(summary_cache_key)
+    summary["categories"][default_category.pk] = (
+        unreadsummary.get_category_state(default_category, {}),
+        1,
+    )
+    unreadsummary.cache.set(summary_cache_key, summary)
+
+    request_mock.user.acl_key = "changed"
+    assert unreadsummary.get_unread_summary(request_mock, [default_category]) == {
+        default_category.pk: 0
+    }
+
+
+@override_settings(MISAGO_READTRACKER_STORAGE="threads")
+def test_summary_counts_unread_threads_using_read_markers(
+    request_mock, user, default_category, thread
+):
+    post_thread(default_category)
+    save_read(user, thread.first_post)
+    default_category.synchronize()
+
+    summary = unreadsummary.get_unread_summary(request_mock, [default_category])
+    assert summary == {default_category.pk: 1}
@@ -1,5 +1,6 @@
 from ..threads.models import Post
 from ..threads.permissions import exclude_invisible_posts
+from . import readmarkers
 from .cutoffdate import get_cutoff_date
 
 
@@ -15,9 +16,21 @@ def make_read_aware(request, threads):
     if request.user.is_anonymous:
         return
 
-    categories = [t.category for t in threads]
     cutoff_date = get_cutoff_date(request.settings, request.user)
 
+    if readmarkers.is_tracking_threads():
+        tracked_threads = []
+        for thread in threads:
+            if thread.last_post_on > cutoff_date:
+                thread.is_read = False
+                thread.is_new = True
+                tracked_threads.append(thread)
+        if tracked_threads:
+            readmarkers.make_threads_read_aware(request.user, tracked_threads)
+        return
+
+    categories = [t.category for t in threads]
+
     queryset = (
         Post.objects.filter(thread__in=threads, posted_on__gt=cutoff_date)
         .values_list("thread", flat=True)
@@ -0,0 +1,149 @@
+"""Cached summary of unread threads in categories visible to user
+
+Summary stores number of unread threads in every category it was computed for,
+together with category's state (last post date, threads and posts counts and
+version) at the time. Category is recomputed only when its state changes (eg. new
+post was made in it) or user reads post in it, so full cost is paid only once per
+summary lifetime. Moderation can change what's unread without changing counters
+(eg. approving post or moving thread in), so it also changes category's version.
+"""
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from ..acl import ACL_CACHE
+from ..cache.utils import generate_version_string
+from ..conf import settings
+from ..threads.models import Post, Thread
+from ..threads.permissions import exclude_invisible_posts, exclude_invisible_threads
+from . import readmarkers
+from .cutoffdate import get_cutoff_date
+
+
+def get_unread_summary(request, categories):
+    """Returns dict with numbers of unread threads in categories"""
+    summary = get_summary_cache(request.user, request.user_acl)
+    summary_categories = summary["categories"]
+    versions = get_categories_versions(categories)
+
+    changed_categories = []
+    for category in categories:
+        category_summary = summary_categories.get(category.pk)
+        category_state = get_category_state(category, versions)
+        if not category_summary or category_summary[0] != category_state:
+            changed_categories.append(category)
+
+    if changed_categories:
+        unread_threads = count_unread_threads(request, changed_categories)
+        for category in changed_categories:
+            summary_categories[category.pk] = (
+                get_category_state(category, versions),
+                unread_threads.get(category.pk, 0),
+            )
+        set_summary_cache(request.user, summary)
+
+    return {c.pk: summary_categories[c.pk][1] for c in categories}
+
+
+def count_unread_threads(request, categories):
+    threads = Thread.objects.filter(category__in=categories)
+    threads = exclude_invisible_threads(request.user_acl, categories, threads)
+
+    cutoff_date = get_cutoff_date(request.settings, request.user)
+    if readmarkers.is_tracking_threads():
+        queryset = (
+            threads.filter(last_post_on__gt=cutoff_date)
+            .annotate(is_read=readmarkers.get_read_threads_filter(request.user))
+            .filter(is_read=False)
+            .values("category_id")
+            .annotate(unread_threads=Count("id"))
+        )
+    else:
+        queryset = Post.objects.filter(
+            category__in=categories, thread__in=threads, posted_on__gt=cutoff_date
+        )
+        queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
+        queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
+        queryset = queryset.values("category_id").annotate(
+            unread_threads=Count("thread_id", distinct=True)
+        )
+
+    return {row["category_id"]: row["unread_threads"] for row in queryset.order_by()}
+
+
+def get_category_state(category, versions):
+    return (
+        category.last_post_on,
+        category.threads,
+        category.posts,
+        versions.get(category.pk),
+    )
+
+
+def get_categories_versions(categories):
+    cache_keys = {get_category_version_key(c.pk): c.pk for c in categories}
+    return {
+        cache_keys[key]: version for key, version in cache.get_many(cache_keys).items()
+    }
+
+
+def mark_categories_changed(*categories_ids):
+    """Changes categories versions, making them recompute in all users summaries
+
+    Version is changed after transaction is committed, so summary recomputed
+    meanwhile is not stored with new version.
+    """
+    transaction.on_commit(partial(set_categories_versions, categories_ids))
+
+
+def set_categories_versions(categories_ids):
+    version = generate_version_string()
+    cache.set_many(
+        {get_category_version_key(i): version for i in categories_ids},
+        settings.MISAGO_UNREAD_SUMMARY_TIMEOUT,
+    )
+
+
+def mark_category_changed(user, category_id):
+    """Removes category from user's summary, making it recompute on next use"""
+    key = get_cache_key(user)
+    summary = cache.get(key)
+    if summary and summary["categories"].pop(category_id, None):
+        cache.set(key, summary, get_summary_timeout(summary))
+
+
+def get_summary_cache(user, user_acl):
+    acl_version = (user.acl_key, user_acl.get("cache_versions", {}).get(ACL_CACHE))
+
+    summary = cache.get(get_cache_key(user))
+    if (
+        summary
+        and summary["acl"] == acl_version
+        and summary["expires_on"] > time.time()
+    ):
+        return summary
+
+    return {
+        "acl": acl_version,
+        "expires_on": time.time() + settings.MISAGO_UNREAD_SUMMARY_TIMEOUT,
+        "categories": {},
+    }
+
+
+def set_summary_cache(user, summary):
+    cache.set(get_cache_key(user), summary, get_summary_timeout(summary))
+
+
+def get_summary_timeout(summary):
+    return max(int(summary["expires_on"] - time.time()), 1)
+
+
+def get_cache_key(user):
+    return "unread_summary_%s" % user.pk
+
+
+def get_category_version_key(category_id):
+    return "unread_summary_category_%s" % category_id
@@ -1,12 +1,12 @@
-from time import time
-
 from django.core.exceptions import PermissionDenied
 from django.urls import reverse
 from django.utils.translation import gettext as _
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from ..conf import settings
 from ..core.shortcuts import get_int_or_404
+from .runner import run_providers
 from .searchproviders import searchproviders
 
 
@@ -17,6 +17,19 @@ def search(request, search_provider=None):
         raise PermissionDenied(_("You don't have permission to search site."))
 
     search_query = get_search_query(request)
+
+    if search_provider:
+        page = get_int_or_404(request.query_params.get("page", 1))
+        providers = [p for p in allowed_providers if p.url == search_provider]
+        results = run_providers(request, providers, search_query, page)
+    else:
+        results = run_providers(
+            request,
+            allowed_providers,
+            search_query,
+            time_budget=settings.MISAGO_SEARCH_PROVIDER_TIME_BUDGET,
+        )
+
     response = []
     for provider in allowed_providers:
         provider_data = {
@@ -29,18 +42,11 @@ def search(request, search_provider=None):
             ),
             "results": None,
             "time": None,
+            "timings": None,
         }
 
-        if not search_provider or search_provider == provider.url:
-            start_time = time()
-
-            if search_provider == provider.url:
-                page = get_int_or_404(request.query_params.get("page", 1))
-            else:
-                page = 1
-
-            provider_data["results"] = provider.search(search_query, page)
-            provider_data["time"] = float("%.2f" % (time() - start_time))
+        if provider.url in results:
+            provider_data.update(results[provider.url])
 
         response.append(provider_data)
     return Response(response)
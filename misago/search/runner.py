@@ -0,0 +1,202 @@
+"""Running search providers
+
+Landing search runs all allowed providers concurrently on bounded pool of
+threads, and providers that don't finish within their time budget return empty
+results. Database queries ran by providers in pool are cancelled by PostgreSQL
+when budget runs out, so threads are released for next searches. When all
+threads are busy, providers are ran in request's thread instead of waiting for
+free one. Providers results are cached for short time, so repeated queries (eg.
+from typeahead) are cheap.
+"""
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from hashlib import md5
+from threading import BoundedSemaphore, Lock
+from time import time
+
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.utils import translation
+from psycopg2.errorcodes import QUERY_CANCELED
+
+from ..acl import ACL_CACHE
+from ..conf import settings
+
+_executor = None
+_executor_slots = None
+_executor_lock = Lock()
+
+
+class TimeBudgetExceeded(Exception):
+    pass
+
+
+def run_providers(request, providers, query, page=1, time_budget=None):
+    """Returns dict with providers results, keyed by providers urls"""
+    results = {}
+    providers_to_run = []
+
+    for provider in providers:
+        cached_results = get_cached_results(request, provider, query, page)
+        if cached_results is None:
+            providers_to_run.append(provider)
+        else:
+            results[provider.url] = cached_results
+
+    workers = settings.MISAGO_SEARCH_PROVIDERS_WORKERS
+    if len(providers_to_run) > 1 and workers > 1:
+        results.update(run_concurrently(providers_to_run, query, page, time_budget))
+    else:
+        for provider in providers_to_run:
+            results[provider.url] = run_provider(provider, query, page)
+
+    for provider in providers_to_run:
+        if not results[provider.url].get("timed_out"):
+            set_cached_results(request, provider, query, page, results[provider.url])
+
+    return results
+
+
+def run_concurrently(providers, query, page, time_budget=None):
+    results = {}
+
+    language = translation.get_language()
+    deadline = time() + time_budget if time_budget else None
+    executor, slots = get_executor()
+
+    futures = {}
+    providers_in_request = []
+    for provider in providers:
+        # don't queue providers behind other searches if all threads are busy
+        if slots.acquire(blocking=False):
+            futures[provider.url] = executor.submit(
+                run_provider_in_thread, provider, query, page, language, deadline
+            )
+            futures[provider.url].add_done_callback(lambda _: slots.release())
+        else:
+            providers_in_request.append(provider)
+
+    for provider in providers_in_request:
+        results[provider.url] = run_provider(provider, query, page)
+
+    for provider_url, future in futures.items():
+        timeout = max(deadline - time(), 0) if deadline else None
+        try:
+            results[provider_url] = future.result(timeout=timeout)
+        except TimeoutError:
+            results[provider_url] = None
+        if not results[provider_url]:
+            results[provider_url] = get_timed_out_results(time_budget)
+
+    return results
+
+
+def run_provider(provider, query, page):
+    start_time = time()
+    results = provider.search(query, page)
+
+    return {
+        "results": results,
+        "time": float("%.2f" % (time() - start_time)),
+        "timings": {
+            source: float("%.2f" % timing)
+            for source, timing in provider.timings.items()
+        },
+    }
+
+
+def run_provider_in_thread(provider, query, page, language, deadline=None):
+    """Runs provider, returning None if it didn't finish before deadline"""
+    try:
+        with translation.override(language):
+            if not deadline:
+                return run_provider(provider, query, page)
+            with connection.execute_wrapper(StatementTimeout(deadline)):
+                return run_provider(provider, query, page)
+    except TimeBudgetExceeded:
+        return None
+    except OperationalError as e:
+        if getattr(e.__cause__, "pgcode", None) == QUERY_CANCELED:
+            return None
+        raise
+    finally:
+        # threads are reused between searches, don't leave connections open
+        connection.close()
+
+
+class StatementTimeout:
+    """Limits time of every query to time left until deadline"""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.timeout = None
+
+    def __call__(self, execute, sql, params, many, context):
+        timeout = int((self.deadline - time()) * 1000)
+        if timeout <= 0:
+            raise TimeBudgetExceeded()
+        if timeout != self.timeout:
+            # connection is closed after provider is ran, so setting won't leak
+            context["cursor"].cursor.execute("SET statement_timeout = %s", [timeout])
+            self.timeout = timeout
+        return execute(sql, params, many, context)
+
+
+def get_timed_out_results(time_budget):
+    return {
+        "results": {"results": [], "count": 0},
+        "time": float("%.2f" % time_budget),
+        "timings": {},
+        "timed_out": True,
+    }
+
+
+def get_executor():
+    """Returns threads pool and semaphore counting its free threads"""
+    global _executor, _executor_slots
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = settings.MISAGO_SEARCH_PROVIDERS_WORKERS
+                _executor_slots = BoundedSemaphore(workers)
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="misago-search"
+                )
+
+    return _executor, _executor_slots
+
+
+def get_cached_results(request, provider, query, page):
+    if not settings.MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT:
+        return None
+
+    results = cache.get(get_cache_key(request, provider, query, page))
+    if results is not None:
+        results["time"] = 0.0
+        results["timings"] = {"cache": 0.0}
+    return results
+
+
+def set_cached_results(request, provider, query, page, results):
+    if settings.MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT:
+        cache.set(
+            get_cache_key(request, provider, query, page),
+            results,
+            settings.MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT,
+        )
+
+
+def get_cache_key(request, provider, query, page):
+    cache_key = [
+        provider.url,
+        query,
+        page,
+        request.user.acl_key,
+        request.user_acl.get("cache_versions", {}).get(ACL_CACHE),
+        # results may include data visible only to user, eg. their own threads
+        request.user.pk,
+        translation.get_language(),
+    ]
+
+    cache_key = md5(repr(cache_key).encode()).hexdigest()
+    return "search_results_%s" % cache_key
@@ -1,6 +1,11 @@
+from contextlib import contextmanager
+from time import time
+
+
 class SearchProvider:
     def __init__(self, request):
         self.request = request
+        self.timings = {}
 
     def allow_search(self):
         pass
@@ -9,3 +14,12 @@ class SearchProvider:
         raise NotImplementedError(
             "%s has to define search(query, page=1) method" % self.__class__.__name__
         )
+
+    @contextmanager
+    def measure(self, source):
+        """Adds time spent in block to timings of source, eg. "cache" or "database" """
+        start_time = time()
+        try:
+            yield
+        finally:
+            self.timings[source] = self.timings.get(source, 0) + time() - start_time
@@ -0,0 +1,315 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, current_thread
+from time import sleep, time
+from unittest.mock import Mock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from psycopg2.errorcodes import QUERY_CANCELED
+
+from ...categories.models import Category
+from ...conf import defaults
+from .. import runner
+from ..searchprovider import SearchProvider
+
+
+class MockProvider(SearchProvider):
+    url = "mock"
+    delay = 0
+
+    def search(self, query, page=1):
+        with self.measure("database"):
+            sleep(self.delay)
+        self.request.searches = getattr(self.request, "searches", 0) + 1
+        return {"results": [query, page], "count": 1}
+
+
+class SlowProvider(MockProvider):
+    url = "slow"
+    delay = 0.5
+
+
+class OtherProvider(MockProvider):
+    url = "other"
+    delay = 0.1
+
+
+class CancelledProvider(MockProvider):
+    url = "cancelled"
+
+    def search(self, query, page=1):
+        error = OperationalError("canceling statement due to statement timeout")
+        error.__cause__ = Exception()
+        error.__cause__.pgcode = QUERY_CANCELED
+        raise error
+
+
+class DatabaseProvider(SearchProvider):
+    url = "database"
+    delay = 0
+    query_delay = 0
+
+    def search(self, query, page=1):
+        self.thread_name = current_thread().name
+        sleep(self.delay)
+        with self.measure("database"):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(%s)", [self.query_delay])
+            count = Category.objects.count()
+        self.finished = True
+        return {"results": [query, page], "count": count}
+
+
+class OtherDatabaseProvider(DatabaseProvider):
+    url = "other-database"
+
+
+class MockUser:
+    def __init__(self, pk):
+        self.pk = pk
+        self.acl_key = "acl-key"
+
+
+class MockRequest:
+    def __init__(self, user):
+        self.user = user
+        self.user_acl = {"cache_versions": {}}
+
+
+cache = LocMemCache("search-runner-tests", {})
+
+
+@patch.object(runner, "cache", cache)
+@override_settings(MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT=0)
+class RunProvidersTests(SimpleTestCase):
+    def setUp(self):
+        self.request = MockRequest(MockUser(1))
+        cache.clear()
+
+    def test_providers_are_run_one_after_another(self):
+        """providers are run in request thread if there's single worker"""
+        providers = [MockProvider(self.request), OtherProvider(self.request)]
+        with override_settings(MISAGO_SEARCH_PROVIDERS_WORKERS=1):
+            results = runner.run_providers(self.request, providers, "test")
+
+        self.assertEqual(set(results), {"mock", "other"})
+        self.assertEqual(results["mock"]["results"]["results"], ["test", 1])
+        self.assertEqual(results["other"]["results"]["results"], ["test", 1])
+        self.assertIn("database", results["other"]["timings"])
+        self.assertEqual(self.request.searches, 2)
+
+    @override_settings(MISAGO_SEARCH_PROVIDERS_WORKERS=4)
+    def test_providers_are_run_concurrently(self):
+        """providers are run concurrently if there are multiple workers"""
+        providers = [OtherProvider(self.request), OtherProvider(self.request)]
+        providers[1].url = "another"
+
+        results = runner.run_providers(self.request, providers, "test", page=2)
+        self.assertEqual(set(results), {"other", "another"})
+        self.assertEqual(results["other"]["results"]["results"], ["test", 2])
+        self.assertEqual(results["another"]["results"]["results"], ["test", 2])
+        self.assertNotIn("timed_out", results["other"])
+
+    @override_settings(MISAGO_SEARCH_PROVIDERS_WORKERS=4)
+    def test_provider_exceeding_time_budget_returns_empty_results(self):
+        """provider that didn't finish within time budget returns empty results"""
+        providers = [MockProvider(self.request), SlowProvider(self.request)]
+
+        results = runner.run_providers(self.request, providers, "test", time_budget=0.1)
+        self.assertEqual(results["mock"]["results"]["results"], ["test", 1])
+        self.assertEqual(results["slow"]["results"], {"results": [], "count": 0})
+        self.assertTrue(results["slow"]["timed_out"])
+
+    @override_settings(
+        MISAGO_SEARCH_PROVIDERS_WORKERS=4, MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT=15
+    )
+    def test_timed_out_results_are_not_cached(self):
+        """empty results of provider that didn't finish are not cached"""
+        providers = [MockProvider(self.request), SlowProvider(self.request)]
+        runner.run_providers(self.request, providers, "test", time_budget=0.1)
+
+        results = runner.run_providers(self.request, providers[1:], "test")
+        self.assertEqual(results["slow"]["results"]["results"], ["test", 1])
+
+    @override_settings(MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT=15)
+    def test_results_are_cached(self):
+        """repeated search for same query returns cached results"""
+        provider = MockProvider(self.request)
+        runner.run_providers(self.request, [provider], "test")
+        results = runner.run_providers(self.request, [provider], "test")
+
+        self.assertEqual(results["mock"]["results"]["results"], ["test", 1])
+        self.assertEqual(results["mock"]["timings"], {"cache": 0.0})
+        self.assertEqual(self.request.searches, 1)
+
+        runner.run_providers(self.request, [provider], "other")
+        runner.run_providers(self.request, [provider], "test", page=2)
+        self.assertEqual(self.request.searches, 3)
+
+    @override_settings(MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT=15)
+    def test_results_are_cached_per_user(self):
+        """cached results are not shared between users"""
+        provider = MockProvider(self.request)
+        runner.run_providers(self.request, [provider], "test")
+
+        self.request.user = MockUser(2)
+        runner.run_providers(self.request, [provider], "test")
+        self.assertEqual(self.request.searches, 2)
+
+    @override_settings(MISAGO_SEARCH_PROVIDERS_WORKERS=4)
+    def test_providers_are_run_in_request_thread_if_workers_are_busy(self):
+        """providers don't wait for workers busy with other searches"""
+        slots = BoundedSemaphore(1)
+        slots.acquire()
+
+        providers = [MockProvider(self.request), SlowProvider(self.request)]
+        with patch.object(
+            runner, "get_executor", return_value=(ThreadPoolExecutor(1), slots)
+        ):
+            results = runner.run_providers(
+                self.request, providers, "test", time_budget=0.1
+            )
+
+        self.assertEqual(results["mock"]["results"]["results"], ["test", 1])
+        self.assertEqual(results["slow"]["results"]["results"], ["test", 1])
+        self.assertEqual(self.request.searches, 2)
+
+    @override_settings(MISAGO_SEARCH_PROVIDERS_WORKERS=4)
+    def test_worker_is_freed_after_provider_finishes(self):
+        """worker taken by provider is freed for next searches after it finishes"""
+        executor = ThreadPoolExecutor(1)
+        slots = BoundedSemaphore(1)
+
+        providers = [MockProvider(self.request), OtherProvider(self.request)]
+        with patch.object(runner, "get_executor", return_value=(executor, slots)):
+            runner.run_providers(self.request, providers, "test")
+
+        executor.shutdown()
+        self.assertTrue(slots.acquire(blocking=False))
+
+    def test_provider_with_query_cancelled_by_time_budget_returns_none(self):
+        """provider which query was cancelled by database is treated as timed out"""
+        provider = CancelledProvider(self.request)
+        self.assertIsNone(
+            runner.run_provider_in_thread(provider, "test", 1, "en", time() + 1)
+        )
+
+    def test_provider_database_error_is_not_treated_as_timeout(self):
+        """other database errors are raised from provider"""
+        provider = CancelledProvider(self.request)
+        with patch.object(provider, "search", side_effect=OperationalError()):
+            with self.assertRaises(OperationalError):
+                runner.run_provider_in_thread(provider, "test", 1, "en", time() + 1)
+
+
+@patch.object(runner, "cache", cache)
+@override_settings(
+    MISAGO_SEARCH_PROVIDERS_WORKERS=defaults.MISAGO_SEARCH_PROVIDERS_WORKERS,
+    MISAGO_SEARCH_RESULTS_CACHE_TIMEOUT=0,
+)
+class RunDatabaseProvidersTests(TestCase):
+    """Providers querying database ran with default number of workers
+
+    Workers use their own database connections which don't see test transaction,
+    so providers only read categories created by migrations.
+    """
+
+    def setUp(self):
+        self.request = MockRequest(MockUser(1))
+        cache.clear()
+
+    def wait_for_workers(self):
+        _, slots = runner.get_executor()
+        for _ in range(defaults.MISAGO_SEARCH_PROVIDERS_WORKERS):
+            self.assertTrue(slots.acquire(timeout=2))
+        for _ in range(defaults.MISAGO_SEARCH_PROVIDERS_WORKERS):
+            slots.release()
+
+    def test_providers_query_database_in_workers(self):
+        """providers are ran in workers using their own database connections"""
+        providers = [
+            DatabaseProvider(self.request),
+            OtherDatabaseProvider(self.request),
+        ]
+
+        results = runner.run_providers(self.request, providers, "test", time_budget=3)
+        for provider in providers:
+            self.assertTrue(provider.thread_name.startswith("misago-search"))
+            self.assertEqual(results[provider.url]["results"]["results"], ["test", 1])
+            self.assertTrue(results[provider.url]["results"]["count"])
+            self.assertNotIn("timed_out", results[provider.url])
+
+    def test_query_exceeding_time_budget_is_cancelled_by_database(self):
+        """query still running when time budget runs out is cancelled"""
+        providers = [
+            DatabaseProvider(self.request),
+            OtherDatabaseProvider(self.request),
+        ]
+        providers[1].query_delay = 5
+
+        start_time = time()
+        results = runner.run_providers(self.request, providers, "test", time_budget=1)
+        self.assertNotIn("timed_out", results["database"])
+        self.assertTrue(results["other-database"]["timed_out"])
+
+        # worker is freed long before query would finish
+        self.wait_for_workers()
+        self.assertLess(time() - start_time, 4)
+        self.assertFalse(hasattr(providers[1], "finished"))
+
+    def test_provider_with_query_cancelled_by_database_returns_none(self):
+        """provider which query was cancelled by database is treated as timed out"""
+        provider = DatabaseProvider(self.request)
+        provider.query_delay = 5
+
+        with ThreadPoolExecutor(1) as executor:
+            future = executor.submit(
+                runner.run_provider_in_thread, provider, "test", 1, "en", time() + 0.5
+            )
+            self.assertIsNone(future.result(timeout=2))
+
+    def test_query_is_not_ran_after_time_budget_runs_out(self):
+        """provider doesn't query database after time budget has ran out"""
+        providers = [
+            DatabaseProvider(self.request),
+            OtherDatabaseProvider(self.request),
+        ]
+        providers[1].delay = 0.5
+
+        results = runner.run_providers(self.request, providers, "test", time_budget=0.2)
+        self.assertNotIn("timed_out", results["database"])
+        self.assertTrue(results["other-database"]["timed_out"])
+
+        self.wait_for_workers()
+        self.assertFalse(hasattr(providers[1], "finished"))
+
+
+class StatementTimeoutTests(SimpleTestCase):
+    def test_query_timeout_is_set_to_time_left(self):
+        """query is ran with timeout set to time left until deadline"""
+        cursor = Mock()
+        execute = Mock(return_value="result")
+        context = {"cursor": cursor}
+
+        statement_timeout = runner.StatementTimeout(time() + 10)
+        result = statement_timeout(execute, "SELECT 1", None, False, context)
+
+        self.assertEqual(result, "result")
+        execute.assert_called_once_with("SELECT 1", None, False, context)
+
+        sql, (timeout,) = cursor.cursor.execute.call_args[0]
+        self.assertEqual(sql, "SET statement_timeout = %s")
+        self.assertTrue(9000 < timeout <= 10000)
+
+    def test_query_is_not_ran_after_deadline(self):
+        """query is not ran if there's no time left until deadline"""
+        cursor = Mock()
+        execute = Mock()
+
+        statement_timeout = runner.StatementTimeout(time() - 1)
+        with self.assertRaises(runner.TimeBudgetExceeded):
+            statement_timeout(execute, "SELECT 1", None, False, {"cursor": cursor})
+
+        execute.assert_not_called()
+        cursor.cursor.execute.assert_not_called()
@@ -22,6 +22,7 @@ class AttachmentAdmin(generic.AdminBaseMixin):
 
 class AttachmentsList(AttachmentAdmin, generic.ListView):
     items_per_page = 20
+    keyset_pagination = True
     ordering = [
         ("-id", _("From newest")),
         ("id", _("From oldest")),
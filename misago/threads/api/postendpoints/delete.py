@@ -1,5 +1,6 @@
 from rest_framework.response import Response
 
+from ...categorycounters import lock_threads_counters, update_category_counters
 from ...moderation import posts as moderation
 from ...permissions import (
     allow_delete_best_answer,
@@ -16,9 +17,10 @@ def delete_post(request, thread, post):
         allow_delete_best_answer(request.user_acl, post)
         allow_delete_post(request.user_acl, post)
 
+    counted = lock_threads_counters(thread)
     moderation.delete_post(request.user, post)
 
-    sync_related(thread)
+    sync_related(thread, counted)
     return Response({})
 
 
@@ -45,17 +47,18 @@ def delete_bulk(request, thread):
                 errors = list(errors.values())[0][0]
         return Response({"detail": errors}, status=400)
 
+    counted = lock_threads_counters(thread)
     for post in serializer.validated_data["posts"]:
         post.delete()
 
-    sync_related(thread)
+    sync_related(thread, counted)
 
     return Response({})
 
 
-def sync_related(thread):
+def sync_related(thread, counted):
     thread.synchronize()
     thread.save()
 
-    thread.category.synchronize()
+    update_category_counters(thread.category, counted, thread)
     thread.category.save()
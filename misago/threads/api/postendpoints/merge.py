@@ -3,6 +3,7 @@ from django.utils.translation import gettext as _
 from rest_framework.response import Response
 
 from ....acl.objectacl import add_acl_to_obj
+from ...categorycounters import lock_threads_counters, update_category_counters
 from ...serializers import MergePostsSerializer, PostSerializer
 
 
@@ -30,6 +31,7 @@ def posts_merge_endpoint(request, thread):
     posts = serializer.validated_data["posts"]
     first_post, merged_posts = posts[0], posts[1:]
 
+    counted = lock_threads_counters(thread)
     for post in merged_posts:
         post.merge(first_post)
         post.delete()
@@ -49,7 +51,7 @@ def posts_merge_endpoint(request, thread):
     thread.synchronize()
     thread.save()
 
-    thread.category.synchronize()
+    update_category_counters(thread.category, counted, thread)
     thread.category.save()
 
     first_post.thread = thread
@@ -2,6 +2,7 @@ from django.core.exceptions import PermissionDenied
 from django.utils.translation import gettext as _
 from rest_framework.response import Response
 
+from ...categorycounters import lock_threads_counters, update_category_counters
 from ...serializers import MovePostsSerializer
 
 
@@ -31,6 +32,7 @@ def posts_move_endpoint(request, thread, viewmodel):
             return Response({"detail": list(errors.values())[0][0]}, status=400)
 
     new_thread = serializer.validated_data["new_thread"]
+    counted = lock_threads_counters(thread, new_thread)
 
     for post in serializer.validated_data["posts"]:
         post.move(new_thread)
@@ -42,11 +44,11 @@ def posts_move_endpoint(request, thread, viewmodel):
     new_thread.synchronize()
     new_thread.save()
 
-    thread.category.synchronize()
+    update_category_counters(thread.category, counted, thread, new_thread)
     thread.category.save()
 
     if thread.category != new_thread.category:
-        new_thread.category.synchronize()
+        update_category_counters(new_thread.category, counted, thread, new_thread)
         new_thread.category.save()
 
     return Response({})
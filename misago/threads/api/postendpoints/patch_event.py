@@ -1,5 +1,6 @@
 from ....acl.objectacl import add_acl_to_obj
 from ....core.apipatch import ApiPatch
+from ...categorycounters import lock_threads_counters, update_category_counters
 from ...moderation import posts as moderation
 from ...permissions import allow_hide_event, allow_unhide_event
 
@@ -33,6 +34,7 @@ event_patch_dispatcher.replace("is-hidden", patch_is_hidden)
 
 def event_patch_endpoint(request, event):
     old_is_hidden = event.is_hidden
+    counted = lock_threads_counters(event.thread)
 
     response = event_patch_dispatcher.dispatch(request, event)
 
@@ -40,7 +42,7 @@ def event_patch_endpoint(request, event):
         event.thread.synchronize()
         event.thread.save()
 
-        event.category.synchronize()
+        update_category_counters(event.category, counted, event.thread)
         event.category.save()
 
     return response
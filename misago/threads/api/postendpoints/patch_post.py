@@ -1,4 +1,5 @@
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
 from django.utils.translation import gettext as _, ngettext
 from rest_framework import serializers
 from rest_framework.response import Response
@@ -6,6 +7,7 @@ from rest_framework.response import Response
 from ....acl.objectacl import add_acl_to_obj
 from ....conf import settings
 from ....core.apipatch import ApiPatch
+from ...categorycounters import lock_threads_counters, update_category_counters
 from ...models import PostLike
 from ...moderation import posts as moderation
 from ...permissions import (
@@ -123,6 +125,9 @@ post_patch_dispatcher.replace("is-hidden", patch_is_hidden)
 
 def post_patch_endpoint(request, post):
     old_is_unapproved = post.is_unapproved
+    if old_is_unapproved:
+        # only unapproved post can change thread's counters, by being approved
+        counted = lock_threads_counters(post.thread)
 
     response = post_patch_dispatcher.dispatch(request, post)
 
@@ -131,7 +136,7 @@ def post_patch_endpoint(request, post):
         post.thread.synchronize()
         post.thread.save()
 
-        post.category.synchronize()
+        update_category_counters(post.category, counted, post.thread)
         post.category.save()
 
     return response
@@ -147,17 +152,22 @@ def bulk_patch_endpoint(request, thread):
     posts = clean_posts_for_patch(request, thread, serializer.data["ids"])
 
     old_unapproved_posts = [p.is_unapproved for p in posts].count(True)
+    if not old_unapproved_posts:
+        return post_patch_dispatcher.dispatch_bulk(request, posts)
 
-    response = post_patch_dispatcher.dispatch_bulk(request, posts)
+    with transaction.atomic():
+        counted = lock_threads_counters(thread)
 
-    new_unapproved_posts = [p.is_unapproved for p in posts].count(True)
+        response = post_patch_dispatcher.dispatch_bulk(request, posts)
 
-    if old_unapproved_posts != new_unapproved_posts:
-        thread.synchronize()
-        thread.save()
+        new_unapproved_posts = [p.is_unapproved for p in posts].count(True)
 
-        thread.category.synchronize()
-        thread.category.save()
+        if old_unapproved_posts != new_unapproved_posts:
+            thread.synchronize()
+            thread.save()
+
+            update_category_counters(thread.category, counted, thread)
+            thread.category.save()
 
     return response
 
@@ -2,6 +2,7 @@ from django.core.exceptions import PermissionDenied
 from django.utils.translation import gettext as _
 from rest_framework.response import Response
 
+from ...categorycounters import lock_threads_counters, update_category_counters
 from ...models import Thread
 from ...moderation import threads as moderation
 from ...serializers import SplitPostsSerializer
@@ -40,6 +41,8 @@ def posts_split_endpoint(request, thread):
 
 
 def split_posts_to_new_thread(request, thread, validated_data):
+    counted = lock_threads_counters(thread)
+
     new_thread = Thread(
         category=validated_data["category"],
         started_on=thread.started_on,
@@ -59,6 +62,14 @@ def split_posts_to_new_thread(request, thread, validated_data):
     new_thread.synchronize()
     new_thread.save()
 
+    # count new thread before it's hidden, hiding updates counters on its own
+    update_category_counters(thread.category, counted, thread, new_thread)
+    thread.category.save()
+
+    if new_thread.category != thread.category:
+        update_category_counters(new_thread.category, counted, thread, new_thread)
+        new_thread.category.save()
+
     if validated_data.get("weight") == Thread.WEIGHT_GLOBAL:
         moderation.pin_thread_globally(request, new_thread)
     elif validated_data.get("weight"):
@@ -67,10 +78,3 @@ def split_posts_to_new_thread(request, thread, validated_data):
         moderation.hide_thread(request, new_thread)
     if validated_data.get("is_closed", False):
         moderation.close_thread(request, new_thread)
-
-    thread.category.synchronize()
-    thread.category.save()
-
-    if new_thread.category != thread.category:
-        new_thread.category.synchronize()
-        new_thread.category.save()
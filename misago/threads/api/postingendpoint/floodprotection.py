@@ -1,12 +1,14 @@
-from datetime import timedelta
-
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from . import PostingEndpoint, PostingInterrupt, PostingMiddleware
+from ....core.ratelimit import RateLimit
 
 MIN_POSTING_INTERVAL = 3
 
+HOURLY_POSTS = RateLimit("posts_hourly", 3600)
+DAILY_POSTS = RateLimit("posts_daily", 3600 * 24, buckets=24)
+
 
 class FloodProtectionMiddleware(PostingMiddleware):
     def use_this_middleware(self):
@@ -29,16 +31,24 @@ class FloodProtectionMiddleware(PostingMiddleware):
         self.user.update_fields.append("last_posted_on")
 
         if self.settings.hourly_post_limit:
-            cutoff = now - timedelta(hours=24)
-            if self.is_limit_exceeded(cutoff, self.settings.hourly_post_limit):
+            if self.is_limit_exceeded(HOURLY_POSTS, self.settings.hourly_post_limit):
                 raise PostingInterrupt(
                     _("Your account has exceed an hourly post limit.")
                 )
 
         if self.settings.daily_post_limit:
-            cutoff = now - timedelta(hours=1)
-            if self.is_limit_exceeded(cutoff, self.settings.daily_post_limit):
+            if self.is_limit_exceeded(DAILY_POSTS, self.settings.daily_post_limit):
                 raise PostingInterrupt(_("Your account has exceed a daily post limit."))
 
-    def is_limit_exceeded(self, cutoff, limit):
-        return self.user.post_set.filter(posted_on__gte=cutoff).count() >= limit
+    def post_save(self, serializer):
+        HOURLY_POSTS.add_hit(self.user.pk)
+        DAILY_POSTS.add_hit(self.user.pk)
+
+    def is_limit_exceeded(self, ratelimit, limit):
+        return ratelimit.is_limit_exceeded(self.user.pk, limit, self.load_posts_dates)
+
+    def load_posts_dates(self, cutoff, limit):
+        queryset = self.user.post_set.filter(posted_on__gte=cutoff)
+        return queryset.order_by("-posted_on").values_list("posted_on", flat=True)[
+            :limit
+        ]
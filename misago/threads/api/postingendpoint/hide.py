@@ -18,9 +18,6 @@ class HideMiddleware(PostingMiddleware):
                 self.thread.update_all = True
                 self.thread.save(update_fields=["is_hidden"])
 
-                self.thread.category.synchronize()
-                self.thread.category.update_all = True
-
 
 class HideSerializer(serializers.Serializer):
     hide = serializers.BooleanField(required=False, default=False)
@@ -1,10 +1,10 @@
 from . import PostingEndpoint, PostingMiddleware
 from ....categories import PRIVATE_THREADS_ROOT_NAME
-from ...participants import set_users_unread_private_threads_sync
+from ...unreadprivatethreads import increase_unread_private_threads
 
 
 class SyncPrivateThreadsMiddleware(PostingMiddleware):
-    """middleware that sets private thread participants to sync unread threads"""
+    """middleware that updates private thread participants unread threads counts"""
 
     def use_this_middleware(self):
         if self.mode == PostingEndpoint.REPLY:
@@ -12,6 +12,4 @@ class SyncPrivateThreadsMiddleware(PostingMiddleware):
         return False
 
     def post_save(self, serializer):
-        set_users_unread_private_threads_sync(
-            participants=self.thread.participants_list, exclude_user=self.user
-        )
+        increase_unread_private_threads(self.thread, exclude_user=self.user)
@@ -2,6 +2,7 @@ from django.core.exceptions import PermissionDenied
 from rest_framework.response import Response
 
 from ....acl.objectacl import add_acl_to_obj
+from ...categorycounters import lock_threads_counters, update_category_counters
 from ...events import record_event
 from ...mergeconflict import MergeConflict
 from ...models import Thread
@@ -43,6 +44,7 @@ def thread_merge_endpoint(
 
     # merge conflict
     other_thread = serializer.validated_data["other_thread"]
+    counted = lock_threads_counters(thread, other_thread)
 
     best_answer = serializer.validated_data.get("best_answer")
     if "best_answer" in serializer.merge_conflict and not best_answer:
@@ -71,11 +73,11 @@ def thread_merge_endpoint(
     other_thread.synchronize()
     other_thread.save()
 
-    other_thread.category.synchronize()
+    update_category_counters(other_thread.category, counted, other_thread, thread)
     other_thread.category.save()
 
     if thread.category != other_thread.category:
-        thread.category.synchronize()
+        update_category_counters(thread.category, counted, other_thread, thread)
         thread.category.save()
 
     return Response(
@@ -127,6 +129,8 @@ def threads_merge_endpoint(request):
 
 
 def merge_threads(request, validated_data, threads, merge_conflict):
+    counted = lock_threads_counters(*threads)
+
     new_thread = Thread(
         category=validated_data["category"],
         started_on=threads[0].started_on,
@@ -151,9 +155,9 @@ def merge_threads(request, validated_data, threads, merge_conflict):
     if poll:
         poll.move(new_thread)
 
-    categories = []
+    categories = {}
     for thread in threads:
-        categories.append(thread.category)
+        categories.setdefault(thread.category_id, thread.category)
         new_thread.merge(thread)
         thread.delete()
 
@@ -164,6 +168,13 @@ def merge_threads(request, validated_data, threads, merge_conflict):
     new_thread.synchronize()
     new_thread.save()
 
+    categories.setdefault(new_thread.category_id, new_thread.category)
+
+    # count new thread before it's hidden, hiding updates counters on its own
+    for category in categories.values():
+        update_category_counters(category, counted, new_thread, *threads)
+        category.save()
+
     if validated_data.get("weight") == Thread.WEIGHT_GLOBAL:
         moderation.pin_thread_globally(request, new_thread)
     elif validated_data.get("weight"):
@@ -173,13 +184,6 @@ def merge_threads(request, validated_data, threads, merge_conflict):
     if validated_data.get("is_closed", False):
         moderation.close_thread(request, new_thread)
 
-    if new_thread.category not in categories:
-        categories.append(new_thread.category)
-
-    for category in categories:
-        category.synchronize()
-        category.save()
-
     # set extra attrs on thread for UI
     new_thread.is_read = False
     new_thread.subscription = None
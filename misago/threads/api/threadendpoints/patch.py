@@ -376,29 +376,15 @@ thread_patch_dispatcher.replace("owner", patch_replace_owner)
 
 def thread_patch_endpoint(request, thread):
     old_title = thread.title
-    old_is_hidden = thread.is_hidden
-    old_is_unapproved = thread.is_unapproved
-    old_category = thread.category
 
+    # categories counters are updated by moderation actions changing them
     response = thread_patch_dispatcher.dispatch(request, thread)
 
-    # diff thread's state against pre-patch and resync category if necessary
-    hidden_changed = old_is_hidden != thread.is_hidden
-    unapproved_changed = old_is_unapproved != thread.is_unapproved
-    category_changed = old_category != thread.category
-
     title_changed = old_title != thread.title
     if thread.category.last_thread_id != thread.pk:
         title_changed = False  # don't trigger resync on simple title change
 
-    if hidden_changed or unapproved_changed or category_changed:
-        thread.category.synchronize()
-        thread.category.save()
-
-        if category_changed:
-            old_category.synchronize()
-            old_category.save()
-    elif title_changed:
+    if title_changed:
         thread.category.last_thread_title = thread.title
         thread.category.last_thread_slug = thread.slug
         thread.category.save(update_fields=["last_thread_title", "last_thread_slug"])
@@ -418,16 +404,11 @@ def bulk_patch_endpoint(
     threads = clean_threads_for_patch(request, viewmodel, serializer.data["ids"])
 
     old_titles = [t.title for t in threads]
-    old_is_hidden = [t.is_hidden for t in threads]
-    old_is_unapproved = [t.is_unapproved for t in threads]
-    old_category = [t.category_id for t in threads]
 
+    # categories counters are updated by moderation actions changing them
     response = thread_patch_dispatcher.dispatch_bulk(request, threads)
 
     new_titles = [t.title for t in threads]
-    new_is_hidden = [t.is_hidden for t in threads]
-    new_is_unapproved = [t.is_unapproved for t in threads]
-    new_category = [t.category_id for t in threads]
 
     # sync titles
     if new_titles != old_titles:
@@ -437,35 +418,6 @@ def bulk_patch_endpoint(
                 t.category.last_thread_slug = t.slug
                 t.category.save(update_fields=["last_thread_title", "last_thread_slug"])
 
-    # sync categories
-    sync_categories = []
-
-    if new_is_hidden != old_is_hidden:
-        for i, t in enumerate(threads):
-            if t.is_hidden != old_is_hidden[i] and t.category_id not in sync_categories:
-                sync_categories.append(t.category_id)
-
-    if new_is_unapproved != old_is_unapproved:
-        for i, t in enumerate(threads):
-            if (
-                t.is_unapproved != old_is_unapproved[i]
-                and t.category_id not in sync_categories
-            ):
-                sync_categories.append(t.category_id)
-
-    if new_category != old_category:
-        for i, t in enumerate(threads):
-            if t.category_id != old_category[i]:
-                if t.category_id not in sync_categories:
-                    sync_categories.append(t.category_id)
-                if old_category[i] not in sync_categories:
-                    sync_categories.append(old_category[i])
-
-    if sync_categories:
-        for category in Category.objects.filter(id__in=sync_categories):
-            category.synchronize()
-            category.save()
-
     return response
 
 
@@ -0,0 +1,73 @@
+"""Incremental maintenance of categories threads and posts counters
+
+Instead of recounting all threads in category, counters are changed by
+difference between what changed threads were counted with before the change
+and what they are counted with after it. Both states are read from database,
+and threads rows are locked before the change, so other requests can't change
+them before the difference is applied. Only last thread is still queried, but
+that is single indexed lookup. Full recount is left to "synchronizecategories"
+command.
+"""
+from ..readtracker.unreadsummary import mark_categories_changed
+from .models import Thread
+
+COUNTED_FIELDS = ("id", "category_id", "replies", "is_hidden", "is_unapproved")
+
+
+def lock_threads_counters(*threads):
+    """Locks threads in database and returns what they are counted with
+
+    This has to be called in transaction, before threads are changed.
+    """
+    return get_threads_counters(threads, lock=True)
+
+
+def update_category_counters(category, counted, *threads):
+    """Updates category's counters and last thread after threads have changed
+
+    Counted are counters returned by lock_threads_counters before the change.
+    Threads created by the change should be passed together with changed ones.
+    Category is not saved, but its counters are already updated in database.
+    """
+    changes = get_counters_changes(counted, *threads)
+    category.update_counters(*changes.get(category.pk, (0, 0)))
+    category.update_last_thread()
+    # threads visible only to moderators could have changed too
+    mark_categories_changed(category.pk)
+
+
+def get_counters_changes(counted, *threads):
+    """Returns dict of changes in categories counters after threads have changed"""
+    current = get_threads_counters(threads)
+
+    changes = {}
+    for category_id in set(counted) | set(current):
+        threads_before, posts_before = counted.get(category_id, (0, 0))
+        threads_after, posts_after = current.get(category_id, (0, 0))
+        changes[category_id] = (
+            threads_after - threads_before,
+            posts_after - posts_before,
+        )
+    return changes
+
+
+def get_threads_counters(threads, lock=False):
+    """Returns dict of threads and posts that threads are counted with in categories
+
+    Deleted threads are not counted.
+    """
+    threads_ids = {thread.pk for thread in threads if thread.pk}
+    if not threads_ids:
+        return {}
+
+    queryset = Thread.objects.filter(pk__in=threads_ids).only(*COUNTED_FIELDS)
+    if lock:
+        # lock threads in same order in all requests, so they don't deadlock
+        queryset = queryset.select_for_update().order_by("id")
+
+    counters = {}
+    for thread in queryset:
+        for category_id, (threads, posts) in thread.get_categories_counters().items():
+            category_threads, category_posts = counters.get(category_id, (0, 0))
+            counters[category_id] = (category_threads + threads, category_posts + posts)
+    return counters
@@ -0,0 +1,196 @@
+import json
+import random
+import time
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from ....acl.objectacl import add_acl_to_obj
+from ....categories.models import Category
+from ...models import Thread
+from ...permissions.threads import build_threads_visibility, exclude_invisible_threads
+
+CATEGORY_ACLS = (
+    {"can_see_all_threads": 1, "can_approve_content": 1, "can_hide_threads": 1},
+    {"can_see_all_threads": 1},
+    {"can_see_all_threads": 1, "can_hide_threads": 1},
+    {"can_see_all_threads": 1, "can_approve_content": 1},
+    {"can_hide_threads": 1},
+    {},
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares build, planning and execution time of threads visibility filter "
+        "using precomputed categories groups against previous implementation, "
+        "that annotated every category with ACL to group categories."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--categories",
+            help="numbers of categories to benchmark",
+            nargs="+",
+            type=int,
+            default=[50, 500, 5000],
+        )
+        parser.add_argument(
+            "--repeat", help="number of times every query is ran", type=int, default=5,
+        )
+
+    def handle(self, *args, **options):
+        repeat = max(options["repeat"], 1)
+
+        self.stdout.write(
+            "%10s  %-14s %12s %12s %12s"
+            % ("categories", "filter", "build (ms)", "plan (ms)", "execute (ms)")
+        )
+
+        for categories_count in options["categories"]:
+            user_acl = get_benchmark_acl(categories_count)
+            categories = [
+                Category(pk=category_id, name="Category %s" % category_id)
+                for category_id in user_acl["categories"]
+            ]
+
+            for name, build_queryset in (
+                ("baseline", build_baseline_queryset),
+                ("grouped", build_grouped_queryset),
+            ):
+                timings = [
+                    self.time_queryset(build_queryset, user_acl, categories)
+                    for _ in range(repeat)
+                ]
+                self.stdout.write(
+                    "%10s  %-14s %12.3f %12.3f %12.3f"
+                    % (
+                        categories_count,
+                        name,
+                        average(t[0] for t in timings),
+                        average(t[1] for t in timings),
+                        average(t[2] for t in timings),
+                    )
+                )
+
+    def time_queryset(self, build_queryset, user_acl, categories):
+        start_time = time.perf_counter()
+        queryset = build_queryset(user_acl, categories)
+        build_time = (time.perf_counter() - start_time) * 1000
+
+        sql, params = queryset.values("id").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) %s" % sql, params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return build_time, plan[0]["Planning Time"], plan[0]["Execution Time"]
+
+
+def get_benchmark_acl(categories_count):
+    randomizer = random.Random(categories_count)
+
+    categories = {}
+    for category_id in range(1, categories_count + 1):
+        category_acl = {"can_see": 1, "can_browse": 1}
+        category_acl.update(randomizer.choice(CATEGORY_ACLS))
+        categories[category_id] = category_acl
+
+    user_acl = {
+        "user_id": 1,
+        "is_authenticated": True,
+        "can_approve_content": False,
+        "visible_categories": list(categories),
+        "categories": categories,
+    }
+    build_threads_visibility(user_acl)
+    return user_acl
+
+
+def build_grouped_queryset(user_acl, categories):
+    return exclude_invisible_threads(user_acl, categories, Thread.objects)
+
+
+def build_baseline_queryset(user_acl, categories):
+    """Copy of threads visibility filter from before categories were precomputed
+
+    Categories are annotated with ACL and grouped into filter on every call.
+    """
+    show_all = []
+    show_accepted_visible = []
+    show_accepted = []
+    show_visible = []
+    show_owned = []
+    show_owned_visible = []
+
+    for category in categories:
+        add_acl_to_obj(user_acl, category)
+
+        if not (category.acl["can_see"] and category.acl["can_browse"]):
+            continue
+
+        can_hide = category.acl["can_hide_threads"]
+        if category.acl["can_see_all_threads"]:
+            can_mod = category.acl["can_approve_content"]
+
+            if can_mod and can_hide:
+                show_all.append(category)
+            elif user_acl["is_authenticated"]:
+                if not can_mod and not can_hide:
+                    show_accepted_visible.append(category)
+                elif not can_mod:
+                    show_accepted.append(category)
+                elif not can_hide:
+                    show_visible.append(category)
+            else:
+                show_accepted_visible.append(category)
+        elif user_acl["is_authenticated"]:
+            if can_hide:
+                show_owned.append(category)
+            else:
+                show_owned_visible.append(category)
+
+    conditions = []
+    if show_all:
+        conditions.append(Q(category__in=show_all))
+    if show_accepted_visible:
+        conditions.append(
+            Q(
+                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
+                category__in=show_accepted_visible,
+                is_hidden=False,
+            )
+        )
+    if show_accepted:
+        conditions.append(
+            Q(
+                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
+                category__in=show_accepted,
+            )
+        )
+    if show_visible:
+        conditions.append(Q(category__in=show_visible, is_hidden=False))
+    if show_owned:
+        conditions.append(Q(category__in=show_owned, starter_id=user_acl["user_id"]))
+    if show_owned_visible:
+        conditions.append(
+            Q(
+                category__in=show_owned_visible,
+                starter_id=user_acl["user_id"],
+                is_hidden=False,
+            )
+        )
+
+    if not conditions:
+        return Thread.objects.none()
+    return Thread.objects.filter(reduce(or_, conditions))
+
+
+def average(values):
+    values = list(values)
+    return sum(values) / len(values)
@@ -0,0 +1,165 @@
+import json
+import os
+import time
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from ...reprocessing import (
+    CHECKSUMS,
+    OPERATIONS,
+    REPARSE,
+    SEARCH,
+    get_batches,
+    get_forum_host,
+    get_posts_queryset,
+    process_batch_task,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reparses posts, updates their checksums and rebuilds their search "
+        "documents in batches, optionally using pool of worker processes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reparse",
+            action="store_true",
+            help="parse posts again from their original text and update checksums",
+        )
+        parser.add_argument(
+            "--checksums", action="store_true", help="update posts checksums"
+        )
+        parser.add_argument(
+            "--search", action="store_true", help="rebuild posts search documents"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="number of worker processes, 1 processes posts in this process",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="number of posts in batch"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "path to file storing id of last processed post, "
+                "command resumes from it if file exists"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        operations = [o for o in OPERATIONS if options[o]]
+        if not operations:
+            raise CommandError(
+                "Specify at least one of --%s, --%s or --%s options."
+                % (REPARSE, CHECKSUMS, SEARCH)
+            )
+
+        host = None
+        if REPARSE in operations:
+            host = get_forum_host()
+            if not host:
+                raise CommandError("Forum address has to be set to reparse posts.")
+
+        checkpoint = options["checkpoint"]
+        start_after = read_checkpoint(checkpoint, operations)
+
+        queryset = get_posts_queryset()
+        posts_to_process = queryset.filter(id__gt=start_after).count()
+        if not posts_to_process:
+            self.stdout.write("\n\nNo posts were found")
+            return
+
+        self.stdout.write(
+            "Processing %s posts (%s)...\n" % (posts_to_process, ", ".join(operations))
+        )
+
+        batches = (
+            (first_id, last_id, operations, host)
+            for first_id, last_id in get_batches(
+                queryset, max(options["batch_size"], 1), start_after
+            )
+        )
+
+        workers = max(options["workers"], 1)
+        if workers > 1:
+            # workers are forked, don't let them inherit open connections
+            connections.close_all()
+            with Pool(workers) as pool:
+                results = pool.imap(process_batch_task, batches)
+                processed_count = self.process(
+                    results, posts_to_process, checkpoint, operations
+                )
+        else:
+            results = map(process_batch_task, batches)
+            processed_count = self.process(
+                results, posts_to_process, checkpoint, operations
+            )
+
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        self.stdout.write("\n\nProcessed %s posts" % processed_count)
+
+    def process(self, results, posts_to_process, checkpoint, operations):
+        processed_count = 0
+        start_time = time.time()
+
+        # results are returned in order of batches, so every post up to last id
+        # of returned batch was processed
+        for last_id, batch_count in results:
+            processed_count += batch_count
+            if checkpoint:
+                write_checkpoint(checkpoint, operations, last_id)
+            self.show_progress(processed_count, posts_to_process, start_time)
+
+        return processed_count
+
+    def show_progress(self, processed_count, posts_to_process, start_time):
+        duration = time.time() - start_time
+        throughput = processed_count / duration if duration else 0
+        if throughput:
+            remaining_time = (posts_to_process - processed_count) / throughput
+            estimation = time.strftime("%H:%M:%S", time.gmtime(remaining_time))
+        else:
+            estimation = "--:--:--"
+
+        self.stdout.write(
+            "\r%s/%s posts, %.1f posts/s, %s est."
+            % (
+                str(processed_count).rjust(len(str(posts_to_process))),
+                posts_to_process,
+                throughput,
+                estimation,
+            ),
+            ending="",
+        )
+        self.stdout.flush()
+
+
+def read_checkpoint(path, operations):
+    if not path or not os.path.exists(path):
+        return 0
+
+    with open(path) as f:
+        checkpoint = json.load(f)
+
+    if checkpoint["operations"] != operations:
+        raise CommandError(
+            "Checkpoint was saved for different operations (%s)."
+            % ", ".join(checkpoint["operations"])
+        )
+    return checkpoint["last_id"]
+
+
+def write_checkpoint(path, operations, last_id):
+    tmp_path = "%s.tmp" % path
+    with open(tmp_path, "w") as f:
+        json.dump({"operations": operations, "last_id": last_id}, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ...replynotifications import send_queued_reply_notifications
+
+
+class Command(BaseCommand):
+    help = "Sends queued e-mail notifications about new replies to thread subscribers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="number of queued notifications processed in single transaction",
+        )
+
+    def handle(self, *args, **options):
+        sent_emails = send_queued_reply_notifications(options["batch_size"])
+        self.stdout.write("Sent %s e-mails" % sent_emails)
@@ -3,33 +3,51 @@ import time
 from django.core.management.base import BaseCommand
 
 from ....core.management.progressbar import show_progress
-from ....core.pgutils import chunk_queryset
 from ...models import Thread
+from ...synchronization import SYNCHRONIZED_FIELDS, synchronize_threads
 
 
 class Command(BaseCommand):
     help = "Synchronizes threads"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="number of threads synchronized together",
+        )
+
     def handle(self, *args, **options):
         threads_to_sync = Thread.objects.count()
 
         if not threads_to_sync:
             self.stdout.write("\n\nNo threads were found")
         else:
-            self.sync_threads(threads_to_sync)
+            self.sync_threads(threads_to_sync, max(options["batch_size"], 1))
 
-    def sync_threads(self, threads_to_sync):
+    def sync_threads(self, threads_to_sync, batch_size):
         self.stdout.write("Synchronizing %s threads...\n" % threads_to_sync)
 
+        processed_count = 0
         synchronized_count = 0
-        show_progress(self, synchronized_count, threads_to_sync)
+        show_progress(self, processed_count, threads_to_sync)
         start_time = time.time()
 
-        for thread in chunk_queryset(Thread.objects.all()):
-            thread.synchronize()
-            thread.save()
+        queryset = Thread.objects.order_by("id")
+        batch = list(queryset[:batch_size])
+        while batch:
+            # threads without posts are left untouched, not saved with stale state
+            synchronized_threads = synchronize_threads(batch)
+            Thread.objects.bulk_update(synchronized_threads, SYNCHRONIZED_FIELDS)
+
+            processed_count += len(batch)
+            synchronized_count += len(synchronized_threads)
+            show_progress(self, processed_count, threads_to_sync, start_time)
 
-            synchronized_count += 1
-            show_progress(self, synchronized_count, threads_to_sync, start_time)
+            batch = list(queryset.filter(id__gt=batch[-1].id)[:batch_size])
 
+        skipped_count = processed_count - synchronized_count
+        if skipped_count:
+            self.stdout.write("\n\nSkipped %s threads without posts" % skipped_count)
         self.stdout.write("\n\nSynchronized %s threads" % synchronized_count)
@@ -0,0 +1,62 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from ....acl.useracl import get_user_acl
+from ....cache.versions import get_cache_versions
+from ....conf.dynamicsettings import DynamicSettings
+from ....core.management.progressbar import show_progress
+from ....core.pgutils import chunk_queryset
+from ...models import ThreadParticipant
+from ...unreadprivatethreads import sync_unread_private_threads
+
+User = get_user_model()
+
+
+class SyncRequest:
+    """Minimal request object for counting user's unread private threads"""
+
+    def __init__(self, user, cache_versions, settings):
+        self.user = user
+        self.user_acl = get_user_acl(user, cache_versions)
+        self.settings = settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Counts unread private threads of users and updates their counters, "
+        "fixing counters that drifted from actual state"
+    )
+
+    def handle(self, *args, **options):
+        queryset = User.objects.filter(
+            Q(id__in=ThreadParticipant.objects.values("user_id"))
+            | Q(unread_private_threads__gt=0)
+            | Q(sync_unread_private_threads=True)
+        )
+
+        users_to_sync = queryset.count()
+        if not users_to_sync:
+            self.stdout.write("\n\nNo users were found")
+        else:
+            self.sync_users(queryset, users_to_sync)
+
+    def sync_users(self, queryset, users_to_sync):
+        self.stdout.write("Synchronizing %s users...\n" % users_to_sync)
+
+        cache_versions = get_cache_versions()
+        settings = DynamicSettings(cache_versions)
+
+        synchronized_count = 0
+        show_progress(self, synchronized_count, users_to_sync)
+        start_time = time.time()
+
+        for user in chunk_queryset(queryset):
+            sync_unread_private_threads(SyncRequest(user, cache_versions, settings))
+
+            synchronized_count += 1
+            show_progress(self, synchronized_count, users_to_sync, start_time)
+
+        self.stdout.write("\n\nSynchronized %s users" % synchronized_count)
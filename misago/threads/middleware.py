@@ -1,8 +1,6 @@
 from django.utils.deprecation import MiddlewareMixin
 
-from ..categories.models import Category
-from .models import Thread
-from .viewmodels import filter_read_threads_queryset
+from .unreadprivatethreads import sync_unread_private_threads
 
 
 class UnreadThreadsCountMiddleware(MiddlewareMixin):
@@ -16,21 +14,4 @@ class UnreadThreadsCountMiddleware(MiddlewareMixin):
         if not request.user.sync_unread_private_threads:
             return
 
-        participated_threads = request.user.threadparticipant_set.values("thread_id")
-
-        category = Category.objects.private_threads()
-        threads = Thread.objects.filter(category=category, id__in=participated_threads)
-
-        new_threads = filter_read_threads_queryset(request, [category], "new", threads)
-        unread_threads = filter_read_threads_queryset(
-            request, [category], "unread", threads
-        )
-
-        request.user.unread_private_threads = (
-            new_threads.count() + unread_threads.count()
-        )
-        request.user.sync_unread_private_threads = False
-
-        request.user.save(
-            update_fields=["unread_private_threads", "sync_unread_private_threads"]
-        )
+        sync_unread_private_threads(request)
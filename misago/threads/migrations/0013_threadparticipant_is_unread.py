@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+def sync_users_unread_private_threads(apps, schema_editor):
+    # Participants flags start as read, make users with unread threads recount
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    User.objects.filter(unread_private_threads__gt=0).update(
+        sync_unread_private_threads=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("misago_threads", "0012_set_dj_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="threadparticipant",
+            name="is_unread",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(
+            sync_users_unread_private_threads, migrations.RunPython.noop
+        ),
+    ]
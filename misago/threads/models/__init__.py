@@ -4,6 +4,7 @@ from .postlike import PostLike
 from .thread import Thread
 from .threadparticipant import ThreadParticipant
 from .subscription import Subscription
+from .replynotification import ReplyNotification
 from .attachmenttype import AttachmentType
 from .attachment import Attachment
 from .poll import Poll
@@ -0,0 +1,10 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ReplyNotification(models.Model):
+    """Reply waiting for e-mail notifications to be sent to thread's subscribers"""
+
+    post = models.ForeignKey("misago_threads.Post", on_delete=models.CASCADE)
+    previous_last_post_on = models.DateTimeField()
+    queued_on = models.DateTimeField(default=timezone.now)
@@ -1,4 +1,3 @@
-from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.db.models import Q
 from django.utils import timezone
@@ -167,48 +166,15 @@ class Thread(models.Model):
         move_thread.send(sender=self)
 
     def synchronize(self):
-        try:
-            self.has_poll = bool(self.poll)
-        except ObjectDoesNotExist:
-            self.has_poll = False
+        from ..synchronization import synchronize_threads
 
-        self.replies = self.post_set.filter(is_event=False, is_unapproved=False).count()
+        synchronize_threads([self])
 
-        if self.replies > 0:
-            self.replies -= 1
-
-        reported_post_qs = self.post_set.filter(has_reports=True)
-        self.has_reported_posts = reported_post_qs.exists()
-
-        if self.has_reported_posts:
-            open_reports_qs = self.post_set.filter(has_open_reports=True)
-            self.has_open_reports = open_reports_qs.exists()
-        else:
-            self.has_open_reports = False
-
-        unapproved_post_qs = self.post_set.filter(is_unapproved=True)
-        self.has_unapproved_posts = unapproved_post_qs.exists()
-
-        hidden_post_qs = self.post_set.filter(is_hidden=True)[:1]
-        self.has_hidden_posts = hidden_post_qs.exists()
-
-        posts = self.post_set.order_by("id")
-
-        first_post = posts.first()
-        self.set_first_post(first_post)
-
-        last_post = posts.filter(is_unapproved=False).last()
-        if last_post:
-            self.set_last_post(last_post)
-        else:
-            self.set_last_post(first_post)
-
-        self.has_events = False
-        if last_post:
-            if last_post.is_event:
-                self.has_events = True
-            else:
-                self.has_events = self.post_set.filter(is_event=True).exists()
+    def get_categories_counters(self):
+        """Returns threads and posts this thread should be counted with in categories"""
+        if self.pk is None or self.is_hidden or self.is_unapproved:
+            return {}
+        return {self.category_id: (1, self.replies + 1)}
 
     @property
     def has_best_answer(self):
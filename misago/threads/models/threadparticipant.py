@@ -28,5 +28,6 @@ class ThreadParticipant(models.Model):
     thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     is_owner = models.BooleanField(default=False)
+    is_unread = models.BooleanField(default=False)
 
     objects = ThreadParticipantManager()
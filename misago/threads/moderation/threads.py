@@ -1,6 +1,7 @@
 from django.db import transaction
 from django.utils import timezone
 
+from ..categorycounters import lock_threads_counters, update_category_counters
 from ..events import record_event
 
 __all__ = [
@@ -73,6 +74,8 @@ def move_thread(request, thread, new_category):
     if thread.category_id == new_category.pk:
         return False
 
+    counted = lock_threads_counters(thread)
+
     from_category = thread.category
     thread.move(new_category)
 
@@ -87,6 +90,12 @@ def move_thread(request, thread, new_category):
             }
         },
     )
+
+    update_category_counters(from_category, counted, thread)
+    from_category.save()
+    update_category_counters(thread.category, counted, thread)
+    thread.category.save()
+
     return True
 
 
@@ -104,6 +113,8 @@ def approve_thread(request, thread):
     if not thread.is_unapproved:
         return False
 
+    counted = lock_threads_counters(thread)
+
     thread.first_post.is_unapproved = False
     thread.first_post.save(update_fields=["is_unapproved"])
 
@@ -113,6 +124,10 @@ def approve_thread(request, thread):
     thread.has_unapproved_posts = unapproved_post_qs.exists()
 
     record_event(request, thread, "approved")
+
+    update_category_counters(thread.category, counted, thread)
+    thread.category.save()
+
     return True
 
 
@@ -141,15 +156,16 @@ def unhide_thread(request, thread):
     if not thread.is_hidden:
         return False
 
+    counted = lock_threads_counters(thread)
+
     thread.first_post.is_hidden = False
     thread.first_post.save(update_fields=["is_hidden"])
     thread.is_hidden = False
 
     record_event(request, thread, "unhid")
 
-    if thread.pk == thread.category.last_thread_id:
-        thread.category.synchronize()
-        thread.category.save()
+    update_category_counters(thread.category, counted, thread)
+    thread.category.save()
 
     return True
 
@@ -159,6 +175,8 @@ def hide_thread(request, thread):
     if thread.is_hidden:
         return False
 
+    counted = lock_threads_counters(thread)
+
     thread.first_post.is_hidden = True
     thread.first_post.hidden_by = request.user
     thread.first_post.hidden_by_name = request.user.username
@@ -177,18 +195,18 @@ def hide_thread(request, thread):
 
     record_event(request, thread, "hid")
 
-    if thread.pk == thread.category.last_thread_id:
-        thread.category.synchronize()
-        thread.category.save()
+    update_category_counters(thread.category, counted, thread)
+    thread.category.save()
 
     return True
 
 
 @transaction.atomic
 def delete_thread(request, thread):
+    counted = lock_threads_counters(thread)
     thread.delete()
 
-    thread.category.synchronize()
+    update_category_counters(thread.category, counted, thread)
     thread.category.save()
 
     return True
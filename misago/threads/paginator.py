@@ -1,4 +1,5 @@
 from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 
 
 class PostsPaginator(Paginator):
@@ -19,4 +20,39 @@ class PostsPaginator(Paginator):
             top = self.count
         if top < self.count:
             top += 1
-        return self._get_page(self.object_list[bottom:top], number, self)
+        return self._get_page(self.get_page_items(bottom, top), number, self)
+
+    def get_page_items(self, bottom, top):
+        return self.object_list[bottom:top]
+
+
+class KeysetPostsPaginator(PostsPaginator):
+    """
+    posts paginator that selects page's posts by ids of its first and last post.
+
+    Requires sorted list of ids of all posts in queryset, and makes every page
+    cost the same, as opposed to slicing queryset with OFFSET.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+        *,
+        posts_ids
+    ):
+        self.posts_ids = posts_ids
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+
+    @cached_property
+    def count(self):
+        return len(self.posts_ids)
+
+    def get_page_items(self, bottom, top):
+        if bottom >= top:
+            return self.object_list.none()
+        return self.object_list.filter(
+            id__gte=self.posts_ids[bottom], id__lte=self.posts_ids[top - 1]
+        )
@@ -509,6 +509,13 @@ def register_with(registry):
     registry.acl_annotator(Thread, add_acl_to_thread)
     registry.acl_annotator(Post, add_acl_to_post)
 
+    registry.user_acl_serializer(serialize_threads_acl)
+    registry.user_acl_finalizer(build_threads_visibility)
+
+
+def serialize_threads_acl(user_acl):
+    user_acl.pop("threads_visibility", None)
+
 
 def allow_see_thread(user_acl, target):
     category_acl = user_acl["categories"].get(
@@ -1302,107 +1309,133 @@ def has_time_to_edit_post(user_acl, target):
     return True
 
 
-def exclude_invisible_threads(
-    user_acl, categories, queryset
-):  # pylint: disable=too-many-branches
-    show_all = []
-    show_accepted_visible = []
-    show_accepted = []
-    show_visible = []
-    show_owned = []
-    show_owned_visible = []
-
-    for category in categories:
-        add_acl_to_obj(user_acl, category)
+def build_threads_visibility(user_acl):
+    """Precomputes groups of categories ids in which user sees same set of threads
+
+    Those groups are used by exclude_invisible_threads to filter threads querysets
+    with few "category_id IN (...)" clauses instead of walking categories ACLs.
+    Groups are computed for authenticated user and merged by
+    exclude_invisible_threads if user is anonymous.
+    """
+    visibility = {
+        "all": [],
+        "accepted_visible": [],
+        "accepted": [],
+        "visible": [],
+        "owned": [],
+        "owned_visible": [],
+    }
 
-        if not (category.acl["can_see"] and category.acl["can_browse"]):
+    visible_categories = set(user_acl.get("visible_categories") or [])
+    for category_id, category_acl in (user_acl.get("categories") or {}).items():
+        if category_id not in visible_categories:
+            continue
+        if not category_acl.get("can_browse"):
             continue
 
-        can_hide = category.acl["can_hide_threads"]
-        if category.acl["can_see_all_threads"]:
-            can_mod = category.acl["can_approve_content"]
+        can_hide = category_acl.get("can_hide_threads")
+        if category_acl.get("can_see_all_threads"):
+            can_mod = category_acl.get("can_approve_content")
 
             if can_mod and can_hide:
-                show_all.append(category)
-            elif user_acl["is_authenticated"]:
-                if not can_mod and not can_hide:
-                    show_accepted_visible.append(category)
-                elif not can_mod:
-                    show_accepted.append(category)
-                elif not can_hide:
-                    show_visible.append(category)
-            else:
-                show_accepted_visible.append(category)
-        elif user_acl["is_authenticated"]:
-            if can_hide:
-                show_owned.append(category)
+                visibility["all"].append(category_id)
+            elif not can_mod and not can_hide:
+                visibility["accepted_visible"].append(category_id)
+            elif not can_mod:
+                visibility["accepted"].append(category_id)
             else:
-                show_owned_visible.append(category)
+                visibility["visible"].append(category_id)
+        elif can_hide:
+            visibility["owned"].append(category_id)
+        else:
+            visibility["owned_visible"].append(category_id)
 
-    conditions = None
-    if show_all:
-        conditions = Q(category__in=show_all)
+    user_acl["threads_visibility"] = visibility
 
-    if show_accepted_visible:
-        if user_acl["is_authenticated"]:
-            condition = Q(
-                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-                category__in=show_accepted_visible,
-                is_hidden=False,
-            )
-        else:
-            condition = Q(
-                category__in=show_accepted_visible, is_hidden=False, is_unapproved=False
+
+def get_threads_visibility(user_acl, categories):
+    if "threads_visibility" not in user_acl:
+        build_threads_visibility(user_acl)
+
+    categories_ids = set()
+    for category in categories:
+        categories_ids.add(getattr(category, "pk", category))
+
+    visibility = {}
+    for group, group_categories in user_acl["threads_visibility"].items():
+        visibility[group] = [i for i in group_categories if i in categories_ids]
+
+    if not user_acl["is_authenticated"]:
+        # Anonymous users can't moderate or own threads
+        visibility = {
+            "accepted_visible": (
+                visibility["all"]
+                + visibility["accepted_visible"]
+                + visibility["accepted"]
+                + visibility["visible"]
             )
+        }
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+    return visibility
 
-    if show_accepted:
-        condition = Q(
-            Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-            category__in=show_accepted,
-        )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+def exclude_invisible_threads(user_acl, categories, queryset):
+    visibility = get_threads_visibility(user_acl, categories)
 
-    if show_visible:
-        condition = Q(category__in=show_visible, is_hidden=False)
+    conditions = []
+    if visibility.get("all"):
+        conditions.append(Q(category_id__in=visibility["all"]))
 
-        if conditions:
-            conditions = conditions | condition
+    if visibility.get("accepted_visible"):
+        if user_acl["is_authenticated"]:
+            conditions.append(
+                Q(
+                    Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
+                    category_id__in=visibility["accepted_visible"],
+                    is_hidden=False,
+                )
+            )
         else:
-            conditions = condition
+            conditions.append(
+                Q(
+                    category_id__in=visibility["accepted_visible"],
+                    is_hidden=False,
+                    is_unapproved=False,
+                )
+            )
 
-    if show_owned:
-        condition = Q(category__in=show_owned, starter_id=user_acl["user_id"])
+    if visibility.get("accepted"):
+        conditions.append(
+            Q(
+                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
+                category_id__in=visibility["accepted"],
+            )
+        )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+    if visibility.get("visible"):
+        conditions.append(Q(category_id__in=visibility["visible"], is_hidden=False))
 
-    if show_owned_visible:
-        condition = Q(
-            category__in=show_owned_visible,
-            starter_id=user_acl["user_id"],
-            is_hidden=False,
+    if visibility.get("owned"):
+        conditions.append(
+            Q(category_id__in=visibility["owned"], starter_id=user_acl["user_id"])
         )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+    if visibility.get("owned_visible"):
+        conditions.append(
+            Q(
+                category_id__in=visibility["owned_visible"],
+                starter_id=user_acl["user_id"],
+                is_hidden=False,
+            )
+        )
 
     if not conditions:
         return Thread.objects.none()
 
-    return queryset.filter(conditions)
+    filters = conditions.pop(0)
+    for condition in conditions:
+        filters |= condition
+    return queryset.filter(filters)
 
 
 def exclude_invisible_posts(user_acl, categories, queryset):
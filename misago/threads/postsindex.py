@@ -0,0 +1,140 @@
+"""Cached index of posts in thread, used to paginate them by their ids
+
+Index keeps ids of approved posts in thread together with ids and posters of
+unapproved ones, so ids of posts visible to user and their positions in thread
+are known without counting posts in database. Saved and deleted posts are added
+to or removed from cached index, and posts edits and likes don't change it.
+Index is cleared when thread is synchronized, and is rebuilt when it doesn't
+agree with thread's first post, replies or unapproved posts.
+"""
+from bisect import bisect_left, bisect_right
+
+from django.core.cache import cache
+
+from ..acl.objectacl import add_acl_to_obj
+from ..conf import settings
+
+
+def is_paginating_by_keyset():
+    return settings.MISAGO_POSTS_PAGINATION == "keyset"
+
+
+def get_visible_posts_ids(user_acl, thread):
+    """Returns sorted list of ids of thread's posts visible to user, minus events"""
+    index = get_posts_index(thread)
+
+    add_acl_to_obj(user_acl, thread.category)
+    if thread.category.acl["can_approve_content"]:
+        unapproved = [post_id for post_id, _ in index["unapproved"]]
+    elif user_acl["is_authenticated"]:
+        unapproved = [
+            post_id
+            for post_id, poster_id in index["unapproved"]
+            if poster_id == user_acl["user_id"]
+        ]
+    else:
+        unapproved = []
+
+    if unapproved:
+        return sorted(index["approved"] + unapproved)
+    return index["approved"]
+
+
+def get_post_position(posts_ids, post):
+    """Returns number of posts up to post, or up to event if post is event"""
+    if post.is_event:
+        return bisect_left(posts_ids, post.pk)
+    return bisect_right(posts_ids, post.pk)
+
+
+def get_posts_index(thread):
+    index = cache.get(get_cache_key(thread.pk))
+    if index and is_posts_index_valid(index, thread):
+        return index
+
+    index = build_posts_index(thread)
+    set_posts_index(thread.pk, index)
+    return index
+
+
+def build_posts_index(thread):
+    index = {"approved": [], "unapproved": []}
+
+    queryset = thread.post_set.filter(is_event=False).order_by("id")
+    for post_id, poster_id, is_unapproved in queryset.values_list(
+        "id", "poster_id", "is_unapproved"
+    ):
+        if is_unapproved:
+            index["unapproved"].append((post_id, poster_id))
+        else:
+            index["approved"].append(post_id)
+
+    return index
+
+
+def is_posts_index_valid(index, thread):
+    """Checks index against thread, in case it missed some changes to posts"""
+    first_posts_ids = index["approved"][:1] + [p for p, _ in index["unapproved"][:1]]
+    return (
+        bool(first_posts_ids)
+        and min(first_posts_ids) == thread.first_post_id
+        and len(index["approved"]) == thread.replies + 1
+        and bool(index["unapproved"]) == thread.has_unapproved_posts
+    )
+
+
+def update_posts_index(post):
+    """Adds post to cached index or moves it after its approval changed"""
+    index = cache.get(get_cache_key(post.thread_id))
+    if not index:
+        return
+
+    approved = index["approved"]
+    position = bisect_left(approved, post.pk)
+    is_in_approved = position < len(approved) and approved[position] == post.pk
+    is_in_unapproved = any(p[0] == post.pk for p in index["unapproved"])
+
+    if post.is_unapproved:
+        if is_in_unapproved:
+            return
+        if is_in_approved:
+            approved.pop(position)
+        index["unapproved"].append((post.pk, post.poster_id))
+        index["unapproved"].sort()
+    else:
+        if is_in_approved:
+            return
+        approved.insert(position, post.pk)
+        if is_in_unapproved:
+            index["unapproved"] = [p for p in index["unapproved"] if p[0] != post.pk]
+
+    set_posts_index(post.thread_id, index)
+
+
+def remove_from_posts_index(post):
+    index = cache.get(get_cache_key(post.thread_id))
+    if not index:
+        return
+
+    approved = index["approved"]
+    position = bisect_left(approved, post.pk)
+    if position < len(approved) and approved[position] == post.pk:
+        approved.pop(position)
+    else:
+        index["unapproved"] = [p for p in index["unapproved"] if p[0] != post.pk]
+
+    set_posts_index(post.thread_id, index)
+
+
+def set_posts_index(thread_id, index):
+    cache.set(
+        get_cache_key(thread_id), index, settings.MISAGO_POSTS_INDEX_CACHE_TIMEOUT
+    )
+
+
+def clear_posts_indexes(threads_ids):
+    cache.delete_many([get_cache_key(thread_id) for thread_id in threads_ids])
+
+
+def get_cache_key(thread_id):
+    return "thread_posts_index_%s" % thread_id
@@ -0,0 +1,178 @@
+"""Queue of e-mail notifications about new replies to subscribed threads
+
+Posting reply queues notification, which is sent after the transaction is
+committed by Celery task, by the request itself on setups without Celery
+worker, or by the sendreplynotifications command run by scheduler, depending
+on MISAGO_REPLY_NOTIFICATIONS_SENDER setting. Sender checks permissions once for
+subscribers sharing ACL key, renders messages in single language and sends all
+of them through single connection to mail server.
+"""
+import logging
+from functools import partial
+
+from django.core import mail as djmail
+from django.db import transaction
+from django.utils import translation
+from django.utils.translation import gettext as _
+
+from ..acl import useracl
+from ..cache.versions import get_cache_versions
+from ..conf import settings
+from ..conf.dynamicsettings import DynamicSettings
+from ..core.mail import build_mail, send_messages
+from .models import ReplyNotification
+from .permissions import can_see_post, can_see_thread
+
+logger = logging.getLogger("misago.threads.replynotifications")
+
+
+def queue_reply_notification(post, previous_last_post_on):
+    notification = ReplyNotification.objects.create(
+        post=post, previous_last_post_on=previous_last_post_on
+    )
+    if settings.MISAGO_REPLY_NOTIFICATIONS_SENDER != "command":
+        transaction.on_commit(partial(dispatch_reply_notification, notification.id))
+
+
+def dispatch_reply_notification(notification_id):
+    if settings.MISAGO_REPLY_NOTIFICATIONS_SENDER == "inline":
+        try:
+            send_queued_reply_notifications(notifications_ids=[notification_id])
+        except Exception:  # pylint: disable=broad-except
+            # reply was already saved, don't fail the request because of mailing
+            logger.exception("Sending reply notification %s failed", notification_id)
+    else:
+        from .tasks import send_reply_notifications
+
+        send_reply_notifications.delay()
+
+
+def send_queued_reply_notifications(batch_size=None, notifications_ids=None):
+    """Sends notifications from queue until its empty, returning number of e-mails"""
+    batch_size = batch_size or settings.MISAGO_REPLY_NOTIFICATIONS_BATCH_SIZE
+    cache_versions = get_cache_versions()
+    dynamic_settings = DynamicSettings(cache_versions)
+
+    queryset = ReplyNotification.objects.select_related(
+        "post", "post__thread", "post__poster"
+    ).order_by("id")
+    if notifications_ids is not None:
+        queryset = queryset.filter(id__in=notifications_ids)
+
+    sent_emails = 0
+    connection = djmail.get_connection()
+    connection.open()
+    try:
+        with translation.override(settings.LANGUAGE_CODE):
+            while True:
+                notifications = claim_reply_notifications(queryset, batch_size)
+                if not notifications:
+                    break
+
+                for notification in notifications:
+                    try:
+                        messages = build_reply_notification_mails(
+                            notification, cache_versions, dynamic_settings
+                        )
+                        if messages:
+                            send_messages(messages, connection)
+                            sent_emails += len(messages)
+                    except Exception:  # pylint: disable=broad-except
+                        logger.exception(
+                            "Sending reply notification %s failed", notification.id
+                        )
+    finally:
+        connection.close()
+
+    return sent_emails
+
+
+def claim_reply_notifications(queryset, batch_size):
+    """Removes batch of notifications from queue and returns it for sending
+
+    Notifications are removed before e-mails are sent, so failure in sending
+    doesn't make already sent e-mails to be sent again, and notification that
+    can't be sent doesn't block the queue.
+    """
+    with transaction.atomic():
+        # skip locked notifications so senders may run in parallel
+        notifications = list(
+            queryset.select_for_update(skip_locked=True, of=("self",))[:batch_size]
+        )
+        ReplyNotification.objects.filter(id__in=[n.id for n in notifications]).delete()
+
+    return notifications
+
+
+def build_reply_notification_mails(notification, cache_versions, dynamic_settings):
+    post = notification.post
+    thread = post.thread
+    sender = post.poster
+
+    subscribers = get_subscribers(thread, sender, notification.previous_last_post_on)
+    subscribers = filter_subscribers_with_access(
+        subscribers, thread, post, cache_versions
+    )
+    if not subscribers:
+        return []
+
+    subject_formats = {"user": post.poster_name, "thread": thread.title}
+    starter_subject = _('%(user)s has replied to your thread "%(thread)s"')
+    subscriber_subject = _(
+        '%(user)s has replied to thread "%(thread)s" that you are watching'
+    )
+    context = {"settings": dynamic_settings, "thread": thread, "post": post}
+
+    messages = []
+    for subscriber in subscribers:
+        if subscriber.id == thread.starter_id:
+            subject = starter_subject % subject_formats
+        else:
+            subject = subscriber_subject % subject_formats
+
+        messages.append(
+            build_mail(
+                subscriber,
+                subject,
+                "misago/emails/thread/reply",
+                sender=sender,
+                context=context,
+            )
+        )
+
+    return messages
+
+
+def get_subscribers(thread, sender, previous_last_post_on):
+    queryset = (
+        thread.subscription_set.filter(
+            send_email=True, last_read_on__gte=previous_last_post_on
+        )
+        .select_related("user")
+        .order_by("id")
+    )
+    if sender:
+        queryset = queryset.exclude(user=sender)
+    return [subscription.user for subscription in queryset.iterator()]
+
+
+def filter_subscribers_with_access(subscribers, thread, post, cache_versions):
+    """Returns subscribers that can see post, getting ACL once for every acl_key"""
+    acls = {}
+    subscribers_with_access = []
+
+    for subscriber in subscribers:
+        acl_key = subscriber.acl_key or "user_%s" % subscriber.id
+        if acl_key not in acls:
+            acls[acl_key] = useracl.get_user_acl(subscriber, cache_versions)
+
+        # acl_key identifies roles only, set user's own fields like get_user_acl
+        user_acl = acls[acl_key].copy()
+        user_acl["user_id"] = subscriber.id
+        user_acl["is_staff"] = subscriber.is_staff
+        user_acl["is_superuser"] = subscriber.is_superuser
+
+        if can_see_thread(user_acl, thread) and can_see_post(user_acl, post):
+            subscribers_with_access.append(subscriber)
+
+    return subscribers_with_access
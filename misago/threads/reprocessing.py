@@ -0,0 +1,96 @@
+"""Bulk reparsing, checksumming and search indexing of posts
+
+Posts are processed in batches of consecutive ids. Every batch is loaded with
+single query and written back with bulk UPDATE, and batches may be processed in
+pool of worker processes.
+"""
+from django.contrib.postgres.search import SearchVector
+
+from ..conf import settings
+from ..conf.shortcuts import get_dynamic_settings
+from ..core.utils import get_host_from_address
+from ..markup import common_flavour
+from ..users.models import AnonymousUser
+from .checksums import update_post_checksum
+from .models import Post
+
+REPARSE = "reparse"
+CHECKSUMS = "checksums"
+SEARCH = "search"
+
+OPERATIONS = (REPARSE, CHECKSUMS, SEARCH)
+
+
+class ReparsingRequest:
+    """Minimal request object for parser, resolving links against forum address"""
+
+    def __init__(self, host, user=None):
+        self.host = host
+        self.user = user or AnonymousUser()
+
+    def get_host(self):
+        return self.host
+
+
+def get_posts_queryset():
+    return Post.objects.filter(is_event=False)
+
+
+def get_batches(queryset, batch_size, start_after=0):
+    """Yields (first id, last id) ranges of batches using keyset pagination"""
+    queryset = queryset.order_by("id").values_list("id", flat=True)
+    last_id = start_after
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        yield batch[0], batch[-1]
+        last_id = batch[-1]
+
+
+def get_forum_host():
+    return get_host_from_address(get_dynamic_settings().forum_address)
+
+
+def process_batch(first_id, last_id, operations, host=None):
+    """Processes posts with ids in range, returning number of processed posts"""
+    queryset = get_posts_queryset().filter(id__gte=first_id, id__lte=last_id)
+    posts = list(queryset.select_related("thread", "poster"))
+
+    update_fields = set()
+    for post in posts:
+        if REPARSE in operations:
+            reparse_post(post, host)
+            update_fields.add("parsed")
+        if REPARSE in operations or CHECKSUMS in operations:
+            update_post_checksum(post)
+            update_fields.add("checksum")
+        if SEARCH in operations:
+            if post.id == post.thread.first_post_id:
+                post.set_search_document(post.thread.title)
+            else:
+                post.set_search_document()
+            update_fields.add("search_document")
+
+    if posts and update_fields:
+        Post.objects.bulk_update(posts, sorted(update_fields))
+
+    if posts and SEARCH in operations:
+        queryset.update(
+            search_vector=SearchVector(
+                "search_document", config=settings.MISAGO_SEARCH_CONFIG
+            )
+        )
+
+    return len(posts)
+
+
+def process_batch_task(batch):
+    """Processes batch in worker, returning its last id and number of posts"""
+    return batch[1], process_batch(*batch)
+
+
+def reparse_post(post, host):
+    request = ReparsingRequest(host, post.poster)
+    parsing_result = common_flavour(request, post.poster, post.original)
+    post.parsed = parsing_result["parsed_text"]
@@ -1,16 +1,25 @@
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from hashlib import md5
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.cache import cache
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 
+from ..acl import ACL_CACHE
 from ..conf import settings
 from ..core.shortcuts import paginate, pagination_dict
 from ..search import SearchProvider
 from .filtersearch import filter_search
 from .models import Post, Thread
 from .permissions import exclude_invisible_threads
+from .permissions.threads import get_threads_visibility
 from .serializers import FeedSerializer
 from .utils import add_categories_to_items
 from .viewmodels import ThreadsRootCategory
 
+# Visibility groups that depend on user and not only on their permissions
+USER_VISIBILITY = ("accepted_visible", "accepted", "owned", "owned_visible")
+
 
 class SearchThreads(SearchProvider):
     name = _("Threads")
@@ -22,10 +31,7 @@ class SearchThreads(SearchProvider):
         threads_categories = [root_category.unwrap()] + root_category.subcategories
 
         if len(query) > 1:
-            visible_threads = exclude_invisible_threads(
-                self.request.user_acl, threads_categories, Thread.objects
-            )
-            results = search_threads(self.request, query, visible_threads)
+            results = self.get_results(query, threads_categories)
         else:
             results = []
 
@@ -41,9 +47,8 @@ class SearchThreads(SearchProvider):
         posts = []
         threads = []
         if paginator["count"]:
-            posts = list(
-                list_page.object_list.select_related("thread", "poster", "poster__rank")
-            )
+            with self.measure("database"):
+                posts = get_posts(list_page.object_list)
 
             threads = []
             for post in posts:
@@ -62,16 +67,34 @@ class SearchThreads(SearchProvider):
 
         return results
 
+    def get_results(self, query, threads_categories):
+        """Returns ranked ids of found posts, searching only if they weren't cached"""
+        cache_key = get_cache_key(self.request, query, threads_categories)
+
+        with self.measure("cache"):
+            results = cache.get(cache_key)
+        if results is not None:
+            return results
+
+        with self.measure("database"):
+            visible_threads = exclude_invisible_threads(
+                self.request.user_acl, threads_categories, Thread.objects
+            )
+            results = search_threads(self.request, query, visible_threads)
+
+        with self.measure("cache"):
+            cache.set(cache_key, results, settings.MISAGO_THREADS_SEARCH_CACHE_TIMEOUT)
+
+        return results
+
 
 def search_threads(request, query, visible_threads):
+    """Returns list of ids of best ranked posts matching query"""
     max_hits = request.settings.posts_per_page * 5
 
     search_query = SearchQuery(
         filter_search(query), config=settings.MISAGO_SEARCH_CONFIG
     )
-    search_vector = SearchVector(
-        "search_document", config=settings.MISAGO_SEARCH_CONFIG
-    )
 
     queryset = Post.objects.filter(
         is_event=False,
@@ -81,11 +104,38 @@ def search_threads(request, query, visible_threads):
         search_vector=search_query,
     )
 
-    if queryset[: max_hits + 1].count() > max_hits:
-        queryset = queryset.order_by("-id")[:max_hits]
+    # rank only newest matches, so ranking cost doesn't grow with number of matches
+    newest_matches = queryset.order_by("-id").values("id")
+    newest_matches = newest_matches[: settings.MISAGO_THREADS_SEARCH_RANKED_MATCHES]
 
-    return (
-        Post.objects.filter(id__in=queryset.values("id"))
-        .annotate(rank=SearchRank(search_vector, search_query))
-        .order_by("-rank", "-id")
+    queryset = Post.objects.filter(id__in=newest_matches)
+    queryset = queryset.annotate(rank=SearchRank(F("search_vector"), search_query))
+    return list(
+        queryset.order_by("-rank", "-id").values_list("id", flat=True)[:max_hits]
     )
+
+
+def get_posts(posts_ids):
+    queryset = Post.objects.filter(id__in=posts_ids)
+    posts = {
+        post.id: post
+        for post in queryset.select_related("thread", "poster", "poster__rank")
+    }
+    return [posts[post_id] for post_id in posts_ids if post_id in posts]
+
+
+def get_cache_key(request, query, threads_categories):
+    user_acl = request.user_acl
+    cache_key = [
+        query,
+        request.user.acl_key,
+        user_acl.get("cache_versions", {}).get(ACL_CACHE),
+        request.settings.posts_per_page,
+    ]
+
+    visibility = get_threads_visibility(user_acl, threads_categories)
+    if user_acl["is_authenticated"] and any(visibility.get(g) for g in USER_VISIBILITY):
+        cache_key.append(user_acl["user_id"])
+
+    cache_key = md5(repr(cache_key).encode()).hexdigest()
+    return "threads_search_%s" % cache_key
@@ -2,13 +2,19 @@ from collections import OrderedDict
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django.utils.translation import gettext as _
 
 from ..categories.models import Category
-from ..categories.signals import delete_category_content, move_category_content
+from ..categories.signals import (
+    archive_pruned_threads,
+    delete_category_content,
+    delete_pruned_threads,
+    move_category_content,
+)
 from ..core.pgutils import chunk_queryset
+from ..readtracker.unreadsummary import mark_categories_changed
 from ..users.signals import (
     anonymize_user_data,
     archive_user_data,
@@ -16,7 +22,18 @@ from ..users.signals import (
     username_changed,
 )
 from .anonymize import ANONYMIZABLE_EVENTS, anonymize_event, anonymize_post_last_likes
-from .models import Attachment, Poll, PollVote, Post, PostEdit, PostLike, Thread
+from .categorycounters import get_counters_changes, lock_threads_counters
+from .models import (
+    Attachment,
+    Poll,
+    PollVote,
+    Post,
+    PostEdit,
+    PostLike,
+    Subscription,
+    Thread,
+)
+from .postsindex import remove_from_posts_index, update_posts_index
 
 delete_post = Signal()
 delete_thread = Signal()
@@ -26,6 +43,21 @@ move_post = Signal()
 move_thread = Signal()
 
 
+@receiver(post_save, sender=Post)
+def update_thread_posts_index(sender, instance, update_fields=None, **kwargs):
+    # skip saves that can't change post's approval, like edits or likes
+    if update_fields and "is_unapproved" not in update_fields:
+        return
+    if not instance.is_event:
+        update_posts_index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_thread_posts_index(sender, instance, **kwargs):
+    if not instance.is_event:
+        remove_from_posts_index(instance)
+
+
 @receiver(merge_thread)
 def merge_threads(sender, **kwargs):
     other_thread = kwargs["other_thread"]
@@ -81,10 +113,38 @@ def move_category_threads(sender, **kwargs):
     sender.subscription_set.update(category=new_category)
 
 
+@receiver(delete_pruned_threads)
+def delete_pruned_threads_content(sender, **kwargs):
+    threads_ids = kwargs["threads_ids"]
+
+    Subscription.objects.filter(thread_id__in=threads_ids).delete()
+    PollVote.objects.filter(thread_id__in=threads_ids).delete()
+    Poll.objects.filter(thread_id__in=threads_ids).delete()
+    PostLike.objects.filter(thread_id__in=threads_ids).delete()
+    PostEdit.objects.filter(thread_id__in=threads_ids).delete()
+    Post.objects.filter(thread_id__in=threads_ids).delete()
+    Thread.objects.filter(id__in=threads_ids).delete()
+
+
+@receiver(archive_pruned_threads)
+def archive_pruned_threads_content(sender, **kwargs):
+    threads_ids = kwargs["threads_ids"]
+    new_category = kwargs["new_category"]
+
+    Thread.objects.filter(id__in=threads_ids).update(category=new_category)
+    Post.objects.filter(thread_id__in=threads_ids).update(category=new_category)
+    PostEdit.objects.filter(thread_id__in=threads_ids).update(category=new_category)
+    PostLike.objects.filter(thread_id__in=threads_ids).update(category=new_category)
+    Poll.objects.filter(thread_id__in=threads_ids).update(category=new_category)
+    PollVote.objects.filter(thread_id__in=threads_ids).update(category=new_category)
+    Subscription.objects.filter(thread_id__in=threads_ids).update(category=new_category)
+
+
 @receiver(delete_user_content)
 def delete_user_threads(sender, **kwargs):
     recount_categories = set()
     recount_threads = set()
+    counters_changes = {}
 
     for post in chunk_queryset(sender.liked_post_set):
         cleaned_likes = list(filter(lambda i: i["id"] != sender.id, post.last_likes))
@@ -95,7 +155,9 @@ def delete_user_threads(sender, **kwargs):
     for thread in chunk_queryset(sender.thread_set):
         recount_categories.add(thread.category_id)
         with transaction.atomic():
+            counted = lock_threads_counters(thread)
             thread.delete()
+        add_counters_changes(counters_changes, counted, thread)
 
     for post in chunk_queryset(sender.post_set):
         recount_categories.add(post.category_id)
@@ -106,13 +168,28 @@ def delete_user_threads(sender, **kwargs):
     if recount_threads:
         changed_threads_qs = Thread.objects.filter(id__in=recount_threads)
         for thread in chunk_queryset(changed_threads_qs):
-            thread.synchronize()
-            thread.save()
+            # deleting posts doesn't change threads rows until they are synchronized
+            with transaction.atomic():
+                counted = lock_threads_counters(thread)
+                thread.synchronize()
+                thread.save()
+            add_counters_changes(counters_changes, counted, thread)
 
     if recount_categories:
         for category in Category.objects.filter(id__in=recount_categories):
-            category.synchronize()
+            category.update_counters(*counters_changes.get(category.pk, (0, 0)))
+            category.update_last_thread()
             category.save()
+        mark_categories_changed(*recount_categories)
+
+
+def add_counters_changes(counters_changes, counted, thread):
+    for category_id, (threads, posts) in get_counters_changes(counted, thread).items():
+        category_threads, category_posts = counters_changes.get(category_id, (0, 0))
+        counters_changes[category_id] = (
+            category_threads + threads,
+            category_posts + posts,
+        )
 
 
 @receiver(archive_user_data)
@@ -0,0 +1,103 @@
+"""Set-based synchronization of threads with their posts
+
+State of many threads (replies count, has_* flags and first and last post ids)
+is computed with single aggregate query over their posts, followed by one query
+for polls and one for first and last posts, no matter how many threads are
+synchronized.
+"""
+from django.contrib.postgres.aggregates import BoolOr
+from django.db.models import Count, Max, Min, Q
+
+from .models import Poll, Post
+from .postsindex import clear_posts_indexes
+
+SYNCHRONIZED_FIELDS = [
+    "has_poll",
+    "replies",
+    "has_reported_posts",
+    "has_open_reports",
+    "has_unapproved_posts",
+    "has_hidden_posts",
+    "has_events",
+    "started_on",
+    "first_post",
+    "starter",
+    "starter_name",
+    "starter_slug",
+    "is_unapproved",
+    "is_hidden",
+    "last_post_on",
+    "last_post_is_event",
+    "last_post",
+    "last_poster",
+    "last_poster_name",
+    "last_poster_slug",
+]
+
+
+def synchronize_threads(threads):
+    """Updates threads attributes from their posts, without saving threads
+
+    Returns list of synchronized threads. Threads without posts are skipped.
+    """
+    threads = {thread.pk: thread for thread in threads}
+    if not threads:
+        return []
+
+    clear_posts_indexes(threads)
+
+    threads_states = get_threads_states(threads)
+    threads_with_poll = set(
+        Poll.objects.filter(thread_id__in=threads).values_list("thread_id", flat=True)
+    )
+
+    posts_ids = set()
+    for state in threads_states.values():
+        posts_ids.add(state["first_post_id"])
+        posts_ids.add(state["last_post_id"] or state["first_post_id"])
+    posts = Post.objects.select_related("poster").in_bulk(posts_ids)
+
+    synchronized_threads = []
+    for thread_id, state in threads_states.items():
+        thread = threads[thread_id]
+        synchronized_threads.append(thread)
+
+        thread.has_poll = thread_id in threads_with_poll
+        thread.replies = max(state["posts"] - 1, 0)
+
+        thread.has_reported_posts = state["has_reported_posts"]
+        thread.has_open_reports = (
+            state["has_reported_posts"] and state["has_open_reports"]
+        )
+        thread.has_unapproved_posts = state["has_unapproved_posts"]
+        thread.has_hidden_posts = state["has_hidden_posts"]
+
+        thread.set_first_post(posts[state["first_post_id"]])
+        if state["last_post_id"]:
+            thread.set_last_post(posts[state["last_post_id"]])
+            thread.has_events = state["has_events"]
+        else:
+            thread.set_last_post(posts[state["first_post_id"]])
+            thread.has_events = False
+
+    return synchronized_threads
+
+
+def get_threads_states(threads_ids):
+    queryset = (
+        Post.objects.filter(thread_id__in=threads_ids)
+        .values("thread_id")
+        .annotate(
+            posts=Count("id", filter=Q(is_event=False, is_unapproved=False)),
+            has_reported_posts=BoolOr("has_reports"),
+            has_open_reports=BoolOr("has_open_reports"),
+            has_unapproved_posts=BoolOr("is_unapproved"),
+            has_hidden_posts=BoolOr("is_hidden"),
+            has_events=BoolOr("is_event"),
+            first_post_id=Min("id"),
+            last_post_id=Max("id", filter=Q(is_unapproved=False)),
+        )
+        .order_by()
+    )
+
+    return {state.pop("thread_id"): state for state in queryset}
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from .replynotifications import send_queued_reply_notifications
+
+
+@shared_task
+def send_reply_notifications():
+    send_queued_reply_notifications()
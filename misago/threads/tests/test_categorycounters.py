@@ -0,0 +1,181 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from .. import test
+from ...categories.models import Category
+from ..categorycounters import (
+    get_counters_changes,
+    lock_threads_counters,
+    update_category_counters,
+)
+from ..models import Thread
+
+
+class UpdateCategoryCountersTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.get(slug="first-category")
+        Category(name="Other Category", slug="other-category").insert_at(
+            self.category, position="last-child", save=True
+        )
+        self.other_category = Category.objects.get(slug="other-category")
+
+        self.threads = [test.post_thread(self.category) for _ in range(3)]
+        test.reply_thread(self.threads[0])
+        test.reply_thread(self.threads[0])
+
+        for category in (self.category, self.other_category):
+            category.synchronize()
+            category.save()
+
+    def assertCountersAreSynchronized(self, category):
+        category.save()
+
+        synchronized_category = Category.objects.get(pk=category.pk)
+        synchronized_category.synchronize()
+
+        category = Category.objects.get(pk=category.pk)
+        self.assertEqual(category.threads, synchronized_category.threads)
+        self.assertEqual(category.posts, synchronized_category.posts)
+        self.assertEqual(category.last_thread_id, synchronized_category.last_thread_id)
+
+    def test_locked_threads_counters_are_read_from_database(self):
+        """counters are read from database, not from threads instances"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        thread.replies = 10
+        hidden_thread = test.post_thread(self.category, is_hidden=True)
+
+        with self.assertNumQueries(1):
+            counted = lock_threads_counters(thread, hidden_thread, *self.threads[1:])
+        self.assertEqual(counted, {self.category.pk: (3, 5)})
+
+    def test_updating_counters_marks_category_changed_in_unread_summaries(self):
+        """category is recomputed in unread summaries after moderation"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+
+        counted = lock_threads_counters(thread)
+        with patch(
+            "misago.threads.categorycounters.mark_categories_changed"
+        ) as mark_categories_changed:
+            update_category_counters(self.category, counted, thread)
+        mark_categories_changed.assert_called_once_with(self.category.pk)
+
+    def test_new_threads_are_not_counted(self):
+        """threads that weren't saved yet have no counters"""
+        with self.assertNumQueries(0):
+            self.assertEqual(lock_threads_counters(Thread()), {})
+
+    def test_hidden_thread_is_uncounted(self):
+        """hiding thread decreases counters and changes last thread"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        self.assertEqual(self.category.last_thread_id, thread.pk)
+
+        counted = lock_threads_counters(thread)
+        thread.is_hidden = True
+        thread.save()
+
+        with self.assertNumQueries(4):
+            update_category_counters(self.category, counted, thread)
+
+        self.assertEqual(self.category.threads, 2)
+        self.assertEqual(self.category.posts, 2)
+        self.assertEqual(self.category.last_thread_id, self.threads[2].pk)
+        self.assertCountersAreSynchronized(self.category)
+
+    def test_replies_changes_are_counted(self):
+        """changes in thread replies are counted"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        counted = lock_threads_counters(thread)
+        thread.post_set.order_by("-id").first().delete()
+        thread.synchronize()
+        thread.save()
+
+        update_category_counters(self.category, counted, thread)
+
+        self.assertEqual(self.category.threads, 3)
+        self.assertEqual(self.category.posts, 4)
+        self.assertCountersAreSynchronized(self.category)
+
+    def test_reply_made_after_thread_was_loaded_is_not_uncounted(self):
+        """reply saved by other request after thread was loaded is kept in counters"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        test.reply_thread(thread)
+        Category.objects.filter(pk=self.category.pk).update(posts=6)
+
+        counted = lock_threads_counters(thread)
+        thread.is_hidden = True
+        thread.save(update_fields=["is_hidden"])
+
+        update_category_counters(self.category, counted, thread)
+
+        self.assertEqual(self.category.threads, 2)
+        self.assertEqual(self.category.posts, 2)
+        self.assertCountersAreSynchronized(self.category)
+
+    def test_moved_thread_is_counted_in_new_category(self):
+        """moved thread is uncounted in old category and counted in new one"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        counted = lock_threads_counters(thread)
+        thread.move(self.other_category)
+        thread.save()
+
+        update_category_counters(self.other_category, counted, thread)
+        update_category_counters(self.category, counted, thread)
+
+        self.assertEqual(self.category.threads, 2)
+        self.assertEqual(self.category.posts, 2)
+        self.assertEqual(self.other_category.threads, 1)
+        self.assertEqual(self.other_category.posts, 3)
+        self.assertEqual(self.other_category.last_thread_id, thread.pk)
+        self.assertCountersAreSynchronized(self.category)
+        self.assertCountersAreSynchronized(self.other_category)
+
+    def test_deleted_thread_is_uncounted(self):
+        """deleted thread is uncounted in category"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        counted = lock_threads_counters(thread)
+        thread.delete()
+
+        update_category_counters(self.category, counted, thread)
+
+        self.assertEqual(self.category.threads, 2)
+        self.assertEqual(self.category.posts, 2)
+        self.assertCountersAreSynchronized(self.category)
+
+    def test_new_thread_is_counted(self):
+        """thread created by change is counted in category"""
+        counted = lock_threads_counters(*self.threads)
+        new_thread = test.post_thread(self.other_category)
+
+        self.assertEqual(
+            get_counters_changes(counted, new_thread, *self.threads),
+            {self.category.pk: (0, 0), self.other_category.pk: (1, 1)},
+        )
+
+    def test_counters_are_updated_in_database(self):
+        """counters are changed in database, without overwriting other changes"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        counted = lock_threads_counters(thread)
+        thread.is_hidden = True
+        thread.save()
+
+        Category.objects.filter(pk=self.category.pk).update(threads=10, posts=20)
+        update_category_counters(self.category, counted, thread)
+
+        self.assertEqual(self.category.threads, 9)
+        self.assertEqual(self.category.posts, 17)
+
+        category = Category.objects.get(pk=self.category.pk)
+        self.assertEqual(category.threads, 9)
+        self.assertEqual(category.posts, 17)
+
+    def test_unchanged_counters_are_read_from_database(self):
+        """category's counters are refreshed even if they didn't change"""
+        thread = Thread.objects.get(pk=self.threads[0].pk)
+        counted = lock_threads_counters(thread)
+
+        Category.objects.filter(pk=self.category.pk).update(threads=10, posts=20)
+        update_category_counters(self.category, counted, thread)
+
+        self.assertEqual(self.category.threads, 10)
+        self.assertEqual(self.category.posts, 20)
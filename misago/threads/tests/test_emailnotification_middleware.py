@@ -1,14 +1,26 @@
 from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
 from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.encoding import smart_str
 
+from ...acl import useracl
+from ...cache.versions import get_cache_versions
 from ...conf.test import override_dynamic_settings
 from .. import test
 from ...categories.models import Category
 from ...users.test import AuthenticatedUserTestCase, create_test_user
+from ..management.commands import sendreplynotifications
+from ..models import ReplyNotification
+from ..replynotifications import (
+    filter_subscribers_with_access,
+    send_queued_reply_notifications,
+)
 from ..test import patch_category_acl, patch_other_user_category_acl
 
 
@@ -35,6 +47,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     @patch_category_acl({"can_reply_threads": True})
@@ -52,6 +65,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     @patch_category_acl({"can_reply_threads": True})
@@ -69,6 +83,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     @patch_category_acl({"can_reply_threads": True})
@@ -87,6 +102,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     @patch_category_acl({"can_reply_threads": True})
@@ -107,6 +123,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     @patch_category_acl({"can_reply_threads": True})
@@ -126,6 +143,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     @override_dynamic_settings(forum_address="http://test.com/")
@@ -144,6 +162,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 1)
         last_email = mail.outbox[-1]
 
@@ -175,6 +194,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        send_queued_reply_notifications()
         self.assertEqual(len(mail.outbox), 1)
         last_email = mail.outbox[-1]
 
@@ -189,3 +209,175 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
 
         last_post = self.thread.post_set.order_by("id").last()
         self.assertIn(last_post.get_absolute_url(), message)
+
+    @override_settings(MISAGO_REPLY_NOTIFICATIONS_SENDER="command")
+    @patch_category_acl({"can_reply_threads": True})
+    def test_notification_is_queued(self):
+        """reply only queues notification if it's sent by command"""
+        self.other_user.subscription_set.create(
+            thread=self.thread,
+            category=self.category,
+            last_read_on=timezone.now(),
+            send_email=True,
+        )
+
+        with patch("django.db.transaction.on_commit") as on_commit:
+            response = self.client.post(
+                self.api_link, data={"post": "This is test response!"}
+            )
+            self.assertEqual(response.status_code, 200)
+            on_commit.assert_not_called()
+
+        self.assertEqual(len(mail.outbox), 0)
+        notification = ReplyNotification.objects.get()
+        self.assertEqual(notification.post, self.thread.post_set.order_by("id").last())
+
+        self.assertEqual(send_queued_reply_notifications(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(ReplyNotification.objects.exists())
+
+    @override_settings(MISAGO_REPLY_NOTIFICATIONS_SENDER="inline")
+    @patch_category_acl({"can_reply_threads": True})
+    def test_notification_is_sent_inline_after_commit(self):
+        """reply notification is sent by request after posting is committed"""
+        self.other_user.subscription_set.create(
+            thread=self.thread,
+            category=self.category,
+            last_read_on=timezone.now(),
+            send_email=True,
+        )
+
+        with patch("django.db.transaction.on_commit", side_effect=lambda f: f()):
+            response = self.client.post(
+                self.api_link, data={"post": "This is test response!"}
+            )
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(ReplyNotification.objects.exists())
+
+    @patch_category_acl({"can_reply_threads": True})
+    def test_notification_is_sent_by_celery_task(self):
+        """by default reply notification is sent by celery task after commit"""
+        with patch("django.db.transaction.on_commit", side_effect=lambda f: f()), patch(
+            "misago.threads.tasks.send_reply_notifications"
+        ) as task:
+            response = self.client.post(
+                self.api_link, data={"post": "This is test response!"}
+            )
+            self.assertEqual(response.status_code, 200)
+            task.delay.assert_called_once()
+
+        self.assertTrue(ReplyNotification.objects.exists())
+
+    def test_failed_notification_is_removed_from_queue(self):
+        """notification that failed to send doesn't block other notifications"""
+        self.other_user.subscription_set.create(
+            thread=self.thread,
+            category=self.category,
+            last_read_on=timezone.now(),
+            send_email=True,
+        )
+        for _ in range(2):
+            ReplyNotification.objects.create(
+                post=test.reply_thread(self.thread, poster=self.user),
+                previous_last_post_on=self.thread.started_on,
+            )
+
+        with patch(
+            "misago.threads.replynotifications.send_messages",
+            side_effect=[Exception("SMTP error"), None],
+        ):
+            self.assertEqual(send_queued_reply_notifications(), 1)
+
+        self.assertFalse(ReplyNotification.objects.exists())
+
+    @override_dynamic_settings(forum_address="http://test.com/")
+    @patch_category_acl({"can_reply_threads": True})
+    def test_subscribers_sharing_acl_key_are_notified(self):
+        """acl is obtained once for subscribers sharing acl key"""
+        subscribers = [self.other_user]
+        for i in range(3):
+            subscribers.append(create_test_user("User%s" % i, "user%s@example.com" % i))
+        for subscriber in subscribers:
+            subscriber.subscription_set.create(
+                thread=self.thread,
+                category=self.category,
+                last_read_on=timezone.now(),
+                send_email=True,
+            )
+
+        response = self.client.post(
+            self.api_link, data={"post": "This is test response!"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with patch(
+            "misago.acl.useracl.get_user_acl", side_effect=useracl.get_user_acl
+        ) as get_user_acl:
+            self.assertEqual(send_queued_reply_notifications(), 4)
+            get_user_acl.assert_called_once()
+
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox), sorted(u.email for u in subscribers)
+        )
+
+    def test_subscribers_sharing_acl_key_get_own_user_flags(self):
+        """acl shared by subscribers with same acl key has their own user flags"""
+        superuser = create_test_user("Superuser", "superuser@example.com")
+        superuser.is_staff = True
+        superuser.is_superuser = True
+        superuser.save()
+
+        self.other_user.acl_key = superuser.acl_key
+        checked_acls = []
+
+        def can_see_thread(user_acl, thread):
+            checked_acls.append(
+                (user_acl["user_id"], user_acl["is_staff"], user_acl["is_superuser"])
+            )
+            return True
+
+        with patch(
+            "misago.threads.replynotifications.can_see_thread",
+            side_effect=can_see_thread,
+        ), patch("misago.threads.replynotifications.can_see_post", return_value=True):
+            filter_subscribers_with_access(
+                [superuser, self.other_user],
+                self.thread,
+                self.thread.first_post,
+                get_cache_versions(),
+            )
+
+        self.assertEqual(
+            checked_acls,
+            [(superuser.id, True, True), (self.other_user.id, False, False)],
+        )
+
+
+class SendReplyNotificationsCommandTests(AuthenticatedUserTestCase):
+    def test_command_sends_queued_notifications(self):
+        """command sends queued notifications and empties queue"""
+        category = Category.objects.get(slug="first-category")
+        thread = test.post_thread(category=category)
+        post = test.reply_thread(thread)
+
+        other_user = create_test_user("OtherUser", "otheruser@example.com")
+        other_user.subscription_set.create(
+            thread=thread,
+            category=category,
+            last_read_on=thread.started_on,
+            send_email=True,
+        )
+
+        ReplyNotification.objects.create(
+            post=post, previous_last_post_on=thread.started_on
+        )
+
+        out = StringIO()
+        call_command(sendreplynotifications.Command(), stdout=out)
+        self.assertEqual(out.getvalue().strip(), "Sent 1 e-mails")
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [other_user.email])
+        self.assertFalse(ReplyNotification.objects.exists())
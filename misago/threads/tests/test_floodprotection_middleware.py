@@ -1,9 +1,12 @@
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
+from django.core.cache.backends.locmem import LocMemCache
 from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
+from ...core import ratelimit
 from ..api.postingendpoint import PostingEndpoint, PostingInterrupt
 from ..api.postingendpoint.floodprotection import FloodProtectionMiddleware
 from ..test import post_thread
@@ -203,3 +206,51 @@ def test_middleware_lets_post_through_if_daily_limit_was_disabled(
         user_acl=default_acl,
     )
     middleware.interrupt_posting(None)
+
+
+@override_dynamic_settings(hourly_post_limit=3)
+def test_posts_older_than_hour_dont_count_to_hourly_limit(
+    default_category, dynamic_settings, user
+):
+    user.update_fields = []
+
+    for _ in range(3):
+        post_thread(
+            default_category,
+            poster=user,
+            started_on=timezone.now() - timedelta(hours=2),
+        )
+
+    middleware = FloodProtectionMiddleware(
+        mode=PostingEndpoint.START,
+        settings=dynamic_settings,
+        user=user,
+        user_acl=default_acl,
+    )
+    middleware.interrupt_posting(None)
+
+
+@override_dynamic_settings(hourly_post_limit=2)
+def test_middleware_counts_saved_post_to_cached_limit(
+    default_category, dynamic_settings, user
+):
+    user.update_fields = []
+    post_thread(default_category, poster=user)
+
+    middleware = FloodProtectionMiddleware(
+        mode=PostingEndpoint.START,
+        settings=dynamic_settings,
+        user=user,
+        user_acl=default_acl,
+    )
+
+    with patch.object(ratelimit, "cache", LocMemCache("floodprotection-tests", {})):
+        ratelimit.cache.clear()
+        middleware.interrupt_posting(None)
+        middleware.post_save(None)
+
+        # posts are counted from cache, not database
+        user.post_set.all().delete()
+        user.last_posted_on = None
+        with pytest.raises(PostingInterrupt):
+            middleware.interrupt_posting(None)
@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.utils import timezone
 
 from .. import test
@@ -394,3 +395,18 @@ class ThreadGotoPostTests(GotoViewTestCase):
         # go to last post link is valid
         last_url = self.client.get(self.thread.get_last_post_url())["location"]
         self.assertEqual(post_url, last_url)
+
+
+@override_settings(MISAGO_POSTS_PAGINATION="offset")
+class OffsetPaginationGotoPostTests(GotoPostTests):
+    pass
+
+
+@override_settings(MISAGO_POSTS_PAGINATION="offset")
+class OffsetPaginationGotoNewTests(GotoNewTests):
+    pass
+
+
+@override_settings(MISAGO_POSTS_PAGINATION="offset")
+class OffsetPaginationGotoUnapprovedTests(GotoUnapprovedTests):
+    pass
@@ -2,7 +2,11 @@ from itertools import product
 
 from django.test import TestCase
 
-from ..paginator import PostsPaginator
+from ...categories.models import Category
+
+from ..models import Post
+from ..paginator import KeysetPostsPaginator, PostsPaginator
+from ..test import post_thread, reply_thread
 
 
 class PostsPaginatorTests(TestCase):
@@ -93,3 +97,43 @@ class PostsPaginatorTests(TestCase):
         for page in paginator.page_range:
             items_list.append(paginator.page(page).object_list)
         return items_list
+
+
+class KeysetPostsPaginatorTests(TestCase):
+    def test_paginator_pages_are_same_as_posts_paginator_pages(self):
+        """keyset paginator returns same pages as posts paginator"""
+        category = Category.objects.get(slug="first-category")
+        thread = post_thread(category)
+        for _ in range(15):
+            reply_thread(thread)
+
+        queryset = Post.objects.filter(thread=thread).order_by("id")
+        posts_ids = list(queryset.values_list("id", flat=True))
+
+        for per_page, orphans in product(range(2, 8), range(4)):
+            paginator = PostsPaginator(queryset, per_page, orphans)
+            keyset_paginator = KeysetPostsPaginator(
+                queryset, per_page, orphans, posts_ids=posts_ids
+            )
+            self.assertEqual(keyset_paginator.count, paginator.count)
+            self.assertEqual(keyset_paginator.num_pages, paginator.num_pages)
+            self.assertEqual(
+                self.get_paginator_items_list(keyset_paginator),
+                self.get_paginator_items_list(paginator),
+            )
+
+    def test_paginator_doesnt_count_posts(self):
+        """keyset paginator uses ids list for count"""
+        category = Category.objects.get(slug="first-category")
+        thread = post_thread(category)
+        queryset = Post.objects.filter(thread=thread).order_by("id")
+
+        paginator = KeysetPostsPaginator(queryset, 5, posts_ids=[thread.first_post_id])
+        with self.assertNumQueries(1):
+            self.assertEqual(list(paginator.page(1).object_list), [thread.first_post])
+
+    def get_paginator_items_list(self, paginator):
+        items_list = []
+        for page in paginator.page_range:
+            items_list.append(list(paginator.page(page).object_list))
+        return items_list
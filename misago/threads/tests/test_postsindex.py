@@ -0,0 +1,183 @@
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from .. import postsindex
+from ..test import reply_thread
+
+
+@pytest.fixture(autouse=True)
+def index_cache(mocker):
+    cache = LocMemCache("posts-index", {})
+    mocker.patch("misago.threads.postsindex.cache", cache)
+    return cache
+
+
+@pytest.fixture
+def moderator_acl(user_acl, default_category):
+    user_acl["categories"][default_category.pk]["can_approve_content"] = True
+    return user_acl
+
+
+def test_visible_posts_ids_include_approved_posts(user_acl, thread):
+    posts = [thread.first_post] + [reply_thread(thread) for _ in range(3)]
+    thread.synchronize()
+
+    posts_ids = postsindex.get_visible_posts_ids(user_acl, thread)
+    assert posts_ids == [post.pk for post in posts]
+
+
+def test_visible_posts_ids_exclude_events(user_acl, thread):
+    reply_thread(thread, is_event=True)
+    thread.synchronize()
+
+    posts_ids = postsindex.get_visible_posts_ids(user_acl, thread)
+    assert posts_ids == [thread.first_post_id]
+
+
+def test_visible_posts_ids_exclude_other_users_unapproved_posts(
+    user_acl, anonymous_user_acl, thread
+):
+    reply_thread(thread, is_unapproved=True)
+    thread.synchronize()
+
+    assert postsindex.get_visible_posts_ids(user_acl, thread) == [thread.first_post_id]
+    assert postsindex.get_visible_posts_ids(anonymous_user_acl, thread) == [
+        thread.first_post_id
+    ]
+
+
+def test_visible_posts_ids_include_user_unapproved_posts(user, user_acl, thread):
+    post = reply_thread(thread, poster=user, is_unapproved=True)
+    thread.synchronize()
+
+    posts_ids = postsindex.get_visible_posts_ids(user_acl, thread)
+    assert posts_ids == [thread.first_post_id, post.pk]
+
+
+def test_visible_posts_ids_include_unapproved_posts_for_moderator(
+    moderator_acl, thread
+):
+    post = reply_thread(thread, is_unapproved=True)
+    thread.synchronize()
+
+    posts_ids = postsindex.get_visible_posts_ids(moderator_acl, thread)
+    assert posts_ids == [thread.first_post_id, post.pk]
+
+
+def test_index_is_cached(django_assert_num_queries, user_acl, thread):
+    postsindex.get_visible_posts_ids(user_acl, thread)
+    with django_assert_num_queries(0):
+        postsindex.get_visible_posts_ids(user_acl, thread)
+
+
+def test_index_is_rebuilt_when_it_doesnt_agree_with_thread(
+    index_cache, user_acl, thread
+):
+    postsindex.get_visible_posts_ids(user_acl, thread)
+    index_cache.set(
+        postsindex.get_cache_key(thread.pk), {"approved": [], "unapproved": []}
+    )
+
+    posts_ids = postsindex.get_visible_posts_ids(user_acl, thread)
+    assert posts_ids == [thread.first_post_id]
+
+
+def test_index_is_cached_with_timeout(index_cache, user_acl, thread, settings):
+    settings.MISAGO_POSTS_INDEX_CACHE_TIMEOUT = 60
+    postsindex.get_visible_posts_ids(user_acl, thread)
+
+    cache_key = index_cache.make_key(postsindex.get_cache_key(thread.pk))
+    assert index_cache._expire_info[cache_key] is not None
+
+
+@pytest.fixture
+def post_reply(mocker):
+    # posting doesn't synchronize thread like reply_thread does
+    mocker.patch("misago.threads.synchronization.clear_posts_indexes")
+    return reply_thread
+
+
+def test_reply_is_added_to_cached_index(
+    django_assert_num_queries, user_acl, thread, post_reply
+):
+    postsindex.get_visible_posts_ids(user_acl, thread)
+    post = post_reply(thread)
+
+    with django_assert_num_queries(0):
+        posts_ids = postsindex.get_visible_posts_ids(user_acl, thread)
+    assert posts_ids == [thread.first_post_id, post.pk]
+
+
+def test_unapproved_reply_is_added_to_cached_index(
+    django_assert_num_queries, user, user_acl, thread, post_reply
+):
+    postsindex.get_visible_posts_ids(user_acl, thread)
+    post = post_reply(thread, poster=user, is_unapproved=True)
+
+    with django_assert_num_queries(0):
+        posts_ids = postsindex.get_visible_posts_ids(user_acl, thread)
+    assert posts_ids == [thread.first_post_id, post.pk]
+
+
+def test_approved_post_is_moved_in_cached_index(moderator_acl, thread):
+    post = reply_thread(thread, is_unapproved=True)
+    thread.synchronize()
+    postsindex.get_visible_posts_ids(moderator_acl, thread)
+
+    post.is_unapproved = False
+    post.save(update_fields=["is_unapproved"])
+
+    index = postsindex.get_posts_index(thread)
+    assert index["approved"] == [thread.first_post_id, post.pk]
+    assert index["unapproved"] == []
+
+
+def test_post_edit_doesnt_change_cached_index(index_cache, user_acl, thread):
+    postsindex.get_visible_posts_ids(user_acl, thread)
+    cache_key = postsindex.get_cache_key(thread.pk)
+    index_cache.set(cache_key, {"approved": [1, 2], "unapproved": []})
+
+    thread.first_post.likes = 1
+    thread.first_post.save(update_fields=["likes"])
+
+    assert index_cache.get(cache_key) == {"approved": [1, 2], "unapproved": []}
+
+
+def test_deleted_post_is_removed_from_cached_index(user_acl, thread):
+    post = reply_thread(thread)
+    postsindex.get_visible_posts_ids(user_acl, thread)
+
+    post.delete()
+    thread.synchronize()
+    index = postsindex.get_posts_index(thread)
+    assert index["approved"] == [thread.first_post_id]
+
+
+def test_index_is_cleared_when_thread_is_synchronized(moderator_acl, thread):
+    post = reply_thread(thread, is_unapproved=True)
+    reply_thread(thread, is_unapproved=True)
+    thread.synchronize()
+    thread.save()
+
+    postsindex.get_visible_posts_ids(moderator_acl, thread)
+    post.delete()
+    thread.synchronize()
+
+    assert post.pk not in postsindex.get_visible_posts_ids(moderator_acl, thread)
+
+
+def test_post_position_is_number_of_posts_up_to_post(thread):
+    posts = [thread.first_post] + [reply_thread(thread) for _ in range(3)]
+    posts_ids = [post.pk for post in posts]
+
+    assert postsindex.get_post_position(posts_ids, posts[0]) == 1
+    assert postsindex.get_post_position(posts_ids, posts[2]) == 3
+
+
+def test_event_position_is_number_of_posts_before_event(thread):
+    post = reply_thread(thread)
+    event = reply_thread(thread, is_event=True)
+    reply_thread(thread)
+
+    posts_ids = [thread.first_post_id, post.pk]
+    assert postsindex.get_post_position(posts_ids, event) == 2
@@ -14,7 +14,7 @@ class PrivateThreadReplyApiTestCase(PrivateThreadsTestCase):
         self.other_user = create_test_user("OtherUser", "otheruser@example.com")
 
     def test_reply_private_thread(self):
-        """api sets other private thread participants sync thread flag"""
+        """api increases other private thread participants unread threads counts"""
         ThreadParticipant.objects.set_owner(self.thread, self.user)
         ThreadParticipant.objects.add_participants(self.thread, [self.other_user])
 
@@ -30,9 +30,14 @@ class PrivateThreadReplyApiTestCase(PrivateThreadsTestCase):
 
         self.assertEqual(self.user.audittrail_set.count(), 1)
 
-        # valid user was flagged to sync
+        # valid user had thread marked as unread
         self.user.refresh_from_db()
-        self.assertFalse(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
+        self.assertTrue(
+            ThreadParticipant.objects.get(
+                thread=self.thread, user=self.other_user
+            ).is_unread
+        )
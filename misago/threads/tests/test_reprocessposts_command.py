@@ -0,0 +1,111 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core import management
+from django.core.management.base import CommandError
+
+from ...conf.test import override_dynamic_settings
+from ..management.commands import reprocessposts
+from ..models import Post
+from ..reprocessing import get_batches, get_posts_queryset
+from ..test import reply_thread
+
+
+def call_command(*args, **options):
+    command = reprocessposts.Command()
+
+    out = StringIO()
+    management.call_command(command, *args, stdout=out, **options)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def test_command_requires_operation(db):
+    with pytest.raises(CommandError):
+        call_command()
+
+
+def test_command_works_if_there_are_no_posts(db):
+    assert call_command("--checksums") == "No posts were found"
+
+
+def test_command_updates_posts_checksums(thread):
+    posts = [thread.first_post] + [reply_thread(thread) for _ in range(4)]
+    Post.objects.update(checksum="invalid")
+
+    assert call_command("--checksums", "--batch-size=2") == "Processed 5 posts"
+    for post in posts:
+        post.refresh_from_db()
+        assert post.is_valid
+
+
+def test_command_rebuilds_posts_search(thread):
+    post = reply_thread(thread, message="Lorem ipsum")
+    Post.objects.update(search_document="", search_vector="")
+
+    call_command("--search")
+
+    thread.first_post.refresh_from_db()
+    assert thread.title in thread.first_post.search_document
+
+    post.refresh_from_db()
+    assert post.search_document == "Lorem ipsum"
+    assert post.search_vector
+
+
+@override_dynamic_settings(forum_address="http://example.com")
+def test_command_reparses_posts(thread):
+    post = reply_thread(thread, message="Hello **world**!")
+    Post.objects.filter(id=post.id).update(parsed="", checksum="")
+
+    call_command("--reparse")
+
+    post.refresh_from_db()
+    assert post.parsed == "<p>Hello <strong>world</strong>!</p>"
+    assert post.is_valid
+
+
+@override_dynamic_settings(forum_address=None)
+def test_command_requires_forum_address_to_reparse_posts(thread):
+    with pytest.raises(CommandError):
+        call_command("--reparse")
+
+
+def test_command_resumes_from_checkpoint(tmp_path, thread):
+    post = reply_thread(thread)
+    Post.objects.update(checksum="invalid")
+
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(
+        json.dumps({"operations": ["checksums"], "last_id": thread.first_post_id})
+    )
+
+    assert call_command("--checksums", checkpoint=str(checkpoint)) == (
+        "Processed 1 posts"
+    )
+    assert not checkpoint.exists()
+
+    thread.first_post.refresh_from_db()
+    assert not thread.first_post.is_valid
+
+    post.refresh_from_db()
+    assert post.is_valid
+
+
+def test_command_rejects_checkpoint_for_other_operations(tmp_path, thread):
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"operations": ["search"], "last_id": 0}))
+
+    with pytest.raises(CommandError):
+        call_command("--checksums", checkpoint=str(checkpoint))
+
+
+def test_batches_are_ranges_of_posts_ids(thread):
+    posts = [thread.first_post] + [reply_thread(thread) for _ in range(4)]
+    batches = list(get_batches(get_posts_queryset(), 2))
+    assert batches == [
+        (posts[0].id, posts[1].id),
+        (posts[2].id, posts[3].id),
+        (posts[4].id, posts[4].id),
+    ]
+
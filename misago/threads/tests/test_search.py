@@ -1,8 +1,14 @@
+import pytest
+from django.contrib.postgres.search import SearchVector
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
 from django.urls import reverse
 
 from .. import test
 from ...categories.models import Category
+from ...conf.test import override_dynamic_settings
 from ...users.test import AuthenticatedUserTestCase
+from ..models import Post
 
 
 def index_post(post):
@@ -232,3 +238,99 @@ def test_post_search_filters_hook_is_used_by_threads_search(
             results = provider["results"]["results"]
             assert len(results) == 1
             assert results[0]["id"] == post.id
+
+
+@pytest.fixture
+def search_cache(mocker):
+    cache = LocMemCache("threads-search", {})
+    cache.clear()
+    mocker.patch("misago.threads.search.cache", cache)
+    return cache
+
+
+def get_threads_results(response):
+    for provider in response.json():
+        if provider["id"] == "threads":
+            return provider
+
+
+@override_dynamic_settings(posts_per_page=4, posts_per_page_orphans=0)
+def test_threads_search_ranks_posts_using_stored_search_vector(db, user_client, thread):
+    worse_post = test.reply_thread(thread, message="Lorem ipsum dolor met.")
+    index_post(worse_post)
+    better_post = test.reply_thread(thread, message="Lorem lorem lorem ipsum.")
+    index_post(better_post)
+
+    response = user_client.get("/api/search/threads/?q=lorem")
+    results = get_threads_results(response)["results"]["results"]
+    assert [r["id"] for r in results] == [better_post.id, worse_post.id]
+
+
+@override_settings(MISAGO_THREADS_SEARCH_RANKED_MATCHES=2)
+@override_dynamic_settings(posts_per_page=4, posts_per_page_orphans=0)
+def test_threads_search_ranks_only_newest_matches(db, user_client, thread):
+    old_post = test.reply_thread(thread, message="Lorem lorem lorem ipsum.")
+    index_post(old_post)
+    worse_post = test.reply_thread(thread, message="Lorem ipsum dolor met.")
+    index_post(worse_post)
+    better_post = test.reply_thread(thread, message="Lorem lorem ipsum.")
+    index_post(better_post)
+
+    response = user_client.get("/api/search/threads/?q=lorem")
+    results = get_threads_results(response)["results"]["results"]
+    assert [r["id"] for r in results] == [better_post.id, worse_post.id]
+
+
+@override_dynamic_settings(posts_per_page=4, posts_per_page_orphans=0)
+def test_threads_search_serves_next_pages_from_cached_results(
+    db, user_client, thread, search_cache, django_assert_max_num_queries
+):
+    posts = []
+    for i in range(6):
+        post = test.reply_thread(thread, message="Lorem ipsum %s dolor met." % i)
+        index_post(post)
+        posts.append(post)
+
+    response = user_client.get("/api/search/threads/?q=ipsum")
+    first_page = get_threads_results(response)["results"]
+    assert first_page["count"] == 6
+    assert first_page["pages"] == 2
+
+    # make search return no results if its ran for second page
+    posts_queryset = Post.objects.filter(id__in=[p.id for p in posts])
+    posts_queryset.update(search_document="")
+    posts_queryset.update(search_vector=SearchVector("search_document"))
+
+    response = user_client.get("/api/search/threads/?q=ipsum&page=2")
+    second_page = get_threads_results(response)["results"]
+    assert second_page["count"] == 6
+    assert len(second_page["results"]) == 2
+
+    found_posts = [r["id"] for r in first_page["results"] + second_page["results"]]
+    assert set(found_posts) == set(p.id for p in posts)
+
+
+def test_threads_search_results_are_cached_for_user_permissions(
+    db, user_client, thread, search_cache
+):
+    post = test.reply_thread(thread, message="Lorem ipsum dolor met.")
+    index_post(post)
+
+    user_client.get("/api/search/threads/?q=ipsum")
+    assert len(search_cache._cache) == 1
+
+    user_client.get("/api/search/threads/?q=dolor")
+    assert len(search_cache._cache) == 2
+
+
+def test_threads_search_reports_timings(db, user_client, thread, search_cache):
+    post = test.reply_thread(thread, message="Lorem ipsum dolor met.")
+    index_post(post)
+
+    response = user_client.get("/api/search/threads/?q=ipsum")
+    timings = get_threads_results(response)["timings"]
+    assert set(timings) == {"cache", "database"}
+
+    response = user_client.get("/api/search/?q=ipsum")
+    timings = get_threads_results(response)["timings"]
+    assert set(timings) == {"cache", "database"}
@@ -1,6 +1,17 @@
+from io import StringIO
+
+from django.core import management
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from .. import test
+from ..management.commands import synchronizeunreadprivatethreads
 from ...users.test import create_test_user
 from ..models import ThreadParticipant
+from ..unreadprivatethreads import (
+    decrease_unread_private_threads,
+    increase_unread_private_threads,
+)
 from .test_privatethreads import PrivateThreadsTestCase
 
 
@@ -55,3 +66,95 @@ class SyncUnreadPrivateThreadsTestCase(PrivateThreadsTestCase):
         self.reload_user()
         self.assertFalse(self.user.sync_unread_private_threads)
         self.assertEqual(self.user.unread_private_threads, 1)
+
+    def test_middleware_sets_participant_unread_flag(self):
+        """middleware sets participant unread flags when counting threads"""
+        self.user.sync_unread_private_threads = True
+        self.user.save()
+
+        self.client.get("/")
+
+        participant = ThreadParticipant.objects.get(thread=self.thread, user=self.user)
+        self.assertTrue(participant.is_unread)
+
+    def test_middleware_doesnt_count_threads_for_synced_user(self):
+        """middleware only reads count if user is not flagged for sync"""
+        self.user.unread_private_threads = 3
+        self.user.save()
+
+        self.client.get("/")
+
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 3)
+
+    def test_reply_increases_unread_threads_count(self):
+        """reply increases count only for participants that have read thread"""
+        increase_unread_private_threads(self.thread, exclude_user=self.other_user)
+
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 1)
+
+        self.other_user.refresh_from_db()
+        self.assertEqual(self.other_user.unread_private_threads, 0)
+
+        increase_unread_private_threads(self.thread, exclude_user=self.other_user)
+
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 1)
+
+    def test_users_are_locked_in_id_order_before_increasing_count(self):
+        """users rows are locked in same order by all replies"""
+        with CaptureQueriesContext(connection) as queries:
+            increase_unread_private_threads(self.thread, exclude_user=self.other_user)
+
+        users_table = self.user._meta.db_table
+        users_queries = [q["sql"] for q in queries if users_table in q["sql"]]
+        self.assertEqual(len(users_queries), 2)
+        self.assertTrue(users_queries[0].startswith("SELECT"))
+        self.assertIn("ORDER BY", users_queries[0])
+        self.assertTrue(users_queries[0].endswith("FOR UPDATE"))
+        self.assertTrue(users_queries[1].startswith("UPDATE"))
+
+    def test_read_decreases_unread_threads_count(self):
+        """reading thread decreases count only if thread was unread"""
+        increase_unread_private_threads(self.thread)
+        self.reload_user()
+
+        decrease_unread_private_threads(self.user, self.thread)
+        self.assertEqual(self.user.unread_private_threads, 0)
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 0)
+
+        self.user.unread_private_threads = 5
+        self.user.save()
+
+        decrease_unread_private_threads(self.user, self.thread)
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 5)
+
+    def test_reading_thread_decreases_unread_threads_count(self):
+        """post read api decreases unread threads count"""
+        increase_unread_private_threads(self.thread)
+
+        self.client.post(self.thread.last_post.get_read_api_url())
+
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 0)
+        participant = ThreadParticipant.objects.get(thread=self.thread, user=self.user)
+        self.assertFalse(participant.is_unread)
+
+    def test_command_synchronizes_users(self):
+        """command counts unread private threads of users"""
+        self.user.unread_private_threads = 5
+        self.user.save()
+
+        command = synchronizeunreadprivatethreads.Command()
+        out = StringIO()
+        management.call_command(command, stdout=out)
+        command_output = out.getvalue().splitlines()[-1].strip()
+        self.assertEqual(command_output, "Synchronized 2 users")
+
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 1)
+        participant = ThreadParticipant.objects.get(thread=self.thread, user=self.user)
+        self.assertTrue(participant.is_unread)
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from .. import test
+from ...categories.models import Category
+from ..models import Thread
+from ..synchronization import synchronize_threads
+
+
+class SynchronizeThreadsTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.get(slug="first-category")
+
+    def get_desynchronized_threads(self):
+        threads = [test.post_thread(self.category) for _ in range(3)]
+
+        test.reply_thread(threads[0])
+        test.reply_thread(threads[0], is_hidden=True)
+        test.reply_thread(threads[1], is_unapproved=True)
+        test.reply_thread(threads[1], has_reports=True, has_open_reports=True)
+        test.reply_thread(threads[2], is_event=True)
+
+        Thread.objects.update(
+            replies=0,
+            has_reported_posts=False,
+            has_open_reports=False,
+            has_unapproved_posts=False,
+            has_hidden_posts=False,
+            has_events=False,
+        )
+        return list(Thread.objects.order_by("id"))
+
+    def test_threads_are_synchronized(self):
+        """threads attributes are updated from their posts"""
+        threads = self.get_desynchronized_threads()
+        synchronize_threads(threads)
+
+        self.assertEqual(threads[0].replies, 2)
+        self.assertTrue(threads[0].has_hidden_posts)
+        self.assertFalse(threads[0].has_unapproved_posts)
+
+        self.assertEqual(threads[1].replies, 1)
+        self.assertTrue(threads[1].has_unapproved_posts)
+        self.assertTrue(threads[1].has_reported_posts)
+        self.assertTrue(threads[1].has_open_reports)
+
+        self.assertEqual(threads[2].replies, 0)
+        self.assertTrue(threads[2].has_events)
+        self.assertTrue(threads[2].last_post_is_event)
+
+        for thread in threads:
+            last_post = thread.post_set.filter(is_unapproved=False).last()
+            self.assertEqual(thread.first_post, thread.post_set.first())
+            self.assertEqual(thread.last_post, last_post)
+
+    def test_synchronized_threads_are_returned(self):
+        """only threads that have posts are returned as synchronized"""
+        threads = self.get_desynchronized_threads()
+        empty_thread = threads[1]
+        empty_thread.post_set.all().delete()
+
+        synchronized_threads = synchronize_threads(threads)
+        self.assertEqual(
+            sorted(thread.pk for thread in synchronized_threads),
+            [threads[0].pk, threads[2].pk],
+        )
+        self.assertEqual(empty_thread.replies, 0)
+        self.assertFalse(empty_thread.has_unapproved_posts)
+
+    def test_posts_indexes_are_cleared_with_single_cache_call(self):
+        """posts indexes of all threads are cleared together"""
+        threads = self.get_desynchronized_threads()
+        with patch("misago.threads.postsindex.cache") as cache:
+            synchronize_threads(threads)
+
+        cache.delete_many.assert_called_once()
+        cache.delete.assert_not_called()
+        self.assertEqual(len(cache.delete_many.call_args[0][0]), 3)
+
+    def test_threads_are_synchronized_using_constant_number_of_queries(self):
+        """number of queries doesn't grow with number of threads"""
+        threads = self.get_desynchronized_threads()
+        with self.assertNumQueries(3):
+            synchronize_threads(threads)
+
+    def test_synchronizing_no_threads_runs_no_queries(self):
+        """synchronizing empty list of threads does nothing"""
+        with self.assertNumQueries(0):
+            self.assertEqual(synchronize_threads([]), [])
@@ -40,3 +40,46 @@ class SynchronizeThreadsTests(TestCase):
 
         command_output = out.getvalue().splitlines()[-1].strip()
         self.assertEqual(command_output, "Synchronized 10 threads")
+
+    def test_threads_sync_in_batches(self):
+        """command synchronizes threads in batches"""
+        category = Category.objects.all_categories()[:1][0]
+
+        threads = [test.post_thread(category) for _ in range(5)]
+        for thread in threads:
+            test.reply_thread(thread)
+            thread.replies = 0
+            thread.save()
+
+        command = synchronizethreads.Command()
+
+        out = StringIO()
+        call_command(command, batch_size=2, stdout=out)
+
+        for thread in threads:
+            db_thread = category.thread_set.get(id=thread.id)
+            self.assertEqual(db_thread.replies, 1)
+
+        command_output = out.getvalue().splitlines()[-1].strip()
+        self.assertEqual(command_output, "Synchronized 5 threads")
+
+    def test_threads_without_posts_are_skipped(self):
+        """command doesn't save threads without posts"""
+        category = Category.objects.all_categories()[:1][0]
+
+        thread = test.post_thread(category)
+        empty_thread = test.post_thread(category)
+        empty_thread.post_set.all().delete()
+        category.thread_set.update(replies=5)
+
+        command = synchronizethreads.Command()
+
+        out = StringIO()
+        call_command(command, stdout=out)
+
+        self.assertEqual(category.thread_set.get(id=thread.id).replies, 0)
+        self.assertEqual(category.thread_set.get(id=empty_thread.id).replies, 5)
+
+        command_output = out.getvalue().splitlines()
+        self.assertIn("Skipped 1 threads without posts", command_output)
+        self.assertEqual(command_output[-1].strip(), "Synchronized 1 threads")
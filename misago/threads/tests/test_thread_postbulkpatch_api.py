@@ -231,6 +231,9 @@ class BulkPostsApproveApiTests(ThreadPostBulkPatchApiTestCase):
         self.thread.synchronize()
         self.thread.save()
 
+        self.category.synchronize()
+        self.category.save()
+
         self.assertNotIn(self.thread.last_post_id, self.ids)
 
         response = self.patch(
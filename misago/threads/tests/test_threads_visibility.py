@@ -0,0 +1,116 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..management.commands import benchmarkthreadsvisibility
+from ..permissions.threads import build_threads_visibility, get_threads_visibility
+
+
+def get_user_acl(categories, is_authenticated=True):
+    user_acl = {
+        "user_id": 1 if is_authenticated else None,
+        "is_authenticated": is_authenticated,
+        "visible_categories": list(categories),
+        "categories": categories,
+    }
+    build_threads_visibility(user_acl)
+    return user_acl
+
+
+def test_categories_with_moderator_permissions_are_fully_visible():
+    user_acl = get_user_acl(
+        {
+            1: {
+                "can_browse": 1,
+                "can_see_all_threads": 1,
+                "can_approve_content": 1,
+                "can_hide_threads": 1,
+            }
+        }
+    )
+    assert user_acl["threads_visibility"]["all"] == [1]
+
+
+def test_categories_are_grouped_by_threads_visibility():
+    user_acl = get_user_acl(
+        {
+            1: {"can_browse": 1, "can_see_all_threads": 1},
+            2: {"can_browse": 1, "can_see_all_threads": 1, "can_hide_threads": 1},
+            3: {"can_browse": 1, "can_see_all_threads": 1, "can_approve_content": 1},
+            4: {"can_browse": 1, "can_hide_threads": 1},
+            5: {"can_browse": 1},
+        }
+    )
+
+    assert user_acl["threads_visibility"] == {
+        "all": [],
+        "accepted_visible": [1],
+        "accepted": [2],
+        "visible": [3],
+        "owned": [4],
+        "owned_visible": [5],
+    }
+
+
+def test_categories_that_cant_be_browsed_are_excluded():
+    user_acl = get_user_acl({1: {"can_browse": 0, "can_see_all_threads": 1}})
+    assert not any(user_acl["threads_visibility"].values())
+
+
+def test_categories_that_arent_visible_are_excluded():
+    user_acl = get_user_acl({1: {"can_browse": 1, "can_see_all_threads": 1}})
+    user_acl["visible_categories"] = []
+    build_threads_visibility(user_acl)
+    assert not any(user_acl["threads_visibility"].values())
+
+
+def test_visibility_getter_limits_groups_to_given_categories():
+    user_acl = get_user_acl(
+        {
+            1: {"can_browse": 1, "can_see_all_threads": 1},
+            2: {"can_browse": 1, "can_see_all_threads": 1},
+        }
+    )
+    visibility = get_threads_visibility(user_acl, [2, 3])
+    assert visibility["accepted_visible"] == [2]
+
+
+def test_visibility_getter_merges_groups_for_anonymous_user():
+    user_acl = get_user_acl(
+        {
+            1: {"can_browse": 1, "can_see_all_threads": 1},
+            2: {"can_browse": 1, "can_see_all_threads": 1, "can_hide_threads": 1},
+            3: {"can_browse": 1},
+        },
+        is_authenticated=False,
+    )
+    visibility = get_threads_visibility(user_acl, [1, 2, 3])
+    assert visibility == {"accepted_visible": [1, 2]}
+
+
+def test_visibility_getter_builds_missing_visibility():
+    user_acl = get_user_acl({1: {"can_browse": 1, "can_see_all_threads": 1}})
+    del user_acl["threads_visibility"]
+
+    visibility = get_threads_visibility(user_acl, [1])
+    assert visibility["accepted_visible"] == [1]
+
+
+def test_user_acl_includes_threads_visibility(user_acl, default_category):
+    visibility = user_acl["threads_visibility"]
+    assert default_category.id in sum(visibility.values(), [])
+
+
+def test_benchmark_command_reports_timings_for_both_filters(db):
+    out = StringIO()
+    call_command(
+        benchmarkthreadsvisibility.Command(),
+        "--categories",
+        "5",
+        "--repeat",
+        "1",
+        stdout=out,
+    )
+    command_output = out.getvalue()
+    assert "baseline" in command_output
+    assert "grouped" in command_output
@@ -364,6 +364,8 @@ class ThreadEventVisibilityTests(ThreadViewTestCase):
         """moved thread event renders"""
         self.thread.category = self.thread.category.parent
         self.thread.save()
+        self.thread.category.synchronize()
+        self.thread.category.save()
 
         request = Mock(user=self.user, user_ip="127.0.0.1")
         threads_moderation.move_thread(request, self.thread, self.category)
@@ -0,0 +1,86 @@
+"""Counters of unread private threads kept on users
+
+Every thread participant has flag telling if thread is unread by them, and user's
+counter is increased when reply marks thread as unread for participant and
+decreased when participant reads it, so counter is only read on requests.
+Users flagged with sync_unread_private_threads have their threads counted and
+flags reset on next request, and synchronizeunreadprivatethreads command does
+the same for all users, fixing counters that drifted.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+
+from ..categories.models import Category
+from .models import Thread
+from .viewmodels import filter_read_threads_queryset
+
+User = get_user_model()
+
+
+def increase_unread_private_threads(thread, exclude_user=None):
+    """marks thread as unread for participants that have read it"""
+    with transaction.atomic():
+        participants = thread.threadparticipant_set.filter(is_unread=False)
+        if exclude_user:
+            participants = participants.exclude(user=exclude_user)
+
+        # rows are locked in same order by all requests, so they don't deadlock
+        users_ids = list(
+            participants.select_for_update()
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+        )
+        if not users_ids:
+            return
+
+        thread.threadparticipant_set.filter(user_id__in=users_ids).update(
+            is_unread=True
+        )
+
+        users = User.objects.filter(id__in=users_ids)
+        list(users.select_for_update().order_by("id").values_list("id", flat=True))
+        users.update(unread_private_threads=F("unread_private_threads") + 1)
+
+
+def decrease_unread_private_threads(user, thread):
+    """marks thread as read for participant"""
+    participant = thread.threadparticipant_set.filter(user=user, is_unread=True)
+    if not participant.update(is_unread=False):
+        return
+
+    User.objects.filter(id=user.id, unread_private_threads__gt=0).update(
+        unread_private_threads=F("unread_private_threads") - 1
+    )
+    if user.unread_private_threads:
+        user.unread_private_threads -= 1
+
+
+def sync_unread_private_threads(request):
+    """counts user's unread private threads and resets participant flags"""
+    user = request.user
+
+    category = Category.objects.private_threads()
+    threads = Thread.objects.filter(
+        category=category, id__in=user.threadparticipant_set.values("thread_id")
+    )
+
+    new_threads = filter_read_threads_queryset(request, [category], "new", threads)
+    unread_threads = filter_read_threads_queryset(
+        request, [category], "unread", threads
+    )
+
+    unread_threads_ids = set(new_threads.values_list("id", flat=True))
+    unread_threads_ids.update(unread_threads.values_list("id", flat=True))
+
+    participants = user.threadparticipant_set
+    participants.filter(thread_id__in=unread_threads_ids, is_unread=False).update(
+        is_unread=True
+    )
+    participants.exclude(thread_id__in=unread_threads_ids).filter(
+        is_unread=True
+    ).update(is_unread=False)
+
+    user.unread_private_threads = len(unread_threads_ids)
+    user.sync_unread_private_threads = False
+    user.save(update_fields=["unread_private_threads", "sync_unread_private_threads"])
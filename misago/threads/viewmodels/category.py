@@ -1,9 +1,10 @@
 from django.http import Http404
 
 from ...acl.objectacl import add_acl_to_obj
-from ...categories.models import Category
+from ...categories import PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
 from ...categories.permissions import allow_browse_category, allow_see_category
 from ...categories.serializers import CategorySerializer
+from ...categories.snapshot import get_categories_snapshot
 from ...core.shortcuts import validate_slug
 from ...core.viewmodel import ViewModel as BaseViewModel
 from ..permissions import allow_use_private_threads
@@ -52,11 +53,15 @@ class ViewModel(BaseViewModel):
 
 class ThreadsRootCategory(ViewModel):
     def get_categories(self, request):
-        return [Category.objects.root_category()] + list(
-            Category.objects.all_categories()
-            .filter(id__in=request.user_acl["visible_categories"])
-            .select_related("parent")
-        )
+        snapshot = get_categories_snapshot(request.cache_versions)
+        root_id = snapshot.get_special_id(THREADS_ROOT_NAME)
+        visible_categories = set(request.user_acl["visible_categories"])
+        categories_ids = [
+            category_id
+            for category_id in snapshot.get_descendants_ids(root_id)
+            if category_id in visible_categories
+        ]
+        return snapshot.get_categories([root_id] + categories_ids)
 
 
 class ThreadsCategory(ThreadsRootCategory):
@@ -81,7 +86,10 @@ class ThreadsCategory(ThreadsRootCategory):
 
 class PrivateThreadsCategory(ViewModel):
     def get_categories(self, request):
-        return [Category.objects.private_threads()]
+        snapshot = get_categories_snapshot(request.cache_versions)
+        return [
+            snapshot.get_category(snapshot.get_special_id(PRIVATE_THREADS_ROOT_NAME))
+        ]
 
     def get_category(self, request, categories, **kwargs):
         allow_use_private_threads(request.user_acl)
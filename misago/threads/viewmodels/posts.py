@@ -1,9 +1,12 @@
+from functools import partial
+
 from ...acl.objectacl import add_acl_to_obj
 from ...core.shortcuts import paginate, pagination_dict
 from ...readtracker.poststracker import make_read_aware
 from ...users.online.utils import make_users_status_aware
-from ..paginator import PostsPaginator
+from ..paginator import KeysetPostsPaginator, PostsPaginator
 from ..permissions import exclude_invisible_posts
+from ..postsindex import get_visible_posts_ids, is_paginating_by_keyset
 from ..serializers import PostSerializer
 from ..utils import add_likes_to_posts
 
@@ -19,10 +22,18 @@ class ViewModel:
 
         posts_queryset = self.get_posts_queryset(request, thread_model)
 
+        if is_paginating_by_keyset():
+            paginator_class = partial(
+                KeysetPostsPaginator,
+                posts_ids=get_visible_posts_ids(request.user_acl, thread_model),
+            )
+        else:
+            paginator_class = PostsPaginator
+
         posts_limit = request.settings.posts_per_page
         posts_orphans = request.settings.posts_per_page_orphans
         list_page = paginate(
-            posts_queryset, page, posts_limit, posts_orphans, paginator=PostsPaginator
+            posts_queryset, page, posts_limit, posts_orphans, paginator=paginator_class
         )
         paginator = pagination_dict(list_page)
 
@@ -3,7 +3,7 @@ from django.utils.translation import gettext as _
 
 from ...acl.objectacl import add_acl_to_obj
 from ...categories import PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
-from ...categories.models import Category
+from ...categories.snapshot import get_categories_snapshot
 from ...core.shortcuts import validate_slug
 from ...core.viewmodel import ViewModel as BaseViewModel
 from ...readtracker.threadstracker import make_read_aware
@@ -44,7 +44,7 @@ class ViewModel(BaseViewModel):
         model = self.get_thread(request, pk, slug)
 
         if path_aware:
-            model.path = self.get_thread_path(model.category)
+            model.path = self.get_thread_path(request, model.category)
 
         add_acl_to_obj(request.user_acl, model.category)
         add_acl_to_obj(request.user_acl, model)
@@ -74,14 +74,12 @@ class ViewModel(BaseViewModel):
             "Thread view model has to implement get_thread(request, pk, slug=None)"
         )
 
-    def get_thread_path(self, category):
+    def get_thread_path(self, request, category):
         thread_path = []
 
         if category.level:
-            categories = Category.objects.filter(
-                tree_id=category.tree_id, lft__lte=category.lft, rght__gte=category.rght
-            ).order_by("level")
-            thread_path = list(categories)
+            snapshot = get_categories_snapshot(request.cache_versions)
+            thread_path = snapshot.get_ancestors(category.pk)
         else:
             thread_path = [category]
 
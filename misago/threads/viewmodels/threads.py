@@ -6,9 +6,11 @@ from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
 
 from ...acl.objectacl import add_acl_to_obj
+from ...categories.models import Category
 from ...core.cursorpagination import get_page
-from ...readtracker import threadstracker
+from ...readtracker import readmarkers, threadstracker
 from ...readtracker.cutoffdate import get_cutoff_date
+from ...readtracker.unreadsummary import get_unread_summary
 from ..models import Post, Thread
 from ..participants import make_participants_aware
 from ..permissions import exclude_invisible_posts, exclude_invisible_threads
@@ -149,6 +151,20 @@ class ViewModel:
 
 
 class ForumThreads(ViewModel):
+    def get_base_queryset(self, request, threads_categories, list_type):
+        if list_type in ("new", "unread"):
+            # categories tree is cached, so update categories state before
+            # skipping categories that user's unread summary reports as read
+            update_categories_state(threads_categories)
+            unread_summary = get_unread_summary(request, threads_categories)
+            threads_categories = [
+                c for c in threads_categories if unread_summary.get(c.pk)
+            ]
+            if not threads_categories:
+                return Thread.objects.none()
+
+        return super().get_base_queryset(request, threads_categories, list_type)
+
     def get_pinned_threads(self, queryset, category, threads_categories):
         if category.level:
             return list(queryset.filter(weight=2)) + list(
@@ -185,6 +201,18 @@ class PrivateThreads(ViewModel):
         make_participants_aware(request.user, threads)
 
 
+def update_categories_state(categories):
+    categories_dict = {c.pk: c for c in categories}
+    queryset = Category.objects.filter(id__in=categories_dict).values_list(
+        "id", "last_post_on", "threads", "posts"
+    )
+    for category_id, last_post_on, threads, posts in queryset:
+        category = categories_dict[category_id]
+        category.last_post_on = last_post_on
+        category.threads = threads
+        category.posts = posts
+
+
 def get_threads_queryset(request, categories, list_type):
     queryset = exclude_invisible_threads(request.user_acl, categories, Thread.objects)
     if list_type == "all":
@@ -209,6 +237,13 @@ def filter_read_threads_queryset(request, categories, list_type, queryset):
     # grab cutoffs for categories
     cutoff_date = get_cutoff_date(request.settings, request.user)
 
+    if readmarkers.is_tracking_threads():
+        queryset = queryset.filter(last_post_on__gt=cutoff_date)
+        if list_type == "new":
+            return readmarkers.filter_new_threads(request.user, queryset)
+        if list_type == "unread":
+            return readmarkers.filter_unread_threads(request.user, queryset)
+
     visible_posts = Post.objects.filter(posted_on__gt=cutoff_date)
     visible_posts = exclude_invisible_posts(request.user_acl, categories, visible_posts)
 
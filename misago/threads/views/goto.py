@@ -7,8 +7,14 @@ from django.utils.translation import gettext as _
 from django.views import View
 
 from ...conf import settings
+from ...readtracker import readmarkers
 from ...readtracker.cutoffdate import get_cutoff_date
 from ..permissions import exclude_invisible_posts
+from ..postsindex import (
+    get_post_position,
+    get_visible_posts_ids,
+    is_paginating_by_keyset,
+)
 from ..viewmodels import ForumThread, PrivateThread
 
 
@@ -26,7 +32,7 @@ class GotoView(View):
         target_post = self.get_target_post(
             request.user, thread, posts_queryset.order_by("id"), **kwargs
         )
-        target_page = self.compute_post_page(target_post, posts_queryset)
+        target_page = self.compute_post_page(thread, target_post, posts_queryset)
 
         return self.get_redirect(thread, target_post, target_page)
 
@@ -41,19 +47,24 @@ class GotoView(View):
             "goto views should define their own get_target_post method"
         )
 
-    def compute_post_page(self, target_post, posts_queryset):
-        # filter out events, order queryset
-        posts_queryset = posts_queryset.filter(is_event=False).order_by("id")
-        thread_length = posts_queryset.count()
-
-        # is target an event?
-        if target_post.is_event:
-            target_event = target_post
-            previous_posts = posts_queryset.filter(id__lt=target_event.id)
+    def compute_post_page(self, thread, target_post, posts_queryset):
+        if is_paginating_by_keyset():
+            posts_ids = get_visible_posts_ids(self.request.user_acl, thread)
+            thread_length = len(posts_ids)
+            post_position = get_post_position(posts_ids, target_post)
         else:
-            previous_posts = posts_queryset.filter(id__lte=target_post.id)
+            # filter out events, order queryset
+            posts_queryset = posts_queryset.filter(is_event=False).order_by("id")
+            thread_length = posts_queryset.count()
+
+            # is target an event?
+            if target_post.is_event:
+                target_event = target_post
+                previous_posts = posts_queryset.filter(id__lt=target_event.id)
+            else:
+                previous_posts = posts_queryset.filter(id__lte=target_post.id)
 
-        post_position = previous_posts.count()
+            post_position = previous_posts.count()
 
         per_page = self.request.settings.posts_per_page - 1
         orphans = self.request.settings.posts_per_page_orphans
@@ -88,17 +99,20 @@ class ThreadGotoLastView(GotoView):
 
 
 class GetFirstUnreadPostMixin:
-    def get_first_unread_post(self, user, posts_queryset):
+    def get_first_unread_post(self, user, thread, posts_queryset):
         if user.is_authenticated:
             cutoff_date = get_cutoff_date(self.request.settings, user)
             expired_posts = Q(posted_on__lt=cutoff_date)
-            read_posts = Q(id__in=user.postread_set.values("post"))
 
-            first_unread = (
-                posts_queryset.exclude(expired_posts | read_posts)
-                .order_by("id")
-                .first()
-            )
+            if readmarkers.is_tracking_threads():
+                unread_posts = readmarkers.exclude_read_posts(
+                    user, thread, posts_queryset.exclude(expired_posts)
+                )
+            else:
+                read_posts = Q(id__in=user.postread_set.values("post"))
+                unread_posts = posts_queryset.exclude(expired_posts | read_posts)
+
+            first_unread = unread_posts.order_by("id").first()
 
             if first_unread:
                 return first_unread
@@ -110,7 +124,7 @@ class ThreadGotoNewView(GotoView, GetFirstUnreadPostMixin):
     thread = ForumThread
 
     def get_target_post(self, user, thread, posts_queryset, **kwargs):
-        return self.get_first_unread_post(user, posts_queryset)
+        return self.get_first_unread_post(user, thread, posts_queryset)
 
 
 class ThreadGotoBestAnswerView(GotoView):
@@ -159,4 +173,4 @@ class PrivateThreadGotoNewView(GotoView, GetFirstUnreadPostMixin):
     thread = PrivateThread
 
     def get_target_post(self, user, thread, posts_queryset, **kwargs):
-        return self.get_first_unread_post(user, posts_queryset)
+        return self.get_first_unread_post(user, thread, posts_queryset)
@@ -1,3 +1,5 @@
 default_app_config = "misago.users.apps.MisagoUsersConfig"
 
 BANS_CACHE = "bans"
+
+USERS_SEARCH_CACHE = "users_search"
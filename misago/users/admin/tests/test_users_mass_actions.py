@@ -2,7 +2,9 @@ from unittest.mock import call
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
 from django.core import mail
+from django.test import override_settings
 
 from ... import BANS_CACHE
 from ....cache.test import assert_invalidates_cache
@@ -10,6 +12,7 @@ from ....test import assert_contains, assert_has_error_message, assert_not_conta
 from ...datadownloads import request_user_data_download
 from ...models import Ban, DataDownload, DeletedUser
 from ...test import create_test_user
+from ..views.users import UsersList
 
 User = get_user_model()
 
@@ -198,6 +201,53 @@ def test_mass_action_records_users_deletion_by_staff(admin_client, users_admin_l
     assert deleted_count == len(users)
 
 
+def test_deleting_users_in_chunks_sets_single_success_message(
+    admin_client, users_admin_link
+):
+    users = create_multiple_users()
+    response = admin_client.post(
+        users_admin_link,
+        data={"action": "delete_accounts", "selected_items": [u.id for u in users]},
+    )
+
+    messages = list(get_messages(response.wsgi_request))
+    assert [m.message for m in messages] == ["Selected users have been deleted."]
+
+
+@override_settings(MISAGO_ADMIN_DELETE_USERS_CHUNK_SIZE=2)
+def test_users_are_deleted_in_chunks_of_size_set_in_setting(
+    mocker, admin_client, users_admin_link
+):
+    chunks = []
+    mocker.patch.object(
+        UsersList,
+        "action_delete_accounts",
+        side_effect=lambda request, users: chunks.append(len(users)),
+    )
+
+    users = create_multiple_users()
+    admin_client.post(
+        users_admin_link,
+        data={"action": "delete_accounts", "selected_items": [u.id for u in users]},
+    )
+    assert chunks == [2, 2, 1]
+
+
+def test_delete_users_mass_action_deletes_no_users_if_one_of_them_is_invalid(
+    admin_client, users_admin_link
+):
+    users = create_multiple_users()
+    users.append(create_test_user("Staff", "staff@example.com", is_staff=True))
+    response = admin_client.post(
+        users_admin_link,
+        data={"action": "delete_accounts", "selected_items": [u.id for u in users]},
+    )
+    assert_has_error_message(response)
+
+    for user in users:
+        user.refresh_from_db()
+
+
 def test_delete_users_mass_action_fails_if_user_tries_to_delete_themselves(
     admin_client, users_admin_link, superuser
 ):
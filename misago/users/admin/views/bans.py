@@ -20,6 +20,7 @@ class BanAdmin(generic.AdminBaseMixin):
 
 class BansList(BanAdmin, generic.ListView):
     items_per_page = 30
+    keyset_pagination = True
     ordering = [
         ("-id", _("From newest")),
         ("id", _("From oldest")),
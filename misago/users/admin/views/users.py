@@ -9,6 +9,7 @@ from ....acl.useracl import get_user_acl
 from ....admin.auth import authorize_admin
 from ....admin.views import generic
 from ....categories.models import Category
+from ....conf import settings
 from ....core.mail import mail_users
 from ....core.pgutils import chunk_queryset
 from ....threads.models import Thread
@@ -59,6 +60,7 @@ class UserAdmin(generic.AdminBaseMixin):
 
 class UsersList(UserAdmin, generic.ListView):
     items_per_page = 24
+    keyset_pagination = True
     ordering = [
         ("-id", _("From newest")),
         ("id", _("From oldest")),
@@ -77,6 +79,7 @@ class UsersList(UserAdmin, generic.ListView):
             "action": "delete_accounts",
             "name": _("Delete accounts"),
             "confirmation": _("Are you sure you want to delete selected users?"),
+            "success_message": _("Selected users have been deleted."),
         },
         {
             "action": "delete_all",
@@ -96,6 +99,11 @@ class UsersList(UserAdmin, generic.ListView):
     def get_filter_form(self, request):
         return create_filter_users_form()
 
+    def get_mass_action_chunk_size(self, action):
+        if action["action"] == "delete_accounts":
+            return settings.MISAGO_ADMIN_DELETE_USERS_CHUNK_SIZE
+        return super().get_mass_action_chunk_size(action)
+
     def action_activate(self, request, users):
         inactive_users = []
         for user in users:
@@ -208,7 +216,7 @@ class UsersList(UserAdmin, generic.ListView):
             request, _("Data download requests have been placed for selected users.")
         )
 
-    def action_delete_accounts(self, request, users):
+    def validate_delete_accounts(self, request, users):
         for user in users:
             if user == request.user:
                 raise generic.MassActionError(_("You can't delete yourself."))
@@ -218,12 +226,11 @@ class UsersList(UserAdmin, generic.ListView):
                 }
                 raise generic.MassActionError(message)
 
+    def action_delete_accounts(self, request, users):
         for user in users:
             user.delete(anonymous_username=request.settings.anonymous_username)
             record_user_deleted_by_staff()
 
-        messages.success(request, _("Selected users have been deleted."))
-
     def action_delete_all(self, request, users):
         for user in users:
             if user == request.user:
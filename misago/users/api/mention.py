@@ -4,6 +4,7 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from ...conf import settings
+from ..searchengine import find_users
 
 User = get_user_model()
 
@@ -14,11 +15,10 @@ def mention_suggestions(request):
 
     query = request.query_params.get("q", "").lower().strip()[:100]
     if query:
-        queryset = User.objects.filter(slug__startswith=query, is_active=True).order_by(
-            "slug"
-        )[:10]
+        queryset = User.objects.only("username", "slug", "avatars")
+        users = find_users(request.cache_versions, queryset, query, 10)
 
-        for user in queryset:
+        for user in users:
             try:
                 avatar = user.avatars[-1]["url"]
             except IndexError:
@@ -336,9 +336,11 @@ class UserViewSet(viewsets.GenericViewSet):
                         post.thread.synchronize()
                         post.thread.save()
 
+                    # hide_thread already updated counters, hidden posts are
+                    # still counted in threads replies
                     categories = Category.objects.filter(id__in=categories_to_sync)
                     for category in categories.iterator():
-                        category.synchronize()
+                        category.update_last_thread()
                         category.save()
 
                 profile.delete(anonymous_username=request.settings.anonymous_username)
@@ -6,6 +6,7 @@ to use validate_X_banned validators
 """
 from datetime import timedelta
 
+from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
@@ -14,6 +15,8 @@ from .models import Ban, BanCache
 
 CACHE_SESSION_KEY = "misago_ip_check"
 
+User = get_user_model()
+
 
 def get_username_ban(username, registration_only=False):
     try:
@@ -56,28 +59,118 @@ def get_user_ban(user, cache_versions):
         return user.ban_cache
 
 
+def get_users_bans(users, cache_versions):
+    """
+    Batched version of get_user_ban, returning dict of bans for banned users
+
+    Ban caches that weren't loaded on users are fetched with single query, and
+    stale caches are refreshed using single bans query and saved in bulk.
+    """
+    users_ban_caches = _get_users_ban_caches(users)
+
+    stale_caches = []
+    for user in users:
+        ban_cache = users_ban_caches[user.pk]
+        if ban_cache._state.adding or not ban_cache.is_valid(cache_versions):
+            stale_caches.append((user, ban_cache))
+
+    if stale_caches:
+        _set_users_ban_caches(stale_caches, cache_versions)
+
+    return {
+        user_id: ban_cache
+        for user_id, ban_cache in users_ban_caches.items()
+        if ban_cache.ban
+    }
+
+
+def _get_users_ban_caches(users):
+    users_ban_caches = {}
+    users_to_fetch = {}
+
+    for user in users:
+        if User.ban_cache.is_cached(user):
+            try:
+                users_ban_caches[user.pk] = user.ban_cache
+            except BanCache.DoesNotExist:
+                user.ban_cache = BanCache(user=user)
+                users_ban_caches[user.pk] = user.ban_cache
+        else:
+            users_to_fetch[user.pk] = user
+
+    if users_to_fetch:
+        for ban_cache in BanCache.objects.filter(user__in=users_to_fetch):
+            users_to_fetch[ban_cache.user_id].ban_cache = ban_cache
+            users_ban_caches[ban_cache.user_id] = ban_cache
+
+        for user_id, user in users_to_fetch.items():
+            if user_id not in users_ban_caches:
+                user.ban_cache = BanCache(user=user)
+                users_ban_caches[user_id] = user.ban_cache
+
+    return users_ban_caches
+
+
+def _set_users_ban_caches(users_ban_caches, cache_versions):
+    bans = Ban.objects.filter(
+        registration_only=False, check_type__in=[Ban.USERNAME, Ban.EMAIL]
+    )
+    bans = [ban for ban in bans.order_by("-id") if not ban.is_expired]
+
+    for user, ban_cache in users_ban_caches:
+        user_ban = None
+        for ban in bans:
+            if ban.check_type == Ban.USERNAME:
+                value = user.username
+            else:
+                value = user.email
+            if value and ban.check_value(value):
+                user_ban = ban
+                break
+
+        _update_ban_cache(ban_cache, user_ban, cache_versions)
+
+    ban_caches = [ban_cache for _, ban_cache in users_ban_caches]
+    BanCache.objects.bulk_create(
+        [c for c in ban_caches if c._state.adding], ignore_conflicts=True
+    )
+    BanCache.objects.bulk_update(
+        [c for c in ban_caches if not c._state.adding],
+        ["ban", "cache_version", "user_message", "staff_message", "expires_on"],
+    )
+
+    for ban_cache in ban_caches:
+        ban_cache._state.adding = False
+
+
 def _set_user_ban_cache(user, cache_versions):
     ban_cache = user.ban_cache
-    ban_cache.cache_version = cache_versions[BANS_CACHE]
 
     try:
         user_ban = Ban.objects.get_ban(
             username=user.username, email=user.email, registration_only=False
         )
+    except Ban.DoesNotExist:
+        user_ban = None
 
-        ban_cache.ban = user_ban
+    _update_ban_cache(ban_cache, user_ban, cache_versions)
+    ban_cache.save()
+    return ban_cache
+
+
+def _update_ban_cache(ban_cache, user_ban, cache_versions):
+    ban_cache.cache_version = cache_versions[BANS_CACHE]
+    ban_cache.ban = user_ban
+
+    if user_ban:
         ban_cache.expires_on = user_ban.expires_on
         ban_cache.user_message = user_ban.user_message
         ban_cache.staff_message = user_ban.staff_message
-    except Ban.DoesNotExist:
-        ban_cache.ban = None
+    else:
         ban_cache.expires_on = None
         ban_cache.user_message = None
         ban_cache.staff_message = None
 
-    ban_cache.save()
-    return ban_cache
-
 
 def get_request_ip_ban(request):
     """
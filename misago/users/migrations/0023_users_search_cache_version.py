@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from .. import USERS_SEARCH_CACHE
+from ...cache.operations import StartCacheVersioning
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("misago_users", "0022_deleteduser"),
+        ("misago_cache", "0001_initial"),
+    ]
+
+    operations = [StartCacheVersioning(USERS_SEARCH_CACHE)]
@@ -0,0 +1,59 @@
+from django.db import DatabaseError, migrations, transaction
+
+INDEX_NAME = "misago_users_user_slug_trgm"
+
+
+def create_trigram_index(apps, schema_editor):
+    # Trigram index is optional, skip it if pg_trgm extension can't be used
+    if not enable_trigram_extension(schema_editor):
+        return
+
+    # index that failed to build concurrently is left invalid, build it again
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(%s) "
+            "AND NOT indisvalid",
+            [INDEX_NAME],
+        )
+        if cursor.fetchone():
+            drop_trigram_index(apps, schema_editor)
+
+    # build index concurrently, so it doesn't lock writes to users table
+    schema_editor.execute(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS %s ON misago_users_user "
+        "USING gin (slug gin_trgm_ops)" % INDEX_NAME
+    )
+
+
+def enable_trigram_extension(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone():
+            return True
+
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if not cursor.fetchone():
+            return False
+
+    # creating extension may require privileges database role doesn't have,
+    # try it in savepoint so failure doesn't abort the migration
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return False
+
+    return True
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS %s" % INDEX_NAME)
+
+
+class Migration(migrations.Migration):
+    # indexes can't be created concurrently inside transaction
+    atomic = False
+
+    dependencies = [("misago_users", "0023_users_search_cache_version")]
+
+    operations = [migrations.RunPython(create_trigram_index, drop_trigram_index)]
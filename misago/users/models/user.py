@@ -242,6 +242,23 @@ class User(AbstractBaseUser, PermissionsMixin):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._search_index_state = user.get_search_index_state()
+        return user
+
+    def get_search_index_state(self):
+        """Returns values of fields stored in users search index"""
+        return (self.__dict__.get("slug"), self.__dict__.get("is_active"))
+
+    def update_search_index_state(self):
+        """Remembers saved values of indexed fields, returning True if they changed"""
+        state = self.get_search_index_state()
+        changed = state != getattr(self, "_search_index_state", None)
+        self._search_index_state = state
+        return changed
+
     def clean(self):
         self.username = self.normalize_username(self.username)
         self.email = UserManager.normalize_email(self.email)
@@ -1,8 +1,35 @@
+"""Tracking users presence on site
+
+Users last clicks are not saved to database on every request. Click is skipped
+if previous one was made less than MISAGO_ONLINE_TRACKER_GRANULARITY seconds
+ago, and other clicks are buffered in process memory and written to database
+with single UPDATE every MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL seconds. Buffered
+clicks are also stored in cache, so other processes can read them before flush.
+Process exiting saves clicks left in its buffer.
+"""
+import atexit
+import logging
+import time
+from threading import Lock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import Case, DateTimeField, F, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from rest_framework.request import Request
 
+from ...conf import settings
 from ..models import Online
 
+LAST_CLICK_CACHE_TIMEOUT = 300
+
+logger = logging.getLogger("misago.users.online.tracker")
+
+_buffer = {}
+_buffer_lock = Lock()
+_last_flush = time.time()
+
 
 def mute_tracker(request):
     request._misago_online_tracker = None
@@ -16,14 +43,81 @@ def start_tracking(request, user):
 
 
 def update_tracker(request, tracker):
-    tracker.last_click = timezone.now()
+    now = timezone.now()
+    last_click = max(
+        tracker.last_click, _buffer.get(tracker.user_id, tracker.last_click)
+    )
+    if (now - last_click).total_seconds() >= settings.MISAGO_ONLINE_TRACKER_GRANULARITY:
+        tracker.last_click = now
+
+        if settings.MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL:
+            cache.set(get_cache_key(tracker.user_id), now, LAST_CLICK_CACHE_TIMEOUT)
+            with _buffer_lock:
+                _buffer[tracker.user_id] = now
+        else:
+            tracker.save(update_fields=["last_click"])
+
+    # skipped clicks flush buffer too, or it could outlive its cache entries
+    flush_buffer_if_due()
+
+
+def flush_buffer_if_due():
+    flush_interval = settings.MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL
+    if flush_interval and time.time() - _last_flush >= flush_interval:
+        flush_buffer()
+
+
+def flush_buffer():
+    """Saves buffered last clicks to database with single UPDATE query"""
+    global _last_flush
 
-    tracker.save(update_fields=["last_click"])
+    with _buffer_lock:
+        last_clicks = _buffer.copy()
+        _buffer.clear()
+        _last_flush = time.time()
+
+    if last_clicks:
+        buffered_last_click = Case(
+            *[When(user_id=k, then=Value(v)) for k, v in last_clicks.items()],
+            output_field=DateTimeField()
+        )
+        # other processes could already save later click
+        Online.objects.filter(user_id__in=last_clicks).update(
+            last_click=Greatest(F("last_click"), buffered_last_click)
+        )
+
+
+@atexit.register
+def flush_buffer_on_exit():
+    """Saves clicks buffered by process when it exits"""
+    if not _buffer:
+        return
+
+    try:
+        flush_buffer()
+    except DatabaseError:
+        logger.exception("Buffered last clicks could not be saved on exit")
+
+
+def get_buffered_last_clicks(users_ids):
+    """Returns dict with last clicks of users that weren't saved to database yet"""
+    if not settings.MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL or not users_ids:
+        return {}
+
+    cache_keys = {get_cache_key(user_id): user_id for user_id in users_ids}
+    return {
+        cache_keys[key]: last_click
+        for key, last_click in cache.get_many(cache_keys).items()
+    }
 
 
 def stop_tracking(request, tracker):
+    with _buffer_lock:
+        last_click = _buffer.pop(tracker.user_id, tracker.last_click)
+    cache.delete(get_cache_key(tracker.user_id))
+
     user = tracker.user
-    user.last_login = tracker.last_click
+    user.last_login = max(tracker.last_click, last_click)
     user.save(update_fields=["last_login"])
 
     tracker.delete()
@@ -33,3 +127,7 @@ def clear_tracking(request):
     if isinstance(request, Request):
         request = request._request  # Fugly unwrap restframework's request
     request._misago_online_tracker = None
+
+
+def get_cache_key(user_id):
+    return "online_last_click_%s" % user_id
@@ -1,33 +1,74 @@
 from datetime import timedelta
 
+from django.contrib.auth import get_user_model
 from django.utils import timezone
 
-from ..bans import get_user_ban
-from ..models import BanCache, Online
+from ..bans import get_user_ban, get_users_bans
+from ..models import Online
+from .tracker import get_buffered_last_clicks
 
 ACTIVITY_CUTOFF = timedelta(minutes=2)
 
+User = get_user_model()
 
-def make_users_status_aware(request, users, fetch_state=False):
-    users_dict = {}
+
+def make_users_status_aware(request, users):
+    users = list(users)
+    users_bans = get_users_bans(users, request.cache_versions)
+    online_trackers = get_users_online_trackers(users)
+
+    # Fill user states
     for user in users:
-        users_dict[user.pk] = user
+        user.status = build_user_status(
+            request, user, users_bans.get(user.pk), online_trackers.get(user.pk)
+        )
 
-    if fetch_state:
-        # Fill ban cache on users
-        for ban_cache in BanCache.objects.filter(user__in=users_dict.keys()):
-            users_dict[ban_cache.user_id].ban_cache = ban_cache
 
-        # Fill user online trackers
-        for online_tracker in Online.objects.filter(user__in=users_dict.keys()):
-            users_dict[online_tracker.user_id].online_tracker = online_tracker
+def get_users_online_trackers(users):
+    online_trackers = {}
+    users_to_fetch = {}
 
-    # Fill user states
     for user in users:
-        user.status = get_user_status(request, user)
+        if User.online_tracker.is_cached(user):
+            try:
+                online_trackers[user.pk] = user.online_tracker
+            except Online.DoesNotExist:
+                pass
+        else:
+            users_to_fetch[user.pk] = user
+
+    if users_to_fetch:
+        for online_tracker in Online.objects.filter(user__in=users_to_fetch):
+            users_to_fetch[online_tracker.user_id].online_tracker = online_tracker
+            online_trackers[online_tracker.user_id] = online_tracker
+
+    buffered_last_clicks = get_buffered_last_clicks(list(online_trackers))
+    for user_id, last_click in buffered_last_clicks.items():
+        update_last_click(online_trackers[user_id], last_click)
+
+    return online_trackers
 
 
 def get_user_status(request, user):
+    user_ban = get_user_ban(user, request.cache_versions)
+
+    try:
+        online_tracker = user.online_tracker
+    except Online.DoesNotExist:
+        online_tracker = None
+    else:
+        last_click = get_buffered_last_clicks([user.pk]).get(user.pk)
+        if last_click:
+            update_last_click(online_tracker, last_click)
+
+    return build_user_status(request, user, user_ban, online_tracker)
+
+
+def update_last_click(online_tracker, last_click):
+    online_tracker.last_click = max(online_tracker.last_click, last_click)
+
+
+def build_user_status(request, user, user_ban, online_tracker):
     user_status = {
         "is_banned": False,
         "is_hidden": user.is_hiding_presence,
@@ -39,23 +80,15 @@ def get_user_status(request, user):
         "last_click": user.last_login or user.joined_on,
     }
 
-    user_ban = get_user_ban(user, request.cache_versions)
     if user_ban:
         user_status["is_banned"] = True
         user_status["banned_until"] = user_ban.expires_on
 
-    try:
-        online_tracker = user.online_tracker
-        is_hidden = (
-            user.is_hiding_presence and not request.user_acl["can_see_hidden_users"]
-        )
-
-        if online_tracker and not is_hidden:
-            if online_tracker.last_click >= timezone.now() - ACTIVITY_CUTOFF:
-                user_status["is_online"] = True
-                user_status["last_click"] = online_tracker.last_click
-    except Online.DoesNotExist:
-        pass
+    is_hidden = user.is_hiding_presence and not request.user_acl["can_see_hidden_users"]
+    if online_tracker and not is_hidden:
+        if online_tracker.last_click >= timezone.now() - ACTIVITY_CUTOFF:
+            user_status["is_online"] = True
+            user_status["last_click"] = online_tracker.last_click
 
     if user_status["is_hidden"]:
         if request.user_acl["can_see_hidden_users"]:
@@ -4,6 +4,7 @@ from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
 
 from ..search import SearchProvider
+from .searchengine import find_users
 from .serializers import UserCardSerializer
 
 HEAD_RESULTS = 8
@@ -24,7 +25,9 @@ class SearchUsers(SearchProvider):
     def search(self, query, page=1):
         if query:
             results = search_users(
-                search_disabled=self.request.user.is_staff, username=query
+                self.request.cache_versions,
+                search_disabled=self.request.user.is_staff,
+                username=query,
             )
         else:
             results = []
@@ -35,24 +38,14 @@ class SearchUsers(SearchProvider):
         }
 
 
-def search_users(**filters):
-    queryset = User.objects.order_by("slug").select_related(
-        "rank", "ban_cache", "online_tracker"
-    )
-
-    if not filters.get("search_disabled", False):
-        queryset = queryset.filter(is_active=True)
-
-    username = filters.get("username").lower()
+def search_users(cache_versions, **filters):
+    queryset = User.objects.select_related("rank", "ban_cache", "online_tracker")
 
-    results = []
-
-    # lets grab head and tail results:
-    results += list(queryset.filter(slug__startswith=username)[:HEAD_RESULTS])
-    results += list(
-        queryset.filter(slug__contains=username).exclude(
-            pk__in=[r.pk for r in results]
-        )[:TAIL_RESULTS]
+    return find_users(
+        cache_versions,
+        queryset,
+        filters.get("username").lower(),
+        HEAD_RESULTS,
+        TAIL_RESULTS,
+        include_inactive=filters.get("search_disabled", False),
     )
-
-    return results
@@ -0,0 +1,128 @@
+"""Engines finding users by their slugs
+
+Users with slugs starting with query are found first, followed by users with
+slugs containing it. "database" engine queries users table, where substring
+lookups use trigram index on slug if pg_trgm extension is available.
+"memory" engine keeps sorted list of all slugs in process memory, rebuilding it
+when users search cache version changes, and is meant for smaller sites.
+"""
+from bisect import bisect_left
+from threading import Lock
+
+from django.contrib.auth import get_user_model
+
+from . import USERS_SEARCH_CACHE
+from ..cache.versions import invalidate_cache
+from ..conf import settings
+
+User = get_user_model()
+
+_index = None
+_index_lock = Lock()
+
+
+def is_using_memory_index():
+    return settings.MISAGO_USERS_SEARCH_ENGINE == "memory"
+
+
+def find_users(
+    cache_versions, queryset, query, head_limit, tail_limit=0, include_inactive=False
+):
+    """Returns list of users with slugs starting with or containing query"""
+    if is_using_memory_index():
+        index = get_users_search_index(cache_versions)
+        users_ids = index.find(query, head_limit, tail_limit, include_inactive)
+        if not users_ids:
+            return []
+
+        users = {u.pk: u for u in queryset.filter(pk__in=users_ids)}
+        return [users[i] for i in users_ids if i in users]
+
+    if not include_inactive:
+        queryset = queryset.filter(is_active=True)
+
+    results = list(
+        queryset.order_by("slug").filter(slug__startswith=query)[:head_limit]
+    )
+    if tail_limit:
+        results += list(
+            queryset.order_by("slug")
+            .filter(slug__contains=query)
+            .exclude(pk__in=[r.pk for r in results])[:tail_limit]
+        )
+
+    return results
+
+
+class UsersSearchIndex:
+    def __init__(self, users):
+        self._slugs = []
+        self._users = []
+
+        for slug, user_id, is_active in users:
+            self._slugs.append(slug)
+            self._users.append((user_id, is_active))
+
+    def find(self, query, head_limit, tail_limit=0, include_inactive=False):
+        results = []
+
+        # slugs starting with query are next to each other in sorted list
+        start = bisect_left(self._slugs, query)
+        end = start
+        while end < len(self._slugs) and self._slugs[end].startswith(query):
+            end += 1
+
+        for i in range(start, end):
+            if len(results) == head_limit:
+                break
+            user_id, is_active = self._users[i]
+            if is_active or include_inactive:
+                results.append(user_id)
+
+        if not tail_limit:
+            return results
+
+        tail_results = 0
+        for i, slug in enumerate(self._slugs):
+            if tail_results == tail_limit:
+                break
+            if start <= i < end or query not in slug:
+                continue
+            user_id, is_active = self._users[i]
+            if is_active or include_inactive:
+                results.append(user_id)
+                tail_results += 1
+
+        return results
+
+
+def get_users_search_index(cache_versions):
+    global _index
+
+    version = cache_versions[USERS_SEARCH_CACHE]
+    index = _index
+    if index and index[0] == version:
+        return index[1]
+
+    with _index_lock:
+        if _index and _index[0] == version:
+            return _index[1]
+
+        users_index = build_users_search_index()
+        _index = (version, users_index)
+        return users_index
+
+
+def build_users_search_index():
+    queryset = User.objects.order_by("slug").values_list("slug", "id", "is_active")
+    return UsersSearchIndex(queryset.iterator())
+
+
+def clear_users_search_index():
+    global _index
+    _index = None
+
+
+def invalidate_users_search_index():
+    if is_using_memory_index():
+        invalidate_cache(USERS_SEARCH_CACHE)
@@ -3,6 +3,7 @@ from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 from django.utils import timezone
 from django.utils.translation import gettext as _
@@ -10,6 +11,7 @@ from django.utils.translation import gettext as _
 from ..core.pgutils import chunk_queryset
 from .models import AuditTrail, DataDownload
 from .profilefields import profilefields
+from .searchengine import invalidate_users_search_index
 
 User = get_user_model()
 
@@ -84,6 +86,18 @@ def handle_name_change(sender, **kwargs):
     sender.user_renames.update(changed_by_username=sender.username)
 
 
+@receiver(post_save, sender=User)
+def invalidate_search_index_on_user_save(sender, instance, created, **kwargs):
+    # most saves don't change username or activity, compare them with loaded ones
+    if instance.update_search_index_state() or created:
+        invalidate_users_search_index()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_search_index_on_user_delete(sender, **kwargs):
+    invalidate_users_search_index()
+
+
 @receiver(remove_old_ips)
 def remove_old_registrations_ips(sender, *, ip_storage_time, **kwargs):
     datetime_cutoff = timezone.now() - timedelta(days=ip_storage_time)
@@ -12,8 +12,9 @@ from ..bans import (
     get_request_ip_ban,
     get_user_ban,
     get_username_ban,
+    get_users_bans,
 )
-from ..models import Ban
+from ..models import Ban, BanCache
 from ..test import create_test_user
 
 cache_versions = get_cache_versions()
@@ -179,6 +180,104 @@ class UserBansTests(TestCase):
         self.assertFalse(self.user.ban_cache.is_banned)
 
 
+class UsersBansTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("User", "user@example.com")
+        self.other_user = create_test_user("OtherUser", "other@example.com")
+
+    def get_users(self):
+        return [
+            create_test_user("User%s" % i, "user%s@example.com" % i) for i in range(5)
+        ]
+
+    def test_no_bans(self):
+        """get_users_bans returns empty dict for users that aren't banned"""
+        users = [self.user, self.other_user]
+        self.assertEqual(get_users_bans(users, cache_versions), {})
+        self.assertFalse(self.user.ban_cache.is_banned)
+        self.assertFalse(self.other_user.ban_cache.is_banned)
+        self.assertEqual(BanCache.objects.count(), 2)
+
+    def test_username_and_email_bans(self):
+        """get_users_bans returns bans for users caught by username or email bans"""
+        Ban.objects.create(banned_value="us*", user_message="Username ban")
+        Ban.objects.create(
+            check_type=Ban.EMAIL,
+            banned_value="other@example.com",
+            user_message="Email ban",
+            expires_on=timezone.now() + timedelta(days=7),
+        )
+
+        users_bans = get_users_bans([self.user, self.other_user], cache_versions)
+        self.assertEqual(users_bans[self.user.pk].user_message, "Username ban")
+        self.assertEqual(users_bans[self.other_user.pk].user_message, "Email ban")
+        self.assertTrue(users_bans[self.other_user.pk].expires_on)
+
+    def test_expired_and_registration_bans(self):
+        """get_users_bans skips expired and registration only bans"""
+        Ban.objects.create(
+            banned_value="user", expires_on=timezone.now() - timedelta(days=7)
+        )
+        Ban.objects.create(banned_value="otheruser", registration_only=True)
+
+        users = [self.user, self.other_user]
+        self.assertEqual(get_users_bans(users, cache_versions), {})
+
+    def test_bans_match_single_user_ban(self):
+        """get_users_bans finds same bans as get_user_ban"""
+        Ban.objects.create(banned_value="user*", user_message="First ban")
+        Ban.objects.create(banned_value="user2", user_message="Second ban")
+
+        users = self.get_users()
+        users_bans = get_users_bans(users, cache_versions)
+
+        for user in users:
+            user = type(user).objects.get(pk=user.pk)
+            user_ban = get_user_ban(user, cache_versions)
+            self.assertEqual(users_bans[user.pk].ban_id, user_ban.ban_id)
+
+    def test_valid_caches_are_not_refreshed(self):
+        """get_users_bans runs single query for users with loaded valid caches"""
+        users = self.get_users()
+        get_users_bans(users, cache_versions)
+
+        users = list(
+            type(self.user)
+            .objects.filter(pk__in=[u.pk for u in users])
+            .select_related("ban_cache")
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(get_users_bans(users, cache_versions), {})
+
+        users = list(type(self.user).objects.filter(pk__in=[u.pk for u in users]))
+        with self.assertNumQueries(1):
+            self.assertEqual(get_users_bans(users, cache_versions), {})
+
+    def test_stale_caches_are_refreshed_in_bulk(self):
+        """get_users_bans refreshes stale caches with constant number of queries"""
+        users = self.get_users()
+        get_users_bans(users[:2], cache_versions)
+
+        Ban.objects.create(banned_value="user*")
+        new_cache_versions = cache_versions.copy()
+        new_cache_versions["bans"] = "changed1"
+
+        users = list(
+            type(self.user)
+            .objects.filter(pk__in=[u.pk for u in users])
+            .select_related("ban_cache")
+        )
+        with self.assertNumQueries(3):
+            users_bans = get_users_bans(users, new_cache_versions)
+        self.assertEqual(len(users_bans), len(users))
+
+        ban_caches = BanCache.objects.filter(user__in=users)
+        self.assertEqual(len(ban_caches), len(users))
+        for ban_cache in ban_caches:
+            self.assertTrue(ban_cache.is_banned)
+            self.assertEqual(ban_cache.cache_version, "changed1")
+
+
 class MockRequest:
     def __init__(self):
         self.user_ip = "127.0.0.1"
@@ -1,6 +1,9 @@
 from unittest.mock import Mock
 
-from ..online.utils import get_user_status
+from django.utils.functional import SimpleLazyObject
+
+from ..models import Ban, Online
+from ..online.utils import get_user_status, make_users_status_aware
 from ..test import AuthenticatedUserTestCase, create_test_user
 
 
@@ -43,3 +46,45 @@ class GetUserStatusTests(AuthenticatedUserTestCase):
             cache_versions={"bans": "abcdefgh"},
         )
         assert get_user_status(request, self.other_user)["is_online_hidden"]
+
+
+class MakeUsersStatusAwareTests(AuthenticatedUserTestCase):
+    def setUp(self):
+        super().setUp()
+        users = [
+            create_test_user("User%s" % i, "user%s@example.com" % i) for i in range(5)
+        ]
+        self.users = list(
+            type(self.user).objects.filter(pk__in=[u.pk for u in users]).order_by("id")
+        )
+        self.request = Mock(
+            user=self.user,
+            user_acl={"can_see_hidden_users": False},
+            cache_versions={"bans": "abcdefgh"},
+        )
+
+    def test_users_statuses_are_set(self):
+        Ban.objects.create(banned_value="user1")
+        Online.objects.filter(user=self.users[2]).delete()
+
+        make_users_status_aware(self.request, self.users)
+
+        for user in self.users:
+            assert user.status == get_user_status(self.request, user)
+        assert self.users[1].status["is_banned"]
+        assert not self.users[2].status["is_online"]
+        assert self.users[3].status["is_online"]
+
+    def test_users_statuses_are_set_using_constant_number_of_queries(self):
+        Ban.objects.create(banned_value="user*")
+
+        with self.assertNumQueries(5):
+            make_users_status_aware(self.request, self.users)
+
+        for user in self.users:
+            assert user.status["is_banned"]
+
+    def test_lazy_users_statuses_are_set(self):
+        users = [SimpleLazyObject(lambda: self.users[0])]
+        make_users_status_aware(self.request, users)
+        assert users[0].status["is_online"]
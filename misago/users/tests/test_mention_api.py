@@ -1,6 +1,7 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from ..searchengine import clear_users_search_index
 from ..test import create_test_user
 
 
@@ -54,3 +55,14 @@ class AuthenticateApiTests(TestCase):
         response = self.client.get(self.api_link + "?q=other")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), [])
+
+
+@override_settings(MISAGO_USERS_SEARCH_ENGINE="memory")
+class MemoryIndexAuthenticateApiTests(AuthenticateApiTests):
+    def setUp(self):
+        clear_users_search_index()
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        clear_users_search_index()
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from django.utils import timezone
+
+from ..models import Online
+from ..online import tracker
+from ..online.utils import get_user_status, make_users_status_aware
+from ..test import AuthenticatedUserTestCase, create_test_user
+
+cache = LocMemCache("online-tracker-tests", {})
+
+
+@patch.object(tracker, "cache", cache)
+@override_settings(MISAGO_ONLINE_TRACKER_GRANULARITY=30)
+class OnlineTrackerTests(AuthenticatedUserTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        tracker._buffer.clear()
+
+        self.other_user = create_test_user("OtherUser", "otheruser@example.com")
+        self.online_tracker = self.other_user.online_tracker
+        self.request = Mock(
+            user=self.user,
+            user_acl={"can_see_hidden_users": False},
+            cache_versions={"bans": "abcdefgh"},
+        )
+
+    def tearDown(self):
+        tracker._buffer.clear()
+        super().tearDown()
+
+    def set_last_click(self, last_click):
+        Online.objects.filter(user=self.other_user).update(last_click=last_click)
+        self.online_tracker.refresh_from_db()
+
+    def test_click_within_granularity_is_not_saved(self):
+        """click made shortly after previous one is not saved"""
+        last_click = timezone.now() - timedelta(seconds=10)
+        self.set_last_click(last_click)
+
+        with self.assertNumQueries(0):
+            tracker.update_tracker(None, self.online_tracker)
+
+        self.online_tracker.refresh_from_db()
+        self.assertEqual(self.online_tracker.last_click, last_click)
+
+    @override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=0)
+    def test_click_is_saved_right_away_if_buffering_is_disabled(self):
+        """click is saved in database if flush interval is 0"""
+        last_click = timezone.now() - timedelta(seconds=40)
+        self.set_last_click(last_click)
+
+        tracker.update_tracker(None, self.online_tracker)
+
+        self.online_tracker.refresh_from_db()
+        self.assertGreater(self.online_tracker.last_click, last_click)
+
+    def test_click_is_buffered(self):
+        """click is buffered and read from buffer, not saved in database"""
+        last_click = timezone.now() - timedelta(minutes=10)
+        self.set_last_click(last_click)
+
+        with patch.object(tracker, "_last_flush", tracker.time.time()):
+            with self.assertNumQueries(0):
+                tracker.update_tracker(None, self.online_tracker)
+
+        self.online_tracker.refresh_from_db()
+        self.assertEqual(self.online_tracker.last_click, last_click)
+
+        self.other_user.refresh_from_db()
+        self.assertTrue(get_user_status(self.request, self.other_user)["is_online"])
+
+        users = [type(self.user).objects.get(pk=self.other_user.pk)]
+        make_users_status_aware(self.request, users)
+        self.assertTrue(users[0].status["is_online"])
+
+    def test_buffered_clicks_are_flushed_to_database(self):
+        """buffered clicks are saved in database with flush"""
+        last_click = timezone.now() - timedelta(minutes=10)
+        self.set_last_click(last_click)
+
+        with patch.object(tracker, "_last_flush", tracker.time.time()):
+            tracker.update_tracker(None, self.online_tracker)
+
+        with self.assertNumQueries(1):
+            tracker.flush_buffer()
+
+        self.online_tracker.refresh_from_db()
+        self.assertGreater(self.online_tracker.last_click, last_click)
+        self.assertFalse(tracker._buffer)
+
+    def test_flush_keeps_later_click_from_database(self):
+        """flush doesn't overwrite later click saved by other process"""
+        with patch.object(tracker, "_last_flush", tracker.time.time()):
+            self.set_last_click(timezone.now() - timedelta(minutes=10))
+            tracker.update_tracker(None, self.online_tracker)
+
+        later_click = timezone.now() + timedelta(minutes=1)
+        self.set_last_click(later_click)
+        tracker.flush_buffer()
+
+        self.online_tracker.refresh_from_db()
+        self.assertEqual(self.online_tracker.last_click, later_click)
+
+    def test_buffer_is_flushed_after_interval(self):
+        """buffer is flushed by click made after flush interval"""
+        last_click = timezone.now() - timedelta(minutes=10)
+        self.set_last_click(last_click)
+
+        with patch.object(tracker, "_last_flush", tracker.time.time() - 120):
+            tracker.update_tracker(None, self.online_tracker)
+
+        self.online_tracker.refresh_from_db()
+        self.assertGreater(self.online_tracker.last_click, last_click)
+
+    def test_buffer_is_flushed_by_click_within_granularity(self):
+        """buffer is flushed after interval by click that itself isn't saved"""
+        last_click = timezone.now() - timedelta(minutes=10)
+        self.set_last_click(last_click)
+
+        with patch.object(tracker, "_last_flush", tracker.time.time()):
+            tracker.update_tracker(None, self.online_tracker)
+
+        self.user.online_tracker.last_click = timezone.now()
+        with patch.object(tracker, "_last_flush", tracker.time.time() - 120):
+            tracker.update_tracker(None, self.user.online_tracker)
+
+        self.online_tracker.refresh_from_db()
+        self.assertGreater(self.online_tracker.last_click, last_click)
+        self.assertFalse(tracker._buffer)
+
+    def test_buffer_is_flushed_on_exit(self):
+        """buffered clicks are saved in database when process exits"""
+        last_click = timezone.now() - timedelta(minutes=10)
+        self.set_last_click(last_click)
+
+        with patch.object(tracker, "_last_flush", tracker.time.time()):
+            tracker.update_tracker(None, self.online_tracker)
+
+        tracker.flush_buffer_on_exit()
+
+        self.online_tracker.refresh_from_db()
+        self.assertGreater(self.online_tracker.last_click, last_click)
+        self.assertFalse(tracker._buffer)
+
+    def test_stop_tracking_saves_buffered_click_as_last_login(self):
+        """user's last login is set to buffered click when tracking stops"""
+        self.set_last_click(timezone.now() - timedelta(minutes=10))
+        with patch.object(tracker, "_last_flush", tracker.time.time()):
+            tracker.update_tracker(None, self.online_tracker)
+        buffered_click = tracker._buffer[self.other_user.pk]
+
+        tracker.stop_tracking(None, self.online_tracker)
+
+        self.other_user.refresh_from_db()
+        self.assertEqual(self.other_user.last_login, buffered_click)
+        self.assertFalse(Online.objects.filter(user=self.other_user).exists())
@@ -1,6 +1,8 @@
+from django.test import override_settings
 from django.urls import reverse
 
 from ...acl.test import patch_user_acl
+from ..searchengine import clear_users_search_index
 from ..test import AuthenticatedUserTestCase, create_test_user
 
 
@@ -135,3 +137,14 @@ class SearchProviderApiTests(SearchApiTests):
         self.api_link = reverse(
             "misago:api:search", kwargs={"search_provider": "users"}
         )
+
+
+@override_settings(MISAGO_USERS_SEARCH_ENGINE="memory")
+class MemoryIndexSearchApiTests(SearchApiTests):
+    def setUp(self):
+        clear_users_search_index()
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        clear_users_search_index()
@@ -0,0 +1,122 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from ..searchengine import (
+    UsersSearchIndex,
+    build_users_search_index,
+    clear_users_search_index,
+    find_users,
+    get_users_search_index,
+)
+from ..test import create_test_user
+
+User = get_user_model()
+
+SLUGS = ["alice", "bob", "bobby", "jimbob", "robert", "zbob"]
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    clear_users_search_index()
+    yield
+    clear_users_search_index()
+
+
+@pytest.fixture
+def users(db):
+    return [create_test_user(slug.title(), "%s@example.com" % slug) for slug in SLUGS]
+
+
+def test_index_finds_slugs_starting_with_query_first():
+    index = UsersSearchIndex([(slug, i, True) for i, slug in enumerate(SLUGS)])
+    assert index.find("bob", 8, 8) == [1, 2, 3, 5]
+
+
+def test_index_limits_results():
+    index = UsersSearchIndex([(slug, i, True) for i, slug in enumerate(SLUGS)])
+    assert index.find("bob", 1, 1) == [1, 3]
+    assert index.find("bob", 8) == [1, 2]
+
+
+def test_index_excludes_inactive_users():
+    index = UsersSearchIndex([(slug, i, i != 2) for i, slug in enumerate(SLUGS)])
+    assert index.find("bob", 8, 8) == [1, 3, 5]
+    assert index.find("bob", 8, 8, include_inactive=True) == [1, 2, 3, 5]
+
+
+def test_memory_and_database_engines_find_same_users(cache_versions, users):
+    User.objects.filter(slug="bobby").update(is_active=False)
+    queryset = User.objects.all()
+
+    database_results = find_users(cache_versions, queryset, "bob", 2, 2)
+    with override_settings(MISAGO_USERS_SEARCH_ENGINE="memory"):
+        memory_results = find_users(cache_versions, queryset, "bob", 2, 2)
+
+    assert [u.slug for u in database_results] == ["bob", "jimbob", "zbob"]
+    assert memory_results == database_results
+
+
+def test_index_is_built_once_for_cache_version(
+    django_assert_num_queries, cache_versions, users
+):
+    index = get_users_search_index(cache_versions)
+    with django_assert_num_queries(0):
+        assert get_users_search_index(cache_versions) is index
+
+
+def test_index_is_rebuilt_when_cache_version_changes(cache_versions, users):
+    index = get_users_search_index(cache_versions)
+    new_cache_versions = cache_versions.copy()
+    new_cache_versions["users_search"] = "changed1"
+    assert get_users_search_index(new_cache_versions) is not index
+
+
+def test_index_is_built_from_database(users):
+    index = build_users_search_index()
+    users_ids = {u.slug: u.pk for u in users}
+    assert index.find("bob", 8, 8) == [
+        users_ids["bob"],
+        users_ids["bobby"],
+        users_ids["jimbob"],
+        users_ids["zbob"],
+    ]
+
+
+@pytest.fixture
+def invalidate_index():
+    with patch("misago.users.signals.invalidate_users_search_index") as mock:
+        yield mock
+
+
+def test_saving_loaded_user_without_changes_doesnt_invalidate_index(
+    user, invalidate_index
+):
+    user = User.objects.get(pk=user.pk)
+    user.title = "Changed"
+    user.save()
+    invalidate_index.assert_not_called()
+
+
+def test_changing_username_invalidates_index(user, invalidate_index):
+    user = User.objects.get(pk=user.pk)
+    user.set_username("NewName")
+    user.save()
+    invalidate_index.assert_called_once()
+
+    user.save()
+    invalidate_index.assert_called_once()
+
+
+def test_changing_user_activity_invalidates_index(user, invalidate_index):
+    user = User.objects.get(pk=user.pk)
+    user.is_active = False
+    user.save()
+    invalidate_index.assert_called_once()
+
+
+def test_creating_user_invalidates_index(db, invalidate_index):
+    create_test_user("NewUser", "newuser@example.com")
+    invalidate_index.assert_called()
@@ -0,0 +1,75 @@
+from importlib import import_module
+from unittest.mock import MagicMock, Mock, call
+
+from django.db import DatabaseError
+
+migration = import_module("misago.users.migrations.0024_user_slug_trigram_index")
+
+
+def get_schema_editor(installed, available, execute=None, invalid_index=False):
+    cursor = Mock()
+    if installed:
+        results = [(1,)]
+    else:
+        results = [None, (1,) if available else None]
+    cursor.fetchone.side_effect = results + [(1,) if invalid_index else None]
+
+    connection = Mock(alias="default")
+    connection.cursor.return_value = MagicMock(__enter__=Mock(return_value=cursor))
+    return Mock(connection=connection, execute=execute or Mock())
+
+
+def test_installed_extension_is_used(db):
+    schema_editor = get_schema_editor(installed=True, available=True)
+    assert migration.enable_trigram_extension(schema_editor)
+    schema_editor.execute.assert_not_called()
+
+
+def test_unavailable_extension_is_skipped(db):
+    schema_editor = get_schema_editor(installed=False, available=False)
+    assert not migration.enable_trigram_extension(schema_editor)
+    schema_editor.execute.assert_not_called()
+
+
+def test_available_extension_is_created(db):
+    schema_editor = get_schema_editor(installed=False, available=True)
+    assert migration.enable_trigram_extension(schema_editor)
+    schema_editor.execute.assert_called_once_with(
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    )
+
+
+def test_index_is_skipped_if_role_cant_create_extension(db):
+    schema_editor = get_schema_editor(
+        installed=False,
+        available=True,
+        execute=Mock(side_effect=DatabaseError("permission denied")),
+    )
+    migration.create_trigram_index(None, schema_editor)
+    schema_editor.execute.assert_called_once_with(
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    )
+
+
+def test_index_is_created_concurrently(db):
+    schema_editor = get_schema_editor(installed=True, available=True)
+    migration.create_trigram_index(None, schema_editor)
+    schema_editor.execute.assert_called_once_with(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS misago_users_user_slug_trgm "
+        "ON misago_users_user USING gin (slug gin_trgm_ops)"
+    )
+
+
+def test_invalid_index_is_dropped_before_index_is_created(db):
+    schema_editor = get_schema_editor(
+        installed=True, available=True, invalid_index=True
+    )
+    migration.create_trigram_index(None, schema_editor)
+    assert schema_editor.execute.call_args_list[0] == call(
+        "DROP INDEX CONCURRENTLY IF EXISTS misago_users_user_slug_trgm"
+    )
+    assert schema_editor.execute.call_count == 2
+
+
+def test_migration_is_not_atomic():
+    assert not migration.Migration.atomic
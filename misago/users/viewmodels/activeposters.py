@@ -6,7 +6,7 @@ from ..serializers import UserCardSerializer
 class ActivePosters:
     def __init__(self, request):
         ranking = get_active_posters_ranking()
-        make_users_status_aware(request, ranking["users"], fetch_state=True)
+        make_users_status_aware(request, ranking["users"])
 
         self.count = ranking["users_count"]
         self.tracked_period = request.settings.top_posters_ranking_length